@@ -0,0 +1,130 @@
+from __future__ import annotations
+import argparse
+from dataclasses import dataclass
+from datetime import date
+import gc
+import random
+import tracemalloc
+from typing import Callable, Optional
+
+from omop_graph.graph.edges import EdgeView
+from omop_graph.graph.nodes import ConceptView
+
+"""
+Memory per cached ConceptView / EdgeView.
+
+Compares the previous representation (plain frozen dataclasses built with
+the driver's strings as-is) with the current one (slotted classes built
+via from_row, which interns low-cardinality columns). Rows are synthetic,
+but every string is a fresh object, as it is when it comes off a cursor.
+
+    python benchmarks/bench_memory.py --n 200000
+"""
+
+
+@dataclass(frozen=True)
+class LegacyConceptView:
+    concept_id: int
+    concept_name: str
+    concept_code: str
+    vocabulary_id: str
+    domain_id: str
+    concept_class_id: str
+    standard_concept: Optional[str]
+    valid_start_date: date
+    valid_end_date: date
+    invalid_reason: Optional[str]
+
+
+@dataclass(frozen=True)
+class LegacyEdgeView:
+    subject_id: int
+    predicate_id: str
+    object_id: int
+    valid_start_date: Optional[date]
+    valid_end_date: Optional[date]
+    invalid_reason: Optional[str]
+
+
+VOCABULARIES = ("SNOMED", "RxNorm", "LOINC", "ICD10CM", "RxNorm Extension")
+DOMAINS = ("Condition", "Drug", "Measurement", "Procedure", "Observation")
+CLASSES = ("Clinical Finding", "Ingredient", "Clinical Drug", "Lab Test", "Disorder")
+PREDICATES = ("Is a", "Subsumes", "Maps to", "Mapped from", "Has ingredient", "RxNorm has dose form")
+
+
+def _fresh(s: str | None) -> str | None:
+    # a new str object with the same value, like a DB driver returns
+    return None if s is None else (s + ".")[:-1]
+
+
+def concept_rows(n: int, rng: random.Random) -> list[tuple]:
+    start, end = date(1970, 1, 1), date(2099, 12, 31)
+    return [
+        (
+            i,
+            f"Concept name {i}",
+            str(100000 + i),
+            _fresh(rng.choice(VOCABULARIES)),
+            _fresh(rng.choice(DOMAINS)),
+            _fresh(rng.choice(CLASSES)),
+            _fresh(rng.choice(("S", "C", None))),
+            start,
+            end,
+            _fresh(rng.choice((None, None, None, "D", "U"))),
+        )
+        for i in range(n)
+    ]
+
+
+def edge_rows(n: int, rng: random.Random) -> list[tuple]:
+    start, end = date(1970, 1, 1), date(2099, 12, 31)
+    return [
+        (
+            rng.randrange(10**7),
+            _fresh(rng.choice(PREDICATES)),
+            rng.randrange(10**7),
+            start,
+            end,
+            _fresh(rng.choice((None, None, None, "D"))),
+        )
+        for _ in range(n)
+    ]
+
+
+def bytes_per_object(make_rows: Callable[[], list[tuple]], build: Callable[[tuple], object]) -> float:
+    """Traced allocation per object, including the row values it keeps alive."""
+    gc.collect()
+    tracemalloc.start()
+    rows = make_rows()
+    objects = [build(r) for r in rows]
+    del rows
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    n = len(objects)
+    del objects
+    return current / n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=200_000, help="objects per measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    def rows(factory):
+        return lambda: factory(args.n, random.Random(args.seed))
+
+    results = [
+        ("ConceptView", rows(concept_rows), lambda r: LegacyConceptView(*r), ConceptView.from_row),
+        ("EdgeView", rows(edge_rows), lambda r: LegacyEdgeView(*r), EdgeView.from_row),
+    ]
+    print(f"{'object':<12} {'before B/obj':>13} {'after B/obj':>12} {'saved':>7}")
+    for name, make_rows, legacy, current in results:
+        before = bytes_per_object(make_rows, legacy)
+        after = bytes_per_object(make_rows, current)
+        print(f"{name:<12} {before:>13.0f} {after:>12.0f} {1 - after / before:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+import argparse
+from pathlib import Path
+import sys
+import tempfile
+import time
+from typing import Callable
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from omop_graph.graph.queries import (
+    bound_edges,
+    q_concept_view,
+    q_outgoing_edges,
+    s_concept_view,
+    with_endpoint_domains,
+)
+
+"""
+Per-query Python overhead of the q_* builders versus prebuilt statements.
+
+Runs on the tests' SQLite vocabulary, so the database work per query is
+tiny and the timings are dominated by statement construction, cache-key
+generation, parameter binding and row handling.
+
+    python benchmarks/bench_statements.py --n 20000
+"""
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tests"))
+from conftest import CONCEPTS, build_vocabulary  # noqa: E402
+
+
+def per_call_us(n: int, call: Callable[[int], object], ids: list[int]) -> float:
+    for cid in ids:  # warm the compiled-statement cache
+        call(cid)
+    start = time.perf_counter()
+    for i in range(n):
+        call(ids[i % len(ids)])
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=20_000, help="queries per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/cdm.db")
+
+        @event.listens_for(engine, "connect")
+        def _attach_vocab_schema(dbapi_conn, _):
+            dbapi_conn.execute(f"ATTACH DATABASE '{tmp}/vocab.db' AS vocab")
+
+        build_vocabulary(engine)
+        ids = [c[0] for c in CONCEPTS]
+        with Session(engine) as session:
+            run = session.execute
+            results = [
+                (
+                    "concept_view",
+                    lambda cid: run(q_concept_view(cid)).one(),
+                    lambda cid: run(s_concept_view(), {"concept_id": cid}).one(),
+                ),
+                (
+                    "outgoing_edges",
+                    lambda cid: run(with_endpoint_domains(
+                        q_outgoing_edges(cid, relationship_ids={"Is a"}, active_only=True)
+                    )).all(),
+                    lambda cid: run(*bound_edges(
+                        "out", cid, relationship_ids={"Is a"}, active_only=True
+                    )).all(),
+                ),
+            ]
+            print(f"{'query':<16} {'before us':>10} {'after us':>9} {'saved':>7}")
+            for name, before_call, after_call in results:
+                before = per_call_us(args.n, before_call, ids)
+                after = per_call_us(args.n, after_call, ids)
+                print(f"{name:<16} {before:>10.1f} {after:>9.1f} {1 - after / before:>7.0%}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
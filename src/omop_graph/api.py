@@ -28,6 +28,7 @@ from .reasoning.term_grounding import (
     GroundingConstraints,
     GroundingCandidate,
     ground_term,
+    ground_terms,
 )
 
 __all__ = [
@@ -44,5 +45,6 @@ __all__ = [
     "GroundingConstraints",
     "GroundingCandidate",
     "ground_term",
+    "ground_terms",
     "ResolverPipeline",
 ]
\ No newline at end of file
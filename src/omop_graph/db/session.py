@@ -3,8 +3,11 @@ from datetime import date
 from functools import wraps
 import warnings
 from sqlalchemy.exc import PendingRollbackError, InvalidRequestError
+import threading
+from typing import Any, Literal
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.engine import Engine, Result
+from sqlalchemy.orm import scoped_session, sessionmaker, Session
 
 def safe_execute(method):
     """
@@ -36,18 +39,151 @@ def make_engine(
     *,
     echo: bool = False,
     connect_timeout: int = 10,
-):
-    kwargs = {}
+    pool_size: int | None = None,
+    max_overflow: int | None = None,
+    pool_pre_ping: bool = False,
+    pool_recycle: int = -1,
+) -> Engine:
+    kwargs: dict[str, Any] = {"pool_pre_ping": pool_pre_ping, "pool_recycle": pool_recycle}
     if not url.startswith("sqlite"):
         kwargs["connect_args"] = {"connect_timeout": connect_timeout}
+        # SQLite picks its own pool class, which may not take these
+        if pool_size is not None:
+            kwargs["pool_size"] = pool_size
+        if max_overflow is not None:
+            kwargs["max_overflow"] = max_overflow
     return create_engine(url, echo=echo, **kwargs)
 
 
+_ENGINES: dict[tuple, Engine] = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def get_engine(
+    url: str,
+    *,
+    echo: bool = False,
+    connect_timeout: int = 10,
+    pool_size: int | None = 10,
+    max_overflow: int | None = 10,
+    pool_pre_ping: bool = True,
+    pool_recycle: int = -1,
+) -> Engine:
+    """
+    Process-wide engine for a URL and pool configuration.
+
+    Engines (and their connection pools) are created on first use and
+    reused by every later call with the same arguments.
+    """
+    options = dict(
+        echo=echo,
+        connect_timeout=connect_timeout,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_pre_ping=pool_pre_ping,
+        pool_recycle=pool_recycle,
+    )
+    key = (url, *sorted(options.items()))
+    with _ENGINES_LOCK:
+        engine = _ENGINES.get(key)
+        if engine is None:
+            engine = _ENGINES[key] = make_engine(url, **options)
+    return engine
+
+
+def dispose_engines(*, close: bool = True) -> None:
+    """
+    Dispose every registered engine's pool and forget the registry.
+
+    In a child process after fork, pass close=False: the inherited
+    connections are dropped without closing sockets the parent still uses.
+    """
+    with _ENGINES_LOCK:
+        engines = list(_ENGINES.values())
+        _ENGINES.clear()
+    for engine in engines:
+        engine.dispose(close=close)
+
+
+class PerCallSession:
+    """
+    Session stand-in that runs each execute() in its own short-lived Session.
+
+    Results are buffered before the session closes, so callers can share
+    one instance across threads.
+    """
+
+    def __init__(self, factory: sessionmaker):
+        self.factory = factory
+
+    def execute(self, statement, params=None, **kwargs) -> Result:
+        with self.factory() as session:
+            return session.execute(statement, params, **kwargs).freeze()()
+
+    def rollback(self) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+
+class PerThreadSession:
+    """
+    One Session per thread, ending its transaction after every execute().
+
+    A bare scoped_session keeps each thread's transaction, and so a pooled
+    connection, open until the thread's session is removed; idle threads
+    would drain the pool. Here a connection is only held during a query.
+    """
+
+    def __init__(self, factory: sessionmaker):
+        self.registry = scoped_session(factory)
+
+    def execute(self, statement, params=None, **kwargs) -> Result:
+        session = self.registry()
+        try:
+            return session.execute(statement, params, **kwargs).freeze()()
+        finally:
+            session.rollback()
+
+    def rollback(self) -> None:
+        self.registry().rollback()
+
+    def close(self) -> None:
+        """Close and forget the calling thread's Session."""
+        self.registry.remove()
+
+
+SessionScope = Literal["shared", "thread", "call"]
+
+
+def open_session(
+    url: str,
+    *,
+    scope: SessionScope = "shared",
+    **engine_options: Any,
+) -> Session | PerThreadSession | PerCallSession:
+    """
+    Session source over the registry engine for url.
+
+    scope:
+    - "shared": one Session; for single-threaded use
+    - "thread": one Session per thread, released after every query
+    - "call": a fresh Session for every query
+    """
+    factory = sessionmaker(bind=get_engine(url, **engine_options))
+    if scope == "shared":
+        return factory()
+    if scope == "thread":
+        return PerThreadSession(factory)
+    if scope == "call":
+        return PerCallSession(factory)
+    raise ValueError(f"unknown session scope: {scope!r}")
+
+
 def make_session(
     url: str,
     *,
     echo: bool = False,
 ) -> Session:
-    engine = make_engine(url, echo=echo)
-    SessionLocal = sessionmaker(bind=engine)
-    return SessionLocal()
\ No newline at end of file
+    return open_session(url, echo=echo)
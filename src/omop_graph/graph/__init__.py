@@ -2,7 +2,15 @@ from .traverse import traverse
 from .paths import find_shortest_paths, GraphPath, PathStep
 from .scoring import explain_path, rank_paths, path_profile
 from .kg import KnowledgeGraph
-from .edges import PredicateKind
+from .csr import CSRGraph
+from .reachability import ReachabilityIndex
+from .edges import PredicateKind, PredicateCatalog
+from .persistent import PersistentCache
+from .snapshot import SnapshotGraph, export_snapshot
+from .trigram import TrigramIndex
+from .label_dictionary import LabelDictionary
+from .symspell import SymSpellIndex
+from .bm25 import TokenIndex
 
 __all__ = [
     "traverse",
@@ -11,7 +19,17 @@ __all__ = [
     "PathStep",
     "path_profile",
     "KnowledgeGraph",
+    "CSRGraph",
+    "ReachabilityIndex",
     "explain_path",
     "rank_paths",
     "PredicateKind",
+    "PredicateCatalog",
+    "PersistentCache",
+    "SnapshotGraph",
+    "export_snapshot",
+    "TrigramIndex",
+    "LabelDictionary",
+    "SymSpellIndex",
+    "TokenIndex",
 ]
\ No newline at end of file
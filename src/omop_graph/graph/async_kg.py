@@ -0,0 +1,427 @@
+from __future__ import annotations
+import asyncio
+from datetime import date
+from operator import itemgetter
+import os
+from typing import Any, Callable, Iterable, Mapping, Optional, Tuple, TypeVar, TYPE_CHECKING
+
+from sqlalchemy.engine import Result
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from .base import GraphBackend
+from .cache import Cache, CacheFactory, LRUCache
+from .edges import EdgeView, PredicateCatalog, PredicateKind, _pred_id
+from .kg import KnowledgeGraph, _GraphCaches
+from .nodes import ConceptView, LabelMatch, LabelMatchKind
+from .label_dictionary import LabelDictionary
+from .bm25 import TokenIndex
+from .symspell import SymSpellIndex
+from .trigram import TrigramIndex
+from .queries import (
+    s_concept_view,
+    s_concept_views,
+    s_concept_name_match,
+    s_concept_name_ilike,
+    s_concept_synonym_match,
+    s_concept_synonym_ilike,
+    s_concept_labels_match,
+    s_concept_labels_ilike,
+    label_params,
+    bound_edges,
+    q_predicates,
+)
+
+if TYPE_CHECKING:
+    from .embeddings import EmbeddingIndex
+
+"""
+Asyncio graph facade.
+
+Responsibilities:
+- awaitable concept / edge / label lookups, run with the same prebuilt
+  statements and cached like KnowledgeGraph
+- a synchronous, cache-only view (CachedGraph) for the shared algorithm cores
+
+Every query runs in its own AsyncSession, so independent lookups can be
+awaited together with asyncio.gather.
+"""
+
+_CONCEPT_CACHE = ("concept_view", 200_000)
+
+T = TypeVar("T")
+
+
+class AsyncKnowledgeGraph(_GraphCaches):
+
+    # max number of ids per IN (...) clause; chunks are queried concurrently
+    batch_size: int = 1_000
+
+    def __init__(
+        self,
+        sessions: async_sessionmaker[AsyncSession],
+        catalog: PredicateCatalog,
+        *,
+        cache_sizes: Mapping[str, int] | None = None,
+        cache_bytes: Mapping[str, int] | None = None,
+        cache_factory: CacheFactory = LRUCache,
+        trigram_index: TrigramIndex | str | os.PathLike | None = None,
+        label_dictionary: LabelDictionary | str | os.PathLike | None = None,
+        symspell_index: SymSpellIndex | str | os.PathLike | None = None,
+        token_index: TokenIndex | str | os.PathLike | None = None,
+        embedding_index: EmbeddingIndex | str | os.PathLike | None = None,
+    ):
+        """
+        Prefer AsyncKnowledgeGraph.connect, which loads the catalog.
+        Cache and in-memory index options are as for KnowledgeGraph.
+        """
+        self.sessions = sessions
+        self.catalog = catalog
+        self._init_caches(cache_sizes, cache_bytes, cache_factory)
+        self.trigram_index = self._open_index(trigram_index, TrigramIndex)
+        self.label_dictionary = self._open_index(label_dictionary, LabelDictionary)
+        self.symspell_index = self._open_index(symspell_index, SymSpellIndex)
+        self.token_index = self._open_index(token_index, TokenIndex)
+        self.embedding_index = self._open_embedding_index(embedding_index)
+        self.cached = CachedGraph(self)
+
+    @classmethod
+    async def connect(
+        cls,
+        bind: str | AsyncEngine | async_sessionmaker[AsyncSession],
+        *,
+        engine_options: Mapping[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> AsyncKnowledgeGraph:
+        """
+        Open a graph on an async database URL (e.g. postgresql+asyncpg://...),
+        an AsyncEngine or an async_sessionmaker.
+        """
+        if isinstance(bind, str):
+            bind = create_async_engine(bind, **(engine_options or {}))
+        sessions = bind if isinstance(bind, async_sessionmaker) else async_sessionmaker(bind)
+        async with sessions() as session:
+            rows = (await session.execute(q_predicates())).all()
+        return cls(sessions, PredicateCatalog.from_rows(rows), **kwargs)
+
+    async def run_sync(self, fn: Callable[[KnowledgeGraph], T]) -> T:
+        """
+        fn(graph) for code written against the synchronous API, such as a
+        resolver without resolve_async. graph is a KnowledgeGraph sharing
+        this graph's catalog, caches and indexes, whose queries run on one
+        AsyncSession via AsyncSession.run_sync.
+        """
+        async with self.sessions() as session:
+            return await session.run_sync(lambda s: fn(KnowledgeGraph._sharing(s, self)))
+
+    async def _execute(self, stmt, params=None) -> Result:
+        async with self.sessions() as session:
+            return (await session.execute(stmt, params)).freeze()()
+
+    async def concept_view(self, concept_id: int) -> ConceptView:
+        cache = self.caches.get(*_CONCEPT_CACHE)
+        view = cache.get((concept_id,))
+        if view is None:
+            row = (await self._execute(s_concept_view(), {"concept_id": concept_id})).one()
+            view = ConceptView.from_row(row)
+            cache.put((concept_id,), view)
+        return view
+
+    async def concept_views(self, concept_ids: Iterable[int]) -> dict[int, ConceptView]:
+        """
+        ConceptViews for many ids; uncached ids are fetched in concurrent
+        chunked IN (...) queries. Ids with no concept row are omitted.
+        """
+        cache = self.caches.get(*_CONCEPT_CACHE)
+        result: dict[int, ConceptView] = {}
+        missing: list[int] = []
+        for cid in dict.fromkeys(concept_ids):
+            view = cache.get((cid,))
+            if view is None:
+                missing.append(cid)
+            else:
+                result[cid] = view
+
+        chunks = [missing[i:i + self.batch_size] for i in range(0, len(missing), self.batch_size)]
+        for rows in await asyncio.gather(*(self._execute(s_concept_views(), {"concept_ids": c}) for c in chunks)):
+            for row in rows:
+                view = ConceptView.from_row(row)
+                result[view.concept_id] = view
+                cache.put((view.concept_id,), view)
+        return result
+
+    async def _lookup(self, name: str, label: str, fuzzy: bool, kind: LabelMatchKind, exact, ilike):
+        cache = self.caches.get(name, 200_000)
+        key = (label, fuzzy)
+        matches = cache.get(key)
+        if matches is None:
+            input_label = self._normalise_label(label)
+            matches = ()
+            if input_label and fuzzy and self.trigram_index is not None:
+                matches = tuple(m for _, m in self.trigram_index.search(input_label, kind=kind))
+            elif input_label and not fuzzy and self.label_dictionary is not None:
+                matches = self.label_dictionary.lookup(input_label, kind=kind)
+            elif input_label:
+                stmt = ilike() if fuzzy else exact()
+                rows = (await self._execute(stmt, label_params(input_label, fuzzy))).all()
+                matches = self._label_matches(input_label, rows, kind)
+            cache.put(key, matches)
+        return matches
+
+    async def label_lookup(self, label: str, fuzzy: bool = False) -> Tuple[LabelMatch, ...]:
+        return await self._lookup(
+            "label_lookup", label, fuzzy, LabelMatchKind.DIRECT,
+            s_concept_name_match, s_concept_name_ilike,
+        )
+
+    async def synonym_lookup(self, label: str, fuzzy: bool = False) -> Tuple[LabelMatch, ...]:
+        return await self._lookup(
+            "synonym_lookup", label, fuzzy, LabelMatchKind.SYNONYM,
+            s_concept_synonym_match, s_concept_synonym_ilike,
+        )
+
+    async def label_and_synonym_lookup(self, label: str, fuzzy: bool = False) -> Tuple[LabelMatch, ...]:
+        cache = self.caches.get("label_and_synonym_lookup", 200_000)
+        key = (label, fuzzy)
+        matches = cache.get(key)
+        if matches is None:
+            input_label = self._normalise_label(label)
+            matches = ()
+            if input_label and fuzzy and self.trigram_index is not None:
+                matches = self._rank_label_matches(
+                    m for _, m in self.trigram_index.search(input_label)
+                )
+            elif input_label and not fuzzy and self.label_dictionary is not None:
+                matches = self._rank_label_matches(self.label_dictionary.lookup(input_label))
+            elif input_label:
+                stmt = s_concept_labels_ilike() if fuzzy else s_concept_labels_match()
+                rows = (await self._execute(stmt, label_params(input_label, fuzzy))).all()
+                matches = self._kinded_label_matches(input_label, rows)
+            cache.put(key, matches)
+        return matches
+
+    def predicate_name(self, relationship_id: str) -> str:
+        return self.catalog.predicate(relationship_id).name
+
+    def predicate_kind(self, relationship_id: str) -> PredicateKind:
+        return self.catalog.kind(relationship_id)
+
+    def reverse_predicate_id(self, relationship_id: str) -> Optional[str]:
+        return self.catalog.predicate(relationship_id).reverse_id
+
+    async def outgoing_edges(
+        self,
+        concept_id: int,
+        relationship_id: str | None = None,
+        *,
+        predicate_kinds: Iterable[PredicateKind] | None = None,
+        active_only: bool = False,
+        on: date | None = None,
+    ) -> tuple[EdgeView, ...]:
+        return await self._edges(
+            concept_id, relationship_id,
+            self._edge_filters(predicate_kinds, active_only, on),
+            cache=self._outgoing,
+            direction="out",
+        )
+
+    async def incoming_edges(
+        self,
+        concept_id: int,
+        relationship_id: str | None = None,
+        *,
+        predicate_kinds: Iterable[PredicateKind] | None = None,
+        active_only: bool = False,
+        on: date | None = None,
+    ) -> tuple[EdgeView, ...]:
+        return await self._edges(
+            concept_id, relationship_id,
+            self._edge_filters(predicate_kinds, active_only, on),
+            cache=self._incoming,
+            direction="in",
+        )
+
+    async def outgoing_edges_many(
+        self,
+        concept_ids: Iterable[int],
+        relationship_id: str | None = None,
+        *,
+        predicate_kinds: Iterable[PredicateKind] | None = None,
+        active_only: bool = False,
+        on: date | None = None,
+    ) -> dict[int, tuple[EdgeView, ...]]:
+        return await self._edges_many(
+            concept_ids, relationship_id,
+            self._edge_filters(predicate_kinds, active_only, on),
+            cache=self._outgoing,
+            direction="out",
+            key_of=itemgetter(0),  # subject_id
+        )
+
+    async def incoming_edges_many(
+        self,
+        concept_ids: Iterable[int],
+        relationship_id: str | None = None,
+        *,
+        predicate_kinds: Iterable[PredicateKind] | None = None,
+        active_only: bool = False,
+        on: date | None = None,
+    ) -> dict[int, tuple[EdgeView, ...]]:
+        return await self._edges_many(
+            concept_ids, relationship_id,
+            self._edge_filters(predicate_kinds, active_only, on),
+            cache=self._incoming,
+            direction="in",
+            key_of=itemgetter(2),  # object_id
+        )
+
+    async def _edges(
+        self,
+        concept_id: int,
+        relationship_id: str | None,
+        signature,
+        *,
+        direction: str,
+        cache: Cache,
+    ) -> tuple[EdgeView, ...]:
+        key = (concept_id, relationship_id, *signature)
+        edges = cache.get(key)
+        if edges is None:
+            edges = self._from_unfiltered(cache, concept_id, relationship_id, signature)
+        if edges is None:
+            stmt, params = bound_edges(
+                direction, concept_id, relationship_id, **self._query_filters(signature)
+            )
+            edges = self._edge_views((await self._execute(stmt, params)).all())
+        cache.put(key, edges)
+        return edges
+
+    async def _edges_many(
+        self,
+        concept_ids: Iterable[int],
+        relationship_id: str | None,
+        signature,
+        *,
+        direction: str,
+        cache: Cache,
+        key_of,
+    ) -> dict[int, tuple[EdgeView, ...]]:
+        result: dict[int, tuple[EdgeView, ...]] = {}
+        missing: list[int] = []
+        for cid in dict.fromkeys(concept_ids):
+            edges = cache.get((cid, relationship_id, *signature))
+            if edges is None:
+                edges = self._from_unfiltered(cache, cid, relationship_id, signature)
+            if edges is None:
+                missing.append(cid)
+            else:
+                result[cid] = edges
+
+        filters = self._query_filters(signature)
+        chunks = [missing[i:i + self.batch_size] for i in range(0, len(missing), self.batch_size)]
+        fetched = await asyncio.gather(*(
+            self._execute(*bound_edges(direction, chunk, relationship_id, **filters))
+            for chunk in chunks
+        ))
+        for chunk, rows in zip(chunks, fetched):
+            grouped: dict[int, list[tuple]] = {cid: [] for cid in chunk}
+            for row in rows:
+                grouped[key_of(row)].append(tuple(row))
+            for cid, group in grouped.items():
+                result[cid] = self._edge_views(group)
+                cache.put((cid, relationship_id, *signature), result[cid])
+
+        return result
+
+    async def prefetch_edges(
+        self,
+        concept_ids: Iterable[int],
+        *,
+        direction: str,
+        predicate_kinds: set[PredicateKind] | None = None,
+        active_only: bool = True,
+        on: date | None = None,
+    ) -> None:
+        fetch = self.outgoing_edges_many if direction == "out" else self.incoming_edges_many
+        found = await fetch(
+            concept_ids,
+            predicate_kinds=predicate_kinds,
+            active_only=active_only,
+            on=on,
+        )
+        # within_domain filtering reads endpoint domains; reload any evicted
+        missing = {
+            cid
+            for edges in found.values() for e in edges for cid in (e.subject_id, e.object_id)
+            if self._domains.get(cid) is None
+        }
+        if missing:
+            for cid, view in (await self.concept_views(missing)).items():
+                self._domains.put(cid, view.domain_id)
+
+
+class CachedGraph(GraphBackend):
+    """
+    Synchronous GraphBackend over an AsyncKnowledgeGraph's caches.
+
+    The async drivers await the lookups an algorithm needs before running
+    it against this view, so reads are cache hits; a miss raises
+    LookupError rather than blocking on I/O.
+    """
+
+    def __init__(self, graph: AsyncKnowledgeGraph):
+        self.graph = graph
+
+    def concept_view(self, concept_id: int) -> ConceptView:
+        view = self.graph.caches.get(*_CONCEPT_CACHE).get((concept_id,))
+        if view is None:
+            raise LookupError(f"concept {concept_id} is not loaded; await concept_views() first")
+        return view
+
+    def predicate_name(self, relationship_id: str) -> str:
+        return self.graph.predicate_name(relationship_id)
+
+    def predicate_kind(self, relationship_id: str) -> PredicateKind:
+        return self.graph.predicate_kind(relationship_id)
+
+    def reverse_predicate_id(self, relationship_id: str) -> Optional[str]:
+        return self.graph.reverse_predicate_id(relationship_id)
+
+    def iter_edges(
+        self,
+        concept_id: int,
+        *,
+        direction: str = "out",
+        predicate=None,
+        predicate_kinds: set[PredicateKind] | None = None,
+        active_only: bool = True,
+        on: date | None = None,
+        within_domain: bool = True,
+    ) -> Iterable[EdgeView]:
+        g = self.graph
+        relationship_id = _pred_id(predicate)
+        signature = g._edge_filters(predicate_kinds, active_only, on)
+        cache = g._outgoing if direction == "out" else g._incoming
+        edges = cache.get((concept_id, relationship_id, *signature))
+        if edges is None:
+            edges = g._from_unfiltered(cache, concept_id, relationship_id, signature)
+        if edges is None:
+            raise LookupError(f"{direction} edges of {concept_id} are not loaded; await prefetch_edges() first")
+
+        for e in edges:
+            if within_domain and self._domain_id(e.subject_id) != self._domain_id(e.object_id):
+                continue
+            yield e
+
+    def _domain_id(self, concept_id: int) -> str:
+        domain_id = self.graph._domains.get(concept_id)
+        if domain_id is None:
+            domain_id = self.concept_view(concept_id).domain_id
+        return domain_id
+
+    def clear_caches(self) -> None:
+        self.graph.clear_caches()
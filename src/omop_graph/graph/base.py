@@ -1,7 +1,8 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from datetime import date
-from typing import Iterable, Optional
+from typing import Any, Generator, Iterable, Optional
 
 from .edges import EdgeView, PredicateKind, Predicate
 from .nodes import ConceptView
@@ -18,6 +19,15 @@ class GraphBackend(ABC):
     def concept_view(self, concept_id: int) -> ConceptView:
         ...
 
+    def concept_views(self, concept_ids: Iterable[int]) -> dict[int, ConceptView]:
+        """
+        ConceptViews for many ids at once, keyed by concept_id.
+
+        Backends with per-query cost should override this with a batched
+        lookup; callers use it to prefetch before looping over concept_view.
+        """
+        return {cid: self.concept_view(cid) for cid in dict.fromkeys(concept_ids)}
+
     @abstractmethod
     def predicate_kind(self, relationship_id: str) -> PredicateKind:
         ...
@@ -41,6 +51,75 @@ class GraphBackend(ABC):
         active_only: bool = True) -> Iterable[EdgeView]:
         ...
 
+    def prefetch_edges(
+        self,
+        concept_ids: Iterable[int],
+        *,
+        direction: str,
+        predicate_kinds: set[PredicateKind] | None = None,
+        active_only: bool = True,
+        on: date | None = None,
+    ) -> None:
+        """
+        Optional hook: warm edge caches for a whole frontier before it is
+        expanded with iter_edges using the same filters.
+
+        Backends without per-query cost can ignore it.
+        """
+        return None
+
     def clear_caches(self) -> None:
         """Optional hook for cache invalidation."""
         return None
+
+
+@dataclass(frozen=True)
+class Prefetch:
+    """
+    Request yielded by an algorithm core before it expands a frontier.
+
+    Cores are generators: the driver fulfils each request (sync or async)
+    and resumes the core, which then reads the warmed edges via iter_edges.
+    """
+    concept_ids: list[int]
+    direction: str
+    predicate_kinds: set[PredicateKind] | None = None
+    active_only: bool = True
+    on: date | None = None
+
+
+AlgorithmCore = Generator[Prefetch, None, Any]
+
+
+def run_core(kg, core: AlgorithmCore) -> Any:
+    """Drive an algorithm core against a synchronous backend."""
+    try:
+        request = next(core)
+        while True:
+            kg.prefetch_edges(
+                request.concept_ids,
+                direction=request.direction,
+                predicate_kinds=request.predicate_kinds,
+                active_only=request.active_only,
+                on=request.on,
+            )
+            request = core.send(None)
+    except StopIteration as done:
+        return done.value
+
+
+async def run_core_async(kg, core: AlgorithmCore) -> Any:
+    """Drive an algorithm core, awaiting each prefetch on an async graph."""
+    try:
+        request = next(core)
+        while True:
+            await kg.prefetch_edges(
+                request.concept_ids,
+                direction=request.direction,
+                predicate_kinds=request.predicate_kinds,
+                active_only=request.active_only,
+                on=request.on,
+            )
+            request = core.send(None)
+    except StopIteration as done:
+        return done.value
@@ -0,0 +1,228 @@
+from __future__ import annotations
+from array import array
+from bisect import bisect_left
+from collections import Counter
+import heapq
+from math import log
+import os
+import re
+from typing import Sequence
+
+from sqlalchemy.orm import Session
+
+from .labels import LabelTable, kind_code, pack_strings, read_sidecar, unpack_strings, write_sidecar
+from .nodes import LabelMatch, LabelMatchKind, normalise_label
+
+"""
+Token inverted index over concept names and synonyms, ranked with BM25.
+
+Matches multi-word phrases regardless of word order ("carcinoma of breast,
+ductal"). Each token keeps its ascending label entries with the token's
+frequency in that label, plus the largest score any one posting can
+contribute. Queries use MaxScore early termination: once the current
+top-k threshold exceeds what the remaining (common) tokens could add on
+their own, those tokens only rescore surviving candidates by bisect
+instead of walking their whole postings list.
+"""
+
+FORMAT = "omop-graph-bm25-1"
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokens(label: str) -> list[str]:
+    """Word tokens of a normalised label."""
+    return _TOKEN.findall(label)
+
+
+class TokenIndex:
+    """
+    Inverted index token -> label entries, in CSR arrays.
+
+    Postings for vocabulary[s] are ``postings[offsets[s]:offsets[s + 1]]``
+    (ascending LabelTable entries) with matching ``frequencies``;
+    ``bounds[s]`` is the token's largest single-posting BM25 score and
+    ``lengths[entry]`` the label's token count.
+    """
+
+    # results per search when no limit is given
+    default_limit: int = 100
+
+    def __init__(
+        self,
+        table: LabelTable,
+        *,
+        vocabulary: Sequence[str],
+        offsets: Sequence[int],
+        postings: Sequence[int],
+        frequencies: Sequence[int],
+        bounds: Sequence[float],
+        lengths: Sequence[int],
+        k1: float = 1.2,
+        b: float = 0.75,
+        average_length: float | None = None,
+    ):
+        self.table = table
+        self.vocabulary = vocabulary
+        self.offsets = offsets
+        self.postings = memoryview(postings)
+        self.frequencies = memoryview(frequencies)
+        self.bounds = bounds
+        self.lengths = lengths
+        self.k1 = k1
+        self.b = b
+        if average_length is None:
+            average_length = (sum(lengths) / len(lengths)) if len(lengths) else 0.0
+        self.average_length = average_length
+        self._slots = {t: s for s, t in enumerate(vocabulary)}
+
+    @classmethod
+    def build(cls, table: LabelTable, *, k1: float = 1.2, b: float = 0.75) -> TokenIndex:
+        lists: dict[str, tuple[array, array]] = {}
+        lengths = array("H")
+        for entry, label in enumerate(table.iter_labels()):
+            counts = Counter(tokens(normalise_label(label)))
+            lengths.append(min(sum(counts.values()), 0xFFFF))
+            for token, tf in counts.items():
+                postings = lists.get(token)
+                if postings is None:
+                    postings = lists[token] = (array("i"), array("B"))
+                postings[0].append(entry)
+                postings[1].append(min(tf, 0xFF))
+
+        vocabulary = sorted(lists)
+        offsets, postings, frequencies = array("q", [0]), array("i"), array("B")
+        for token in vocabulary:
+            entries, tfs = lists.pop(token)
+            postings.extend(entries)
+            frequencies.extend(tfs)
+            offsets.append(len(postings))
+
+        index = cls(
+            table,
+            vocabulary=vocabulary,
+            offsets=offsets,
+            postings=postings,
+            frequencies=frequencies,
+            bounds=array("d"),
+            lengths=lengths,
+            k1=k1,
+            b=b,
+        )
+        for s in range(len(vocabulary)):
+            idf = index._idf(s)
+            index.bounds.append(max(index._score(s, pos, idf) for pos in range(offsets[s], offsets[s + 1])))
+        return index
+
+    @classmethod
+    def from_session(cls, session: Session, *, batch_size: int = 50_000, **options: float) -> TokenIndex:
+        return cls.build(LabelTable.from_session(session, batch_size=batch_size), **options)
+
+    def save(self, directory: str | os.PathLike) -> None:
+        token_offsets, token_blob = pack_strings(self.vocabulary)
+        write_sidecar(
+            directory,
+            {
+                **self.table.arrays(),
+                "token_offsets": token_offsets,
+                "tokens": token_blob,
+                "offsets": self.offsets,
+                "postings": self.postings,
+                "frequencies": self.frequencies,
+                "bounds": self.bounds,
+                "lengths": self.lengths,
+            },
+            format=FORMAT,
+            k1=self.k1,
+            b=self.b,
+            average_length=self.average_length,
+        )
+
+    @classmethod
+    def open(cls, directory: str | os.PathLike) -> TokenIndex:
+        """Map an index written by save(); postings stay on disk until read."""
+        arrays, manifest = read_sidecar(directory, format=FORMAT)
+        return cls(
+            LabelTable.from_arrays(arrays),
+            vocabulary=unpack_strings(arrays["token_offsets"], arrays["tokens"]),
+            offsets=arrays["offsets"],
+            postings=arrays["postings"],
+            frequencies=arrays["frequencies"],
+            bounds=arrays["bounds"],
+            lengths=arrays["lengths"],
+            k1=manifest["k1"],
+            b=manifest["b"],
+            average_length=manifest["average_length"],
+        )
+
+    def _idf(self, s: int) -> float:
+        df = self.offsets[s + 1] - self.offsets[s]
+        return log(1 + (len(self.lengths) - df + 0.5) / (df + 0.5))
+
+    def _score(self, s: int, pos: int, idf: float) -> float:
+        """BM25 contribution of posting ``pos`` of token slot s."""
+        tf = self.frequencies[pos]
+        norm = self.k1 * (1 - self.b + self.b * self.lengths[self.postings[pos]] / self.average_length)
+        return idf * tf * (self.k1 + 1) / (tf + norm)
+
+    def search(
+        self,
+        label: str,
+        *,
+        kind: LabelMatchKind | None = None,
+        limit: int | None = None,
+    ) -> list[tuple[float, LabelMatch]]:
+        """Up to ``limit`` (score, LabelMatch) pairs, highest BM25 score first."""
+        input_label = normalise_label(label)
+        slots = sorted(
+            {self._slots[t] for t in tokens(input_label) if t in self._slots},
+            key=lambda s: self.bounds[s],
+            reverse=True,
+        )
+        if not slots:
+            return []
+        limit = self.default_limit if limit is None else limit
+        code = kind_code(kind)
+        kinds = self.table.kinds
+
+        # remaining[i]: the most tokens slots[i:] can add to any one entry
+        remaining = [0.0] * (len(slots) + 1)
+        for i in range(len(slots) - 1, -1, -1):
+            remaining[i] = remaining[i + 1] + self.bounds[slots[i]]
+
+        scores: dict[int, float] = {}
+        for i, s in enumerate(slots):
+            idf = self._idf(s)
+            start, end = self.offsets[s], self.offsets[s + 1]
+            threshold = (
+                heapq.nlargest(limit, scores.values())[-1] if len(scores) >= limit else 0.0
+            )
+            if threshold and remaining[i] < threshold:
+                # an entry without any earlier token can no longer reach the
+                # top-k: rescore the survivors only
+                postings = self.postings[start:end]
+                for entry, score in list(scores.items()):
+                    if score + remaining[i] < threshold:
+                        del scores[entry]
+                        continue
+                    j = bisect_left(postings, entry)
+                    if j < len(postings) and postings[j] == entry:
+                        scores[entry] = score + self._score(s, start + j, idf)
+                continue
+            for pos in range(start, end):
+                entry = self.postings[pos]
+                if code is None or kinds[entry] == code:
+                    scores[entry] = scores.get(entry, 0.0) + self._score(s, pos, idf)
+
+        table = self.table
+        best = heapq.nsmallest(
+            limit, scores.items(), key=lambda item: (-item[1], self.lengths[item[0]], item[0]),
+        )
+        return [(score, table.match(entry, input_label)) for entry, score in best]
+
+    @property
+    def nbytes(self) -> int:
+        return self.table.nbytes + sum(
+            memoryview(a).nbytes
+            for a in (self.offsets, self.postings, self.frequencies, self.bounds, self.lengths)
+        )
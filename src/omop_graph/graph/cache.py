@@ -0,0 +1,207 @@
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import wraps
+import sys
+import threading
+from typing import Any, Callable, Generic, Hashable, Mapping, Optional, Protocol, TypeVar
+
+"""
+Per-instance caches.
+
+Scope: bounded mappings owned by a single graph instance. Unlike
+functools.lru_cache, entries can be filled from batch queries, sizes are
+set per instance, and caches do not keep the owning instance alive.
+"""
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING: Any = object()
+_KWARGS = object()  # separates positional from keyword parts of a key
+
+
+@dataclass(frozen=True)
+class CacheInfo:
+    hits: int
+    misses: int
+    evictions: int
+    currsize: int
+    maxsize: int
+    nbytes: int | None = None
+    max_bytes: int | None = None
+
+
+class Cache(Protocol):
+    """What KnowledgeGraph needs from a cache; implement to plug in another store."""
+
+    def get(self, key: Hashable, default: Any = None) -> Any: ...
+    def put(self, key: Hashable, value: Any) -> None: ...
+    def __contains__(self, key: Hashable) -> bool: ...
+    def __len__(self) -> int: ...
+    def clear(self) -> None: ...
+    def info(self) -> CacheInfo: ...
+
+
+CacheFactory = Callable[[int, Optional[int]], Cache]
+
+
+def approx_sizeof(value: Any, _depth: int = 2) -> int:
+    """
+    Shallow-ish size estimate for cached values (tuples of small records).
+
+    Only used to enforce byte budgets, so it trades accuracy for speed.
+    """
+    size = sys.getsizeof(value)
+    if _depth == 0:
+        return size
+    if isinstance(value, (tuple, list, frozenset, set)):
+        size += sum(approx_sizeof(v, _depth - 1) for v in value)
+    elif hasattr(value, "__dict__"):
+        size += sys.getsizeof(value.__dict__)
+    return size
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Bounded mapping that evicts the least recently used entry.
+
+    With ``max_bytes`` set, entries are also evicted until the approximate
+    size of the stored values fits the budget. Operations are serialised
+    with a lock, so one cache can be shared by threads.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        max_bytes: int | None = None,
+        *,
+        sizeof: Callable[[Any], int] = approx_sizeof,
+    ):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self._sizes: dict[K, int] = {}
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return self._data[key]
+
+    def put(self, key: K, value: V) -> None:
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            if self.max_bytes is not None:
+                self._nbytes += size - self._sizes.get(key, 0)
+                self._sizes[key] = size
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize or (
+                self.max_bytes is not None and self._nbytes > self.max_bytes and len(self._data) > 1
+            ):
+                self._evict()
+
+    def _evict(self) -> None:
+        old, _ = self._data.popitem(last=False)
+        self._nbytes -= self._sizes.pop(old, 0)
+        self.evictions += 1
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._nbytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            currsize=len(self._data),
+            maxsize=self.maxsize,
+            nbytes=self._nbytes if self.max_bytes is not None else None,
+            max_bytes=self.max_bytes,
+        )
+
+
+class CacheRegistry:
+    """
+    Named caches belonging to one graph instance.
+
+    Sizes given at construction override the defaults declared by each
+    accessor; ``factory`` builds the cache objects (LRUCache by default).
+    """
+
+    def __init__(
+        self,
+        sizes: Mapping[str, int] | None = None,
+        max_bytes: Mapping[str, int] | None = None,
+        *,
+        factory: CacheFactory = LRUCache,
+    ):
+        self._sizes = dict(sizes or {})
+        self._max_bytes = dict(max_bytes or {})
+        self._factory = factory
+        self._caches: dict[str, Cache] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, default_maxsize: int) -> Cache:
+        cache = self._caches.get(name)
+        if cache is None:
+            with self._lock:
+                cache = self._caches.get(name)
+                if cache is None:
+                    cache = self._factory(
+                        self._sizes.get(name, default_maxsize),
+                        self._max_bytes.get(name),
+                    )
+                    self._caches[name] = cache
+        return cache
+
+    def info(self) -> dict[str, CacheInfo]:
+        return {name: cache.info() for name, cache in self._caches.items()}
+
+    def clear(self) -> None:
+        for cache in self._caches.values():
+            cache.clear()
+
+
+def cached(name: str, maxsize: int):
+    """
+    Method decorator memoising on ``self.caches`` (a CacheRegistry).
+
+    Drop-in for ``functools.lru_cache`` on graph accessors, but the cache
+    lives on the instance.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = self.caches.get(name, maxsize)
+            key = args + (_KWARGS, *sorted(kwargs.items())) if kwargs else args
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = method(self, *args, **kwargs)
+                cache.put(key, value)
+            return value
+
+        wrapper.cache_name = name  # type: ignore[attr-defined]
+        wrapper.cache_maxsize = maxsize  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
@@ -0,0 +1,405 @@
+from __future__ import annotations
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from .base import GraphBackend
+from .edges import EdgeView, Predicate, PredicateCatalog, PredicateKind, _pred_id
+from .nodes import ConceptView
+from .queries import q_edges, q_concept_domains, q_predicates
+from .reachability import ReachabilityIndex
+
+"""
+In-memory CSR adjacency backend.
+
+Responsibilities:
+- one-shot load of concept_relationship into compressed sparse row arrays
+- edge retrieval with no SQL round trips
+- predicate semantics (relationship table is loaded once)
+- hierarchy membership from a lazily built ReachabilityIndex
+
+Concept metadata (concept_view) is delegated to an optional concept source,
+normally a KnowledgeGraph over the same session.
+"""
+
+_NO_DATE = 0
+_UNKNOWN = 0
+
+
+def _ordinal(d: date | None) -> int:
+    return d.toordinal() if d is not None else _NO_DATE
+
+
+def _date(ordinal: int) -> date | None:
+    return date.fromordinal(ordinal) if ordinal != _NO_DATE else None
+
+
+def _zeros(typecode: str, n: int) -> array:
+    return array(typecode, bytes(array(typecode).itemsize * n))
+
+
+def _stream(session: Session, stmt, batch_size: int) -> Iterable[tuple]:
+    # deferred until first iteration, so only one cursor is open at a time
+    yield from session.execute(stmt.execution_options(yield_per=batch_size))
+
+
+@dataclass(frozen=True)
+class Adjacency:
+    """
+    One direction of a CSR edge layout.
+
+    Edges of node index ``i`` occupy ``[offsets[i], offsets[i + 1])`` in the
+    per-edge arrays. ``neighbours`` holds node indexes, not concept ids;
+    dates are stored as proleptic ordinals (0 = missing).
+    """
+    offsets: Sequence[int]
+    neighbours: Sequence[int]
+    predicates: Sequence[int]
+    valid_start: Sequence[int]
+    valid_end: Sequence[int]
+    invalid_reasons: Sequence[int]
+
+    @classmethod
+    def build(
+        cls,
+        keys: Sequence[int],
+        others: Sequence[int],
+        predicates: Sequence[int],
+        valid_start: Sequence[int],
+        valid_end: Sequence[int],
+        invalid_reasons: Sequence[int],
+        *,
+        n_nodes: int,
+    ) -> Adjacency:
+        """Counting-sort parallel edge arrays into CSR order by ``keys``."""
+        offsets = _zeros("q", n_nodes + 1)
+        for k in keys:
+            offsets[k + 1] += 1
+        for i in range(n_nodes):
+            offsets[i + 1] += offsets[i]
+
+        m = len(keys)
+        cursor = array("q", offsets[:-1])
+        out_neighbours = _zeros("i", m)
+        out_predicates = _zeros("H", m)
+        out_start = _zeros("i", m)
+        out_end = _zeros("i", m)
+        out_invalid = _zeros("B", m)
+
+        for e, k in enumerate(keys):
+            pos = cursor[k]
+            cursor[k] = pos + 1
+            out_neighbours[pos] = others[e]
+            out_predicates[pos] = predicates[e]
+            out_start[pos] = valid_start[e]
+            out_end[pos] = valid_end[e]
+            out_invalid[pos] = invalid_reasons[e]
+
+        return cls(offsets, out_neighbours, out_predicates, out_start, out_end, out_invalid)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            memoryview(a).nbytes
+            for a in (
+                self.offsets,
+                self.neighbours,
+                self.predicates,
+                self.valid_start,
+                self.valid_end,
+                self.invalid_reasons,
+            )
+        )
+
+
+class CSRGraph(GraphBackend):
+    """
+    Read-only graph held entirely in compact arrays.
+
+    Node indexes are positions in the sorted ``node_ids`` array; predicates,
+    domains and invalid reasons are interned to small integer codes.
+    """
+
+    def __init__(
+        self,
+        *,
+        node_ids: Sequence[int],
+        node_domains: Sequence[int],
+        domains: Sequence[str | None],
+        outgoing: Adjacency,
+        incoming: Adjacency,
+        predicate_ids: Sequence[str],
+        catalog: PredicateCatalog,
+        invalid_reasons: Sequence[str | None],
+        concepts: GraphBackend | None = None,
+    ):
+        self.node_ids = node_ids
+        self.node_domains = node_domains
+        self.domains = tuple(domains)
+        self.outgoing = outgoing
+        self.incoming = incoming
+        self.predicate_ids = tuple(predicate_ids)
+        self.invalid_reasons = tuple(invalid_reasons)
+        self.concepts = concepts
+        self._reachability: ReachabilityIndex | None = None
+
+        self.catalog = catalog
+        self._predicate_codes = {pid: code for code, pid in enumerate(self.predicate_ids)}
+        self._kinds: tuple[PredicateKind | None, ...] = tuple(
+            catalog.kind(pid) if pid in catalog else None
+            for pid in self.predicate_ids
+        )
+
+    @classmethod
+    def from_rows(
+        cls,
+        edges: Iterable[tuple],
+        *,
+        domains: Iterable[tuple[int, str | None]],
+        predicates: PredicateCatalog | Iterable[Predicate],
+        concepts: GraphBackend | None = None,
+    ) -> CSRGraph:
+        """
+        Build from ``(concept_id, domain_id)`` rows and
+        ``(concept_id_1, relationship_id, concept_id_2, valid_start_date,
+        valid_end_date, invalid_reason)`` edge rows.
+        """
+        domain_codes: dict[str | None, int] = {None: _UNKNOWN}
+        concept_domain: dict[int, int] = {}
+        for cid, domain_id in domains:
+            concept_domain[int(cid)] = domain_codes.setdefault(domain_id, len(domain_codes))
+
+        catalog = predicates if isinstance(predicates, PredicateCatalog) else PredicateCatalog(predicates)
+        predicate_codes = {rid: code for code, rid in enumerate(catalog)}
+        invalid_codes: dict[str | None, int] = {None: 0}
+        subjects, objects = array("q"), array("q")
+        preds, starts, ends, invalid = array("H"), array("i"), array("i"), array("B")
+
+        for s, rel, o, start, end, reason in edges:
+            subjects.append(s)
+            objects.append(o)
+            preds.append(predicate_codes.setdefault(rel, len(predicate_codes)))
+            starts.append(_ordinal(start))
+            ends.append(_ordinal(end))
+            invalid.append(invalid_codes.setdefault(reason, len(invalid_codes)))
+
+        node_ids = array("q", sorted(set(concept_domain).union(subjects, objects)))
+        node_domains = array("H", (concept_domain.get(cid, _UNKNOWN) for cid in node_ids))
+
+        src = array("i", (bisect_left(node_ids, cid) for cid in subjects))
+        dst = array("i", (bisect_left(node_ids, cid) for cid in objects))
+        del subjects, objects
+
+        n = len(node_ids)
+        return cls(
+            node_ids=node_ids,
+            node_domains=node_domains,
+            domains=list(domain_codes),
+            outgoing=Adjacency.build(src, dst, preds, starts, ends, invalid, n_nodes=n),
+            incoming=Adjacency.build(dst, src, preds, starts, ends, invalid, n_nodes=n),
+            predicate_ids=list(predicate_codes),
+            catalog=catalog,
+            invalid_reasons=list(invalid_codes),
+            concepts=concepts,
+        )
+
+    @classmethod
+    def from_session(cls, session: Session, *, batch_size: int = 50_000) -> CSRGraph:
+        """
+        Load the whole concept_relationship table in a single streamed pass.
+
+        concept_view lookups are served by a KnowledgeGraph on the same session.
+        """
+        from .kg import KnowledgeGraph
+
+        catalog = PredicateCatalog.from_rows(session.execute(q_predicates()).all())
+        return cls.from_rows(
+            _stream(session, q_edges(), batch_size),
+            domains=_stream(session, q_concept_domains(), batch_size),
+            predicates=catalog,
+            concepts=KnowledgeGraph(session),
+        )
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.outgoing.neighbours)
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            memoryview(self.node_ids).nbytes
+            + memoryview(self.node_domains).nbytes
+            + self.outgoing.nbytes
+            + self.incoming.nbytes
+        )
+
+    def _index(self, concept_id: int) -> int | None:
+        i = bisect_left(self.node_ids, concept_id)
+        if i < len(self.node_ids) and self.node_ids[i] == concept_id:
+            return i
+        return None
+
+    def __contains__(self, concept_id: int) -> bool:
+        return self._index(concept_id) is not None
+
+    def domain_id(self, concept_id: int) -> str | None:
+        i = self._index(concept_id)
+        return None if i is None else self.domains[self.node_domains[i]]
+
+    def concept_view(self, concept_id: int) -> ConceptView:
+        if self.concepts is None:
+            raise LookupError("CSRGraph has no concept source for concept_view")
+        return self.concepts.concept_view(concept_id)
+
+    def concept_views(self, concept_ids: Iterable[int]) -> dict[int, ConceptView]:
+        if self.concepts is None:
+            return super().concept_views(concept_ids)
+        return self.concepts.concept_views(concept_ids)
+
+    def predicate(self, relationship_id: str) -> Predicate:
+        return self.catalog.predicate(relationship_id)
+
+    def predicate_name(self, relationship_id: str) -> str:
+        return self.catalog.predicate(relationship_id).name
+
+    def predicate_kind(self, relationship_id: str) -> PredicateKind:
+        return self.catalog.kind(relationship_id)
+
+    def reverse_predicate_id(self, relationship_id: str) -> Optional[str]:
+        return self.catalog.predicate(relationship_id).reverse_id
+
+    def outgoing_edges(
+        self,
+        concept_id: int,
+        relationship_id: str | None = None,
+        *,
+        predicate_kinds: set[PredicateKind] | None = None,
+        active_only: bool = False,
+        on: date | None = None,
+    ) -> tuple[EdgeView, ...]:
+        return tuple(self.iter_edges(
+            concept_id,
+            direction="out",
+            predicate=relationship_id,
+            predicate_kinds=predicate_kinds,
+            active_only=active_only,
+            on=on,
+            within_domain=False,
+        ))
+
+    def incoming_edges(
+        self,
+        concept_id: int,
+        relationship_id: str | None = None,
+        *,
+        predicate_kinds: set[PredicateKind] | None = None,
+        active_only: bool = False,
+        on: date | None = None,
+    ) -> tuple[EdgeView, ...]:
+        return tuple(self.iter_edges(
+            concept_id,
+            direction="in",
+            predicate=relationship_id,
+            predicate_kinds=predicate_kinds,
+            active_only=active_only,
+            on=on,
+            within_domain=False,
+        ))
+
+    def iter_edges(
+        self,
+        concept_id: int,
+        *,
+        direction: str = "out",
+        predicate=None,
+        predicate_kinds: set[PredicateKind] | None = None,
+        active_only: bool = True,
+        on: date | None = None,
+        within_domain: bool = True,
+    ) -> Iterable[EdgeView]:
+        idx = self._index(concept_id)
+        if idx is None:
+            return
+
+        pred_id = _pred_id(predicate)
+        pred_code = None
+        if pred_id is not None:
+            pred_code = self._predicate_codes.get(pred_id)
+            if pred_code is None:
+                return
+
+        allowed = None
+        if predicate_kinds:
+            allowed = {
+                code for code, kind in enumerate(self._kinds)
+                if kind in predicate_kinds
+            }
+
+        on_ord = _ordinal(on)
+        outgoing = direction == "out"
+        adj = self.outgoing if outgoing else self.incoming
+        node_ids, node_domains = self.node_ids, self.node_domains
+        own_domain = node_domains[idx]
+
+        for pos in range(adj.offsets[idx], adj.offsets[idx + 1]):
+            code = adj.predicates[pos]
+            if pred_code is not None and code != pred_code:
+                continue
+            if allowed is not None and code not in allowed:
+                continue
+
+            reason = adj.invalid_reasons[pos]
+            start, end = adj.valid_start[pos], adj.valid_end[pos]
+            if active_only:
+                if reason:
+                    continue
+                if on_ord and (
+                    (start and on_ord < start) or (end and on_ord > end)
+                ):
+                    continue
+
+            nb = adj.neighbours[pos]
+            if within_domain and (
+                own_domain == _UNKNOWN or node_domains[nb] != own_domain
+            ):
+                continue
+
+            other = node_ids[nb]
+            yield EdgeView(
+                concept_id if outgoing else other,
+                self.predicate_ids[code],
+                other if outgoing else concept_id,
+                _date(start),
+                _date(end),
+                self.invalid_reasons[reason],
+            )
+
+    @property
+    def reachability(self) -> ReachabilityIndex:
+        """Reachability index over active 'Is a' edges, built on first use."""
+        if self._reachability is None:
+            self._reachability = ReachabilityIndex.from_csr(self)
+        return self._reachability
+
+    def is_descendant(
+        self,
+        pairs: Iterable[tuple[int, int]],
+    ) -> dict[tuple[int, int], bool]:
+        """
+        For each (descendant_id, ancestor_id) pair, whether the first concept
+        is a proper descendant of the second; see KnowledgeGraph.is_descendant.
+        """
+        index = self.reachability
+        return {pair: index.is_descendant(*pair) for pair in dict.fromkeys(pairs)}
+
+    def clear_caches(self) -> None:
+        if self.concepts is not None:
+            self.concepts.clear_caches()
@@ -2,7 +2,10 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import date
 from enum import Enum, auto
-from typing import Optional, TYPE_CHECKING
+from types import MappingProxyType
+from typing import Iterable, Iterator, Optional, Sequence, TYPE_CHECKING
+
+from .nodes import intern_str
 if TYPE_CHECKING:
     from .kg import KnowledgeGraph
 
@@ -38,7 +41,7 @@ class PredicateKind(Enum):
             PredicateKind.METADATA: "metadata relationship (low semantic value)",
         }[self]
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EdgeView:
     subject_id: int
     predicate_id: str
@@ -47,6 +50,12 @@ class EdgeView:
     valid_end_date: Optional[date]
     invalid_reason: Optional[str]
 
+    @classmethod
+    def from_row(cls, row: Sequence) -> EdgeView:
+        """Build from an edge row, interning predicate_id and invalid_reason."""
+        s, p, o, start, end, reason = row
+        return cls(s, intern_str(p), o, start, end, intern_str(reason))
+
 @dataclass(frozen=True)
 class Predicate:
     relationship_id: str
@@ -77,6 +86,86 @@ class Predicate:
 
         return PredicateKind.METADATA
 
+def _flag(value) -> bool:
+    # relationship flags are '0' / '1' strings in the CDM DDL
+    if isinstance(value, str):
+        return value.strip() not in ("", "0")
+    return bool(value)
+
+def predicate_from_row(row) -> Predicate:
+    return Predicate(
+        relationship_id=row.relationship_id,
+        name=row.relationship_name,
+        reverse_id=row.reverse_relationship_id,
+        is_hierarchical=_flag(row.is_hierarchical),
+        defines_ancestry=_flag(row.defines_ancestry),
+    )
+
+class _Unclassified:
+    """Lookup used while a catalog classifies itself; tolerates dangling reverse ids."""
+
+    def __init__(self, predicates: dict[str, Predicate]):
+        self._predicates = predicates
+
+    def predicate(self, relationship_id: str) -> Predicate:
+        return self._predicates.get(relationship_id) or Predicate(
+            relationship_id, relationship_id, None, False, False
+        )
+
+class PredicateCatalog:
+    """
+    Immutable relationship_id -> (Predicate, PredicateKind) table.
+
+    Every predicate is classified once at construction, so kind lookups in
+    edge filtering are plain dict reads.
+    """
+
+    def __init__(self, predicates: Iterable[Predicate]):
+        by_id = {p.relationship_id: p for p in predicates}
+        lookup = _Unclassified(by_id)
+        self._entries: MappingProxyType[str, tuple[Predicate, PredicateKind]] = MappingProxyType({
+            rid: (p, p.classify_predicate(kg=lookup))
+            for rid, p in by_id.items()
+        })
+        ids_by_kind: dict[PredicateKind, set[str]] = {k: set() for k in PredicateKind}
+        for rid, (_, kind) in self._entries.items():
+            ids_by_kind[kind].add(rid)
+        self._ids_by_kind: MappingProxyType[PredicateKind, frozenset[str]] = MappingProxyType({
+            k: frozenset(ids) for k, ids in ids_by_kind.items()
+        })
+        self._ids_for_kinds: dict[frozenset[PredicateKind], frozenset[str]] = {}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable) -> PredicateCatalog:
+        """Build from relationship rows (see queries.q_predicates)."""
+        return cls(predicate_from_row(row) for row in rows)
+
+    def predicate(self, relationship_id: str) -> Predicate:
+        return self._entries[relationship_id][0]
+
+    def kind(self, relationship_id: str) -> PredicateKind:
+        return self._entries[relationship_id][1]
+
+    def ids_of_kind(self, kind: PredicateKind) -> frozenset[str]:
+        return self._ids_by_kind[kind]
+
+    def ids_for_kinds(self, kinds: Iterable[PredicateKind]) -> frozenset[str]:
+        key = frozenset(kinds)
+        ids = self._ids_for_kinds.get(key)
+        if ids is None:
+            ids = frozenset().union(*(self._ids_by_kind[k] for k in key))
+            self._ids_for_kinds[key] = ids
+        return ids
+
+    def __contains__(self, relationship_id: object) -> bool:
+        return relationship_id in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
 def _pred_id(pred: Predicate | str | None) -> str | None:
     if pred is None:
         return None
@@ -0,0 +1,288 @@
+from __future__ import annotations
+from array import array
+import os
+from pathlib import Path
+from typing import Callable, Sequence
+from zlib import crc32
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from .label_dictionary import LabelDictionary
+from .labels import LabelTable, read_sidecar, write_sidecar
+from .nodes import LabelMatch, LabelMatchKind, normalise_label
+
+"""
+Dense-vector index over concept names and synonyms.
+
+Each distinct normalised label (a LabelDictionary key) has one unit-length
+row in a ``vectors.npy`` matrix, memory-mapped on open. Queries are encoded
+in batches and scored by matrix multiply (cosine similarity), in row
+chunks so the full score matrix is never materialised. Large vocabularies
+can add an IVF coarse quantiser: rows are grouped under k-means centroids
+and a query only scores the rows of its n_probe nearest lists.
+
+Requires numpy (the ``embeddings`` extra).
+"""
+
+FORMAT = "omop-graph-embeddings-1"
+
+# texts -> (len(texts), dim) array; rows need not be normalised
+Encoder = Callable[[Sequence[str]], np.ndarray]
+
+
+class HashingEncoder:
+    """
+    Offline encoder: signed feature hashing of padded character n-grams of
+    the normalised text. Needs no model files, so indexes can be built and
+    tested anywhere; similar spellings get similar vectors.
+    """
+
+    def __init__(self, dim: int = 256, ngram: int = 3):
+        self.dim = dim
+        self.ngram = ngram
+
+    def config(self) -> dict[str, int]:
+        return {"dim": self.dim, "ngram": self.ngram}
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        n = self.ngram
+        for row, text in enumerate(texts):
+            padded = f" {normalise_label(text)} "
+            for i in range(max(1, len(padded) - n + 1)):
+                h = crc32(padded[i:i + n].encode("utf-8"))
+                out[row, h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        return out
+
+
+def _unit(rows: np.ndarray) -> np.ndarray:
+    rows = np.asarray(rows, dtype=np.float32)
+    norms = np.linalg.norm(rows, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return rows / norms
+
+
+def _top_k(scores: np.ndarray, ids: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Best k columns per row of scores (unordered), with their ids."""
+    if scores.shape[1] <= k:
+        return scores, ids
+    keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return np.take_along_axis(scores, keep, axis=1), np.take_along_axis(ids, keep, axis=1)
+
+
+def _kmeans(vectors: np.ndarray, n_lists: int, *, iterations: int, seed: int) -> np.ndarray:
+    """Spherical k-means centroids from a sample of the rows."""
+    rng = np.random.default_rng(seed)
+    n = len(vectors)
+    sample = np.sort(rng.choice(n, size=min(n, n_lists * 256), replace=False))
+    data = _unit(vectors[sample])
+    centroids = data[rng.choice(len(data), size=n_lists, replace=False)]
+    for _ in range(iterations):
+        assign = np.argmax(data @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, data)
+        empty = ~sums.any(axis=1)
+        sums[empty] = centroids[empty]
+        centroids = _unit(sums)
+    return centroids
+
+
+class EmbeddingIndex:
+    """
+    Unit vectors for the keys of a LabelDictionary, plus an optional IVF.
+
+    With an IVF, rows of list c are ``list_rows[list_offsets[c]:list_offsets[c + 1]]``.
+    """
+
+    # results per search when no limit is given
+    default_limit: int = 20
+    # rows scored per matrix multiply
+    chunk_rows: int = 65_536
+
+    def __init__(
+        self,
+        dictionary: LabelDictionary,
+        vectors: np.ndarray,
+        *,
+        encoder: Encoder | None = None,
+        centroids: np.ndarray | None = None,
+        list_offsets: Sequence[int] | None = None,
+        list_rows: Sequence[int] | None = None,
+        n_probe: int = 8,
+    ):
+        if len(vectors) != len(dictionary):
+            raise ValueError(f"{len(vectors)} vectors for {len(dictionary)} labels")
+        self.dictionary = dictionary
+        self.vectors = vectors
+        self.encoder = encoder or HashingEncoder(dim=vectors.shape[1])
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+        self.list_rows = None if list_rows is None else np.asarray(list_rows)
+        self.n_probe = n_probe
+
+    @classmethod
+    def build(
+        cls,
+        table: LabelTable | LabelDictionary,
+        *,
+        encoder: Encoder | None = None,
+        dtype: str = "float32",
+        batch_size: int = 4_096,
+        n_lists: int | None = None,
+        iterations: int = 10,
+        seed: int = 0,
+    ) -> EmbeddingIndex:
+        """
+        Encode every distinct label. n_lists sets the IVF size: None picks
+        sqrt(labels) above a million labels and no IVF below, 0 disables it.
+        """
+        dictionary = table if isinstance(table, LabelDictionary) else LabelDictionary.build(table)
+        encoder = encoder or HashingEncoder()
+        keys = [dictionary.key(k) for k in range(len(dictionary))]
+        blocks = [
+            _unit(encoder(keys[i:i + batch_size])).astype(dtype)
+            for i in range(0, len(keys), batch_size)
+        ]
+        vectors = np.concatenate(blocks) if blocks else np.zeros((0, 0), dtype=dtype)
+        del blocks
+
+        if n_lists is None:
+            n_lists = int(len(keys) ** 0.5) if len(keys) > 1_000_000 else 0
+        index = cls(dictionary, vectors, encoder=encoder)
+        if n_lists:
+            index._train_ivf(min(n_lists, len(keys)), iterations=iterations, seed=seed)
+        return index
+
+    @classmethod
+    def from_session(cls, session: Session, *, batch_size: int = 50_000, **options) -> EmbeddingIndex:
+        return cls.build(LabelTable.from_session(session, batch_size=batch_size), **options)
+
+    def _train_ivf(self, n_lists: int, *, iterations: int, seed: int) -> None:
+        centroids = _kmeans(self.vectors, n_lists, iterations=iterations, seed=seed)
+        assign = np.empty(len(self.vectors), dtype=np.int32)
+        for start in range(0, len(self.vectors), self.chunk_rows):
+            chunk = np.asarray(self.vectors[start:start + self.chunk_rows], dtype=np.float32)
+            assign[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+        order = np.argsort(assign, kind="stable").astype(np.int32)
+        counts = np.bincount(assign, minlength=n_lists)
+        self.centroids = centroids
+        self.list_offsets = array("q", [0, *np.cumsum(counts).tolist()])
+        self.list_rows = order
+
+    def save(self, directory: str | os.PathLike) -> None:
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / "vectors.npy", self.vectors)
+        arrays = dict(self.dictionary.arrays())
+        if self.centroids is not None:
+            np.save(directory / "centroids.npy", self.centroids)
+            arrays["list_offsets"] = self.list_offsets
+            arrays["list_rows"] = list_rows = array("i")
+            list_rows.frombytes(self.list_rows.astype(np.int32).tobytes())
+        write_sidecar(
+            directory,
+            arrays,
+            format=FORMAT,
+            ivf=self.centroids is not None,
+            encoder=self.encoder.config() if isinstance(self.encoder, HashingEncoder) else None,
+        )
+
+    @classmethod
+    def open(
+        cls,
+        directory: str | os.PathLike,
+        *,
+        encoder: Encoder | None = None,
+        n_probe: int = 8,
+    ) -> EmbeddingIndex:
+        """
+        Map an index written by save(). encoder is required unless the index
+        was built with a HashingEncoder, whose settings are in the manifest.
+        """
+        directory = Path(directory)
+        arrays, manifest = read_sidecar(directory, format=FORMAT)
+        if encoder is None:
+            if manifest.get("encoder") is None:
+                raise ValueError(f"{directory} was built with a custom encoder: pass encoder=")
+            encoder = HashingEncoder(**manifest["encoder"])
+        ivf = manifest["ivf"]
+        return cls(
+            LabelDictionary.from_arrays(arrays),
+            np.load(directory / "vectors.npy", mmap_mode="r"),
+            encoder=encoder,
+            centroids=np.load(directory / "centroids.npy") if ivf else None,
+            list_offsets=arrays["list_offsets"] if ivf else None,
+            list_rows=arrays["list_rows"] if ivf else None,
+            n_probe=n_probe,
+        )
+
+    def _exhaustive(self, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_ids = np.zeros((len(queries), 0), dtype=np.int64)
+        for start in range(0, len(self.vectors), self.chunk_rows):
+            chunk = np.asarray(self.vectors[start:start + self.chunk_rows], dtype=np.float32)
+            scores = queries @ chunk.T
+            ids = np.broadcast_to(np.arange(start, start + len(chunk)), scores.shape)
+            best_scores, best_ids = _top_k(
+                np.concatenate([best_scores, scores], axis=1),
+                np.concatenate([best_ids, ids], axis=1),
+                k,
+            )
+        return best_scores, best_ids
+
+    def _probe(self, query: np.ndarray, k: int, n_probe: int) -> tuple[np.ndarray, np.ndarray]:
+        near = np.argsort(-(self.centroids @ query))[:n_probe]
+        rows = np.concatenate([
+            self.list_rows[self.list_offsets[c]:self.list_offsets[c + 1]] for c in near
+        ]).astype(np.int64)
+        rows.sort()  # sequential reads from the mapped matrix
+        scores = np.asarray(self.vectors[rows], dtype=np.float32) @ query
+        s, i = _top_k(scores[None, :], rows[None, :], k)
+        return s[0], i[0]
+
+    def search_many(
+        self,
+        labels: Sequence[str],
+        *,
+        kind: LabelMatchKind | None = None,
+        limit: int | None = None,
+        n_probe: int | None = None,
+    ) -> list[list[tuple[float, LabelMatch]]]:
+        """
+        For each label, up to ``limit`` (cosine, LabelMatch) pairs, most
+        similar first; all labels are encoded and scored together.
+        """
+        limit = self.default_limit if limit is None else limit
+        inputs = [normalise_label(label) for label in labels]
+        if not inputs or not len(self.vectors) or limit <= 0:
+            return [[] for _ in inputs]
+        queries = _unit(self.encoder(inputs))
+        # a key can expand to entries of the other kind: over-fetch when filtering
+        k = min(len(self.vectors), limit * 2 if kind is not None else limit)
+
+        if self.centroids is None:
+            top = zip(*self._exhaustive(queries, k))
+        else:
+            top = (self._probe(q, k, n_probe or self.n_probe) for q in queries)
+
+        results = []
+        for input_label, (scores, ids) in zip(inputs, top):
+            order = np.argsort(-scores, kind="stable")
+            hits: list[tuple[float, LabelMatch]] = []
+            for j in order:
+                score = float(scores[j])
+                for match in self.dictionary.matches(int(ids[j]), input_label, kind=kind):
+                    hits.append((score, match))
+                if len(hits) >= limit:
+                    break
+            results.append(hits[:limit] if input_label else [])
+        return results
+
+    def search(self, label: str, **options) -> list[tuple[float, LabelMatch]]:
+        return self.search_many([label], **options)[0]
+
+    @property
+    def nbytes(self) -> int:
+        ivf = 0 if self.centroids is None else self.centroids.nbytes + self.list_rows.nbytes
+        return self.dictionary.nbytes + self.vectors.nbytes + ivf
@@ -1,35 +1,63 @@
 from __future__ import annotations
 from collections import defaultdict
-import re
+from operator import itemgetter
+import os
 from datetime import date
-from functools import lru_cache
-from typing import Optional, Iterable, Tuple
-from sqlalchemy.orm import Session
+from typing import Any, Optional, Iterable, Mapping, Tuple, TYPE_CHECKING
+from sqlalchemy.orm import Session, scoped_session
 from sqlalchemy.exc import PendingRollbackError, InvalidRequestError
 
 from .base import GraphBackend
-from .edges import EdgeView, Predicate, PredicateKind, is_active, _pred_id
-from .nodes import ConceptView, LabelMatch, LabelMatchKind
-
-from omop_graph.db.session import safe_execute
+from .cache import Cache, CacheFactory, CacheInfo, CacheRegistry, LRUCache, cached
+from .edges import (
+    EdgeView,
+    Predicate,
+    PredicateCatalog,
+    PredicateKind,
+    is_active,
+    predicate_from_row,
+    _pred_id,
+)
+from .nodes import ConceptView, LabelMatch, LabelMatchKind, label_match_rank, normalise_label
+from .persistent import PersistentCache, filter_key, vocabulary_release
+from .label_dictionary import LabelDictionary
+from .labels import KINDS
+from .bm25 import TokenIndex
+from .symspell import SymSpellIndex
+from .trigram import TrigramIndex
+
+from omop_graph.db.session import PerCallSession, PerThreadSession, SessionScope, open_session, safe_execute
 from .queries import (
-    q_concept_view,
+    s_concept_view,
+    s_concept_views,
+    s_concept_name_match,
+    s_concept_name_ilike,
+    s_concept_synonym_match,
+    s_concept_synonym_ilike,
+    s_concept_names_in,
+    s_concept_synonyms_in,
+    s_concept_labels_match,
+    s_concept_labels_ilike,
+    label_params,
+    bound_edges,
+    s_ancestors,
+    s_descendants,
+    s_ancestor_pairs,
     q_concept_id_by_code,
     q_predicate_row,
     q_predicate_name,
-    q_outgoing_edges,
-    q_incoming_edges,
+    q_predicates,
+    q_vocabulary_versions,
     q_parents,
-    q_concept_name_match,
-    q_concept_name_ilike,
-    q_concept_synonym_match,
-    q_concept_synonym_ilike,
     q_roots,
     q_leaves,
     q_singletons,
-    q_concept_synonym_filtered
+    q_concept_synonym_filtered,
 )
 
+if TYPE_CHECKING:
+    from .embeddings import EmbeddingIndex
+
 """
 OMOP-backed graph facade.
 
@@ -41,19 +69,317 @@ Responsibilities:
 """
 
 
-class KnowledgeGraph(GraphBackend):
+class _GraphCaches:
+    """
+    Cache state and row handling shared by KnowledgeGraph and
+    AsyncKnowledgeGraph; everything here is independent of how queries run.
+    """
+
+    catalog: PredicateCatalog
+
+    # state that does not depend on how queries run
+    _shared = (
+        "catalog", "caches", "_outgoing", "_incoming", "_domains",
+        "trigram_index", "label_dictionary", "symspell_index", "token_index", "embedding_index",
+    )
+
+    def _init_caches(
+        self,
+        cache_sizes: Mapping[str, int] | None,
+        cache_bytes: Mapping[str, int] | None,
+        cache_factory: CacheFactory,
+    ) -> None:
+        self.caches = CacheRegistry(cache_sizes, cache_bytes, factory=cache_factory)
+        self._outgoing = self.caches.get("outgoing_edges", 500_000)
+        self._incoming = self.caches.get("incoming_edges", 500_000)
+        # concept_id -> domain_id, filled as a side effect of edge queries
+        self._domains = self.caches.get("domains", 1_000_000)
+
+    @staticmethod
+    def _open_index(index, cls):
+        """An index instance as given, or cls.open() of a directory path."""
+        if index is None or isinstance(index, cls):
+            return index
+        return cls.open(index)
+
+    @staticmethod
+    def _open_embedding_index(index):
+        # numpy is optional: only import it when an index directory is given
+        if isinstance(index, (str, os.PathLike)):
+            from .embeddings import EmbeddingIndex
+            return EmbeddingIndex.open(index)
+        return index
+
+    def _normalise_label(self, s: str) -> str:
+        return normalise_label(s)
+
+    @staticmethod
+    def _label_matches(input_label: str, rows, kind: LabelMatchKind) -> Tuple[LabelMatch, ...]:
+        return tuple(
+            LabelMatch(
+                input_label=input_label,
+                matched_label=name,
+                concept_id=int(cid),
+                match_kind=kind,
+                is_standard=is_standard,
+                is_active=is_active,
+            )
+            for cid, name, is_standard, is_active in rows
+        )
+
+    @staticmethod
+    def _kinded_label_matches(input_label: str, rows) -> Tuple[LabelMatch, ...]:
+        """Rows of s_concept_labels_*, whose fifth column is an index into KINDS."""
+        return tuple(
+            LabelMatch(
+                input_label=input_label,
+                matched_label=name,
+                concept_id=int(cid),
+                match_kind=KINDS[kind],
+                is_standard=is_standard,
+                is_active=is_active,
+            )
+            for cid, name, is_standard, is_active, kind in rows
+        )
+
+    @staticmethod
+    def _rank_label_matches(matches: Iterable[LabelMatch]) -> Tuple[LabelMatch, ...]:
+        """The s_concept_labels_* order, for matches found without it."""
+        return tuple(sorted(matches, key=lambda m: (label_match_rank(m), m.concept_id)))
+
+    def _edge_filters(
+        self,
+        predicate_kinds: Iterable[PredicateKind] | None,
+        active_only: bool,
+        on: date | None,
+    ) -> tuple[frozenset[PredicateKind] | None, bool, date | None]:
+        """Canonical filter signature; part of every edge cache key."""
+        kinds = frozenset(predicate_kinds) if predicate_kinds else None
+        return kinds, active_only, (on if active_only else None)
+
+    def _query_filters(self, signature) -> dict:
+        kinds, active_only, on = signature
+        return dict(
+            relationship_ids=self.catalog.ids_for_kinds(kinds) if kinds else None,
+            active_only=active_only,
+            on=on,
+        )
+
+    def _from_unfiltered(
+        self,
+        cache: Cache,
+        concept_id: int,
+        relationship_id: str | None,
+        signature,
+    ) -> tuple[EdgeView, ...] | None:
+        """
+        Derive a filtered edge list from a cached unfiltered one, if present.
+        """
+        kinds, active_only, on = signature
+        if kinds is None and not active_only:
+            return None
+        edges = cache.get((concept_id, relationship_id, None, False, None))
+        if edges is None:
+            return None
+        allowed = self.catalog.ids_for_kinds(kinds) if kinds else None
+        return tuple(
+            e for e in edges
+            if (allowed is None or e.predicate_id in allowed)
+            and (not active_only or is_active(
+                e.valid_start_date, e.valid_end_date, e.invalid_reason, on=on,
+            ))
+        )
+
+    def _edge_views(self, rows: Iterable[tuple]) -> tuple[EdgeView, ...]:
+        """EdgeViews from edge rows, recording the endpoint domains they carry."""
+        edges = []
+        for *row, subject_domain, object_domain in rows:
+            e = EdgeView.from_row(row)
+            if subject_domain is not None:
+                self._domains.put(e.subject_id, subject_domain)
+            if object_domain is not None:
+                self._domains.put(e.object_id, object_domain)
+            edges.append(e)
+        return tuple(edges)
+
+    def cache_info(self) -> dict[str, CacheInfo]:
+        return self.caches.info()
+
+    def clear_caches(self) -> None:
+        """Clear the in-memory caches; a persistent tier, if any, is left intact."""
+        self.caches.clear()
+
+
+class KnowledgeGraph(_GraphCaches, GraphBackend):
 
-    def __init__(self, session: Session):
+    # max number of ids per IN (...) clause for frontier-level batch queries
+    batch_size: int = 1_000
+
+    def __init__(
+        self,
+        session: Session | scoped_session | PerThreadSession | PerCallSession,
+        *,
+        cache_sizes: Mapping[str, int] | None = None,
+        cache_bytes: Mapping[str, int] | None = None,
+        cache_factory: CacheFactory = LRUCache,
+        persistent_cache: PersistentCache | str | os.PathLike | None = None,
+        trigram_index: TrigramIndex | str | os.PathLike | None = None,
+        label_dictionary: LabelDictionary | str | os.PathLike | None = None,
+        symspell_index: SymSpellIndex | str | os.PathLike | None = None,
+        token_index: TokenIndex | str | os.PathLike | None = None,
+        embedding_index: EmbeddingIndex | str | os.PathLike | None = None,
+    ):
+        """
+        Caches are per instance and named after their accessor ("concept_view",
+        "label_lookup", "outgoing_edges", ...). cache_sizes / cache_bytes
+        override the entry limit / approximate byte budget by name, and
+        cache_factory can swap in another Cache implementation.
+
+        persistent_cache (a PersistentCache or a file path) adds an on-disk
+        tier for concept views and edges, consulted before the database and
+        tagged with the vocabulary release. A cache opened from a path is
+        closed by close() or on leaving a with block.
+
+        session may be a plain Session (single-threaded), a PerThreadSession
+        or a PerCallSession; see from_url. A caller-owned scoped_session also
+        works, but keeps a connection per thread until it is removed. Caches are shared by all threads.
+
+        trigram_index (a TrigramIndex or a directory written by its save())
+        answers fuzzy label_lookup / synonym_lookup in memory instead of with
+        ILIKE '%...%' scans.
+
+        label_dictionary (a LabelDictionary or a directory written by its
+        save()) does the same for exact label_lookup / synonym_lookup and
+        their _many variants.
+
+        symspell_index (a SymSpellIndex or a directory written by its save())
+        backs EditDistanceResolver, and token_index (a TokenIndex, or its
+        directory) backs TokenResolver; neither has a database fallback.
+        embedding_index (an EmbeddingIndex, or a directory built with the
+        default encoder) backs EmbeddingResolver and needs numpy.
+        """
         self.session = session
+        self._init_caches(cache_sizes, cache_bytes, cache_factory)
+        # the relationship table is small: load and classify it once
+        self.catalog = PredicateCatalog.from_rows(
+            self.session.execute(q_predicates()).all()
+        )
+        # a cache opened from a path belongs to the graph; close() closes it
+        self._owns_persistent = persistent_cache is not None and not isinstance(persistent_cache, PersistentCache)
+        if self._owns_persistent:
+            persistent_cache = PersistentCache(persistent_cache, release=self.vocabulary_release())
+        self.persistent = persistent_cache
+        self.trigram_index = self._open_index(trigram_index, TrigramIndex)
+        self.label_dictionary = self._open_index(label_dictionary, LabelDictionary)
+        self.symspell_index = self._open_index(symspell_index, SymSpellIndex)
+        self.token_index = self._open_index(token_index, TokenIndex)
+        self.embedding_index = self._open_embedding_index(embedding_index)
+
+    @classmethod
+    def from_url(
+        cls,
+        url: str,
+        *,
+        scope: SessionScope = "thread",
+        engine_options: Mapping[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> KnowledgeGraph:
+        """
+        Graph over the process-wide engine for url (see db.session.get_engine).
+
+        scope="thread" keeps one session per thread (holding a connection
+        only while a query runs), scope="call" one per query and
+        scope="shared" a single session. Other keyword
+        arguments go to the constructor.
+        """
+        return cls(open_session(url, scope=scope, **(engine_options or {})), **kwargs)
+
+    @classmethod
+    def _sharing(cls, session: Session, graph: _GraphCaches) -> KnowledgeGraph:
+        """
+        A graph on session that shares graph's catalog, caches and in-memory
+        indexes instead of loading its own (see AsyncKnowledgeGraph.run_sync).
+        """
+        view = cls.__new__(cls)
+        view.session = session
+        view.persistent = None
+        view._owns_persistent = False
+        for name in _GraphCaches._shared:
+            setattr(view, name, getattr(graph, name))
+        return view
+
+    def close(self) -> None:
+        """
+        Close the persistent cache if the graph opened it from a path; a
+        PersistentCache passed in, and the session, stay with the caller.
+        """
+        if self._owns_persistent:
+            self.persistent.close()
+            self._owns_persistent = False
+
+    def __enter__(self) -> KnowledgeGraph:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
-    @lru_cache(maxsize=200_000)
+    def vocabulary_release(self) -> str:
+        """Release tag of the loaded vocabularies, from the vocabulary table."""
+        return vocabulary_release(self.session.execute(q_vocabulary_versions()).all())
+
+    @cached("concept_view", maxsize=200_000)
     def concept_view(self, concept_id: int) -> ConceptView:
+        if self.persistent is not None:
+            view = self.persistent.get_concept(concept_id)
+            if view is not None:
+                return view
         row = self.session.execute(
-            q_concept_view(concept_id)
+            s_concept_view(), {"concept_id": concept_id}
         ).one()
-        return ConceptView(*row)
+        view = ConceptView.from_row(row)
+        if self.persistent is not None:
+            self.persistent.put_concept(view)
+        return view
+
+    def concept_views(self, concept_ids: Iterable[int]) -> dict[int, ConceptView]:
+        """
+        ConceptViews for many ids, keyed by concept_id.
 
-    @lru_cache(maxsize=200_000)
+        Uncached ids are fetched in chunked IN (...) queries and written back
+        to the concept_view cache. Ids with no concept row are omitted.
+        """
+        cache = self.caches.get("concept_view", self.concept_view.cache_maxsize)
+        result: dict[int, ConceptView] = {}
+        missing: list[int] = []
+        for cid in dict.fromkeys(concept_ids):
+            view = cache.get((cid,))
+            if view is None:
+                missing.append(cid)
+            else:
+                result[cid] = view
+
+        disk = self.persistent
+        if disk is not None and missing:
+            for cid, view in disk.get_concepts(missing).items():
+                result[cid] = view
+                cache.put((cid,), view)
+            missing = [cid for cid in missing if cid not in result]
+
+        for i in range(0, len(missing), self.batch_size):
+            chunk = missing[i:i + self.batch_size]
+            views = [
+                ConceptView.from_row(row)
+                for row in self.session.execute(s_concept_views(), {"concept_ids": chunk})
+            ]
+            if disk is not None:
+                disk.put_concepts(views)
+            for view in views:
+                result[view.concept_id] = view
+                cache.put((view.concept_id,), view)
+
+        return result
+
+    @cached("concept_id_by_code", maxsize=200_000)
     def concept_id_by_code(self, vocabulary_id: str, concept_code: str) -> int:
         return int(
             self.session.execute(
@@ -61,7 +387,7 @@ class KnowledgeGraph(GraphBackend):
             ).scalar_one()
         )
     
-    @lru_cache(maxsize=200_000)
+    @cached("synonym_lookup", maxsize=200_000)
     def synonym_lookup(self, label: str, fuzzy: bool = False) -> Tuple[LabelMatch, ...]:
         """
         Resolve a synonym label to concept_id(s).
@@ -71,24 +397,18 @@ class KnowledgeGraph(GraphBackend):
         input_label = self._normalise_label(label)
         if not input_label:
             return ()
+        if fuzzy and self.trigram_index is not None:
+            return self._trigram_matches(input_label, LabelMatchKind.SYNONYM)
+        if not fuzzy and self.label_dictionary is not None:
+            return self.label_dictionary.lookup(input_label, kind=LabelMatchKind.SYNONYM)
         
-        cs = q_concept_synonym_ilike(input_label) if fuzzy else q_concept_synonym_match(input_label)
+        cs = s_concept_synonym_ilike() if fuzzy else s_concept_synonym_match()
 
-        syn_rows = self.session.execute(cs).all()
+        syn_rows = self.session.execute(cs, label_params(input_label, fuzzy)).all()
 
-        return tuple(
-            LabelMatch(
-                input_label=input_label,
-                matched_label=name,
-                concept_id=int(cid),
-                match_kind=LabelMatchKind.SYNONYM,
-                is_standard=is_standard,
-                is_active=is_active,
-            )
-            for cid, name, is_standard, is_active in syn_rows
-        )
+        return self._label_matches(input_label, syn_rows, LabelMatchKind.SYNONYM)
     
-    @lru_cache(maxsize=200_000)
+    @cached("label_lookup", maxsize=200_000)
     def label_lookup(self, label: str, fuzzy: bool = False) -> Tuple[LabelMatch, ...]:
         """
         Resolve a label to concept_id(s), preferring Concept.concept_name matches.
@@ -97,93 +417,340 @@ class KnowledgeGraph(GraphBackend):
         input_label = self._normalise_label(label)
         if not input_label:
             return ()
+        if fuzzy and self.trigram_index is not None:
+            return self._trigram_matches(input_label, LabelMatchKind.DIRECT)
+        if not fuzzy and self.label_dictionary is not None:
+            return self.label_dictionary.lookup(input_label, kind=LabelMatchKind.DIRECT)
         
-        cn = q_concept_name_ilike(input_label) if fuzzy else q_concept_name_match(input_label)
+        cn = s_concept_name_ilike() if fuzzy else s_concept_name_match()
 
-        direct_rows = self.session.execute(cn).all()
+        direct_rows = self.session.execute(cn, label_params(input_label, fuzzy)).all()
 
-        return tuple(
-            LabelMatch(
-                input_label=input_label,
-                matched_label=name,
-                concept_id=int(cid),
-                match_kind=LabelMatchKind.DIRECT,
-                is_standard=is_standard,
-                is_active=is_active,
-            )
-            for cid, name, is_standard, is_active in direct_rows
+        return self._label_matches(input_label, direct_rows, LabelMatchKind.DIRECT)
+
+    def _trigram_matches(self, input_label: str, kind: LabelMatchKind | None) -> Tuple[LabelMatch, ...]:
+        return tuple(m for _, m in self.trigram_index.search(input_label, kind=kind))
+
+    @cached("label_and_synonym_lookup", maxsize=200_000)
+    def label_and_synonym_lookup(self, label: str, fuzzy: bool = False) -> Tuple[LabelMatch, ...]:
+        """
+        label_lookup and synonym_lookup in one round trip: DIRECT and SYNONYM
+        matches from a single UNION ALL, ranked by label_match_rank.
+        """
+        input_label = self._normalise_label(label)
+        if not input_label:
+            return ()
+        if fuzzy and self.trigram_index is not None:
+            return self._rank_label_matches(self._trigram_matches(input_label, None))
+        if not fuzzy and self.label_dictionary is not None:
+            return self._rank_label_matches(self.label_dictionary.lookup(input_label))
+
+        stmt = s_concept_labels_ilike() if fuzzy else s_concept_labels_match()
+        rows = self.session.execute(stmt, label_params(input_label, fuzzy)).all()
+        return self._kinded_label_matches(input_label, rows)
+
+    def label_and_synonym_lookup_many(self, labels: Iterable[str]) -> dict[str, Tuple[LabelMatch, ...]]:
+        """
+        Exact label_and_synonym_lookup for many labels, from the batched
+        label_lookup_many and synonym_lookup_many queries.
+        """
+        labels = list(dict.fromkeys(labels))
+        direct = self.label_lookup_many(labels)
+        synonyms = self.synonym_lookup_many(labels)
+        cache = self.caches.get("label_and_synonym_lookup", 200_000)
+        result = {}
+        for label in labels:
+            result[label] = self._rank_label_matches(direct[label] + synonyms[label])
+            cache.put((label,), result[label])
+        return result
+
+    def label_lookup_many(self, labels: Iterable[str]) -> dict[str, Tuple[LabelMatch, ...]]:
+        """
+        Exact label_lookup for many labels, keyed by the label as given.
+
+        Uncached labels are matched in chunked IN (...) queries on lowered
+        concept names and written back to the label_lookup cache.
+        """
+        return self._lookup_many(
+            "label_lookup", labels, s_concept_names_in(), LabelMatchKind.DIRECT,
+        )
+
+    def synonym_lookup_many(self, labels: Iterable[str]) -> dict[str, Tuple[LabelMatch, ...]]:
+        """
+        Exact synonym_lookup for many labels; see label_lookup_many.
+        """
+        return self._lookup_many(
+            "synonym_lookup", labels, s_concept_synonyms_in(), LabelMatchKind.SYNONYM,
         )
 
-    @lru_cache(maxsize=200_000)
+    def _lookup_many(
+        self,
+        name: str,
+        labels: Iterable[str],
+        stmt,
+        kind: LabelMatchKind,
+    ) -> dict[str, Tuple[LabelMatch, ...]]:
+        cache = self.caches.get(name, 200_000)
+        result: dict[str, Tuple[LabelMatch, ...]] = {}
+        # normalised label -> labels as given
+        missing: dict[str, list[str]] = {}
+        for label in dict.fromkeys(labels):
+            matches = cache.get((label,))
+            if matches is not None:
+                result[label] = matches
+                continue
+            input_label = self._normalise_label(label)
+            if input_label:
+                missing.setdefault(input_label, []).append(label)
+            else:
+                result[label] = ()
+                cache.put((label,), ())
+
+        if self.label_dictionary is not None:
+            for input_label, given in missing.items():
+                matches = self.label_dictionary.lookup(input_label, kind=kind)
+                for label in given:
+                    result[label] = matches
+                    cache.put((label,), matches)
+            return result
+
+        pending = list(missing)
+        for i in range(0, len(pending), self.batch_size):
+            chunk = pending[i:i + self.batch_size]
+            rows: dict[str, list] = {input_label: [] for input_label in chunk}
+            for row in self.session.execute(stmt, {"labels": chunk}):
+                group = rows.get(row[1].lower())
+                if group is not None:
+                    group.append(row)
+            for input_label, group in rows.items():
+                matches = self._label_matches(input_label, group, kind)
+                for label in missing[input_label]:
+                    result[label] = matches
+                    cache.put((label,), matches)
+
+        return result
+
+    @cached("concept_ids_by_label", maxsize=200_000)
     def concept_ids_by_label(self, label: str) -> Tuple[int, ...]:
         rows = self.session.execute(
-            q_concept_name_match(label)
+            s_concept_name_match(), {"label": label}
         ).scalars()
 
         return tuple(rows)
 
-    @lru_cache(maxsize=10_000)
     def predicate(self, relationship_id: str) -> Predicate:
+        if relationship_id in self.catalog:
+            return self.catalog.predicate(relationship_id)
         row = self.session.execute(
             q_predicate_row(relationship_id)
         ).one()
+        return predicate_from_row(row)
 
-        return Predicate(
-            relationship_id=row.relationship_id,
-            name=row.relationship_name,
-            reverse_id=row.reverse_relationship_id,
-            is_hierarchical=bool(row.is_hierarchical),
-            defines_ancestry=bool(row.defines_ancestry),
-        )
-
-    @lru_cache(maxsize=10_000)
     def predicate_name(self, relationship_id: str) -> str:
+        if relationship_id in self.catalog:
+            return self.catalog.predicate(relationship_id).name
         return self.session.execute(
             q_predicate_name(relationship_id)
         ).scalar_one()
 
     def predicate_kind(self, relationship_id: str) -> PredicateKind:
+        if relationship_id in self.catalog:
+            return self.catalog.kind(relationship_id)
         return self.predicate(relationship_id).classify_predicate(kg=self)
 
     def reverse_predicate_id(self, relationship_id: str) -> Optional[str]:
         return self.predicate(relationship_id).reverse_id
     
-    def _normalise_label(self, s: str) -> str:
-        return re.sub(r"\s+", " ", s.strip().lower())
-
-    @lru_cache(maxsize=500_000)
     def outgoing_edges(
         self,
         concept_id: int,
         relationship_id: str | None = None,
+        *,
+        predicate_kinds: Iterable[PredicateKind] | None = None,
+        active_only: bool = False,
+        on: date | None = None,
     ) -> tuple[EdgeView, ...]:
+        """
+        Outgoing edges of one concept.
+
+        predicate_kinds / active_only / on are applied in SQL, and the result
+        is cached under that filter signature.
+        """
+        signature = self._edge_filters(predicate_kinds, active_only, on)
+        return self._edges(
+            concept_id, relationship_id, signature,
+            direction="out",
+            cache=self._outgoing,
+        )
 
-        stmt = q_outgoing_edges(concept_id, relationship_id)
+    def outgoing_edges_many(
+        self,
+        concept_ids: Iterable[int],
+        relationship_id: str | None = None,
+        *,
+        predicate_kinds: Iterable[PredicateKind] | None = None,
+        active_only: bool = False,
+        on: date | None = None,
+    ) -> dict[int, tuple[EdgeView, ...]]:
+        """
+        Outgoing edges for a whole frontier.
 
-        return tuple(
-            EdgeView(*row)
-            for row in self.session.execute(stmt).all()
+        Uncached ids are fetched in chunked IN (...) queries and written back
+        to the per-node cache used by outgoing_edges.
+        """
+        return self._edges_many(
+            concept_ids,
+            relationship_id,
+            self._edge_filters(predicate_kinds, active_only, on),
+            direction="out",
+            cache=self._outgoing,
+            key_of=itemgetter(0),  # subject_id
         )
-    
-    def _same_domain(self, e: EdgeView) -> bool:
-        subj = self.concept_view(e.subject_id)
-        obj = self.concept_view(e.object_id)
-        return subj.domain_id == obj.domain_id
 
-    @lru_cache(maxsize=500_000)
     def incoming_edges(
         self,
         concept_id: int,
         relationship_id: str | None = None,
+        *,
+        predicate_kinds: Iterable[PredicateKind] | None = None,
+        active_only: bool = False,
+        on: date | None = None,
+    ) -> tuple[EdgeView, ...]:
+        """
+        Incoming edges of one concept; see outgoing_edges.
+        """
+        signature = self._edge_filters(predicate_kinds, active_only, on)
+        return self._edges(
+            concept_id, relationship_id, signature,
+            direction="in",
+            cache=self._incoming,
+        )
+
+    def incoming_edges_many(
+        self,
+        concept_ids: Iterable[int],
+        relationship_id: str | None = None,
+        *,
+        predicate_kinds: Iterable[PredicateKind] | None = None,
+        active_only: bool = False,
+        on: date | None = None,
+    ) -> dict[int, tuple[EdgeView, ...]]:
+        """
+        Incoming edges for a whole frontier; see outgoing_edges_many.
+        """
+        return self._edges_many(
+            concept_ids,
+            relationship_id,
+            self._edge_filters(predicate_kinds, active_only, on),
+            direction="in",
+            cache=self._incoming,
+            key_of=itemgetter(2),  # object_id
+        )
+
+    def _edges(
+        self,
+        concept_id: int,
+        relationship_id: str | None,
+        signature,
+        *,
+        direction: str,
+        cache: Cache,
     ) -> tuple[EdgeView, ...]:
+        key = (concept_id, relationship_id, *signature)
+        edges = cache.get(key)
+        if edges is None:
+            edges = self._from_unfiltered(cache, concept_id, relationship_id, signature)
+        if edges is None:
+            disk = self.persistent
+            fkey = filter_key(relationship_id, *signature)
+            rows = disk.get_edges(direction, concept_id, fkey) if disk is not None else None
+            if rows is None:
+                rows = self._fetch_edge_rows(*bound_edges(
+                    direction, concept_id, relationship_id, **self._query_filters(signature)
+                ))
+                if disk is not None:
+                    disk.put_edges(direction, concept_id, fkey, rows)
+            edges = self._edge_views(rows)
+        cache.put(key, edges)
+        return edges
+
+    def _edges_many(
+        self,
+        concept_ids: Iterable[int],
+        relationship_id: str | None,
+        signature,
+        *,
+        direction: str,
+        cache: Cache,
+        key_of,
+    ) -> dict[int, tuple[EdgeView, ...]]:
+        result: dict[int, tuple[EdgeView, ...]] = {}
+        missing: list[int] = []
+        for cid in dict.fromkeys(concept_ids):
+            edges = cache.get((cid, relationship_id, *signature))
+            if edges is None:
+                edges = self._from_unfiltered(cache, cid, relationship_id, signature)
+            if edges is None:
+                missing.append(cid)
+            else:
+                result[cid] = edges
+
+        disk = self.persistent
+        fkey = filter_key(relationship_id, *signature)
+        if disk is not None and missing:
+            for cid, rows in disk.get_edges_many(direction, missing, fkey).items():
+                result[cid] = self._edge_views(rows)
+                cache.put((cid, relationship_id, *signature), result[cid])
+            missing = [cid for cid in missing if cid not in result]
+
+        filters = self._query_filters(signature)
+        for i in range(0, len(missing), self.batch_size):
+            chunk = missing[i:i + self.batch_size]
+            grouped: dict[int, list[tuple]] = {cid: [] for cid in chunk}
+            for row in self._fetch_edge_rows(*bound_edges(direction, chunk, relationship_id, **filters)):
+                grouped[key_of(row)].append(row)
+            if disk is not None:
+                disk.put_edges_many(direction, grouped, fkey)
+            for cid, rows in grouped.items():
+                result[cid] = self._edge_views(rows)
+                cache.put((cid, relationship_id, *signature), result[cid])
+
+        return result
+
+    def _fetch_edge_rows(self, stmt, params) -> list[tuple]:
+        """
+        Run a prebuilt edge statement (endpoint domains already joined in, so
+        within_domain filtering needs no per-endpoint concept_view lookups).
+        """
+        return [tuple(row) for row in self.session.execute(stmt, params)]
 
-        stmt = q_incoming_edges(concept_id, relationship_id)
+    def _domain_id(self, concept_id: int) -> str:
+        domain_id = self._domains.get(concept_id)
+        if domain_id is None:
+            domain_id = self.concept_view(concept_id).domain_id
+            self._domains.put(concept_id, domain_id)
+        return domain_id
 
-        return tuple(
-            EdgeView(*row)
-            for row in self.session.execute(stmt).all()
+    def _same_domain(self, e: EdgeView) -> bool:
+        return self._domain_id(e.subject_id) == self._domain_id(e.object_id)
+
+    def prefetch_edges(
+        self,
+        concept_ids: Iterable[int],
+        *,
+        direction: str,
+        predicate_kinds: set[PredicateKind] | None = None,
+        active_only: bool = True,
+        on: date | None = None,
+    ) -> None:
+        fetch = self.outgoing_edges_many if direction == "out" else self.incoming_edges_many
+        fetch(
+            concept_ids,
+            predicate_kinds=predicate_kinds,
+            active_only=active_only,
+            on=on,
         )
-    
+
     def iter_edges(
         self,
         concept_id: int,
@@ -195,42 +762,124 @@ class KnowledgeGraph(GraphBackend):
         on: date | None = None,
         within_domain: bool = True,
     )  -> Iterable[EdgeView]:
-        pred_id = _pred_id(predicate)
-
-        edges = (
-            self.outgoing_edges(concept_id, pred_id)
-            if direction == "out"
-            else self.incoming_edges(concept_id, pred_id)
+        fetch = self.outgoing_edges if direction == "out" else self.incoming_edges
+        edges = fetch(
+            concept_id,
+            _pred_id(predicate),
+            predicate_kinds=predicate_kinds,
+            active_only=active_only,
+            on=on,
         )
 
         for e in edges:
-            if active_only and not is_active(
-                e.valid_start_date,
-                e.valid_end_date,
-                e.invalid_reason,
-                on=on,
-            ):
-                continue
-
             if within_domain and not self._same_domain(e):
                 continue
 
-            if predicate_kinds and (
-                self.predicate_kind(e.predicate_id) not in predicate_kinds
-            ):
-                continue
-
             yield e
 
-    @lru_cache(maxsize=500_000)
+    @cached("parents", maxsize=500_000)
     def parents(self, concept_id: int) -> tuple[int, ...]:
         return tuple(
             self.session.execute(
                 q_parents(concept_id)
             ).scalars()
         )
-    
-    @lru_cache(maxsize=20_000)
+
+    def ancestors(
+        self,
+        concept_ids: Iterable[int],
+        max_levels: int | None = None,
+    ) -> dict[int, frozenset[int]]:
+        """
+        Ancestors of each concept (excluding itself) from concept_ancestor,
+        up to max_levels of separation when given.
+
+        Uncached ids are answered in chunked set-based queries, so the cost
+        does not depend on hierarchy depth or fan-out.
+        """
+        return self._closure("ancestors", s_ancestors, concept_ids, max_levels)
+
+    def descendants(
+        self,
+        concept_ids: Iterable[int],
+        max_levels: int | None = None,
+    ) -> dict[int, frozenset[int]]:
+        """
+        Descendants of each concept (excluding itself); see ancestors.
+        """
+        return self._closure("descendants", s_descendants, concept_ids, max_levels)
+
+    def _closure(
+        self,
+        name: str,
+        statement,
+        concept_ids: Iterable[int],
+        max_levels: int | None,
+    ) -> dict[int, frozenset[int]]:
+        cache = self.caches.get(name, 200_000)
+        result: dict[int, frozenset[int]] = {}
+        missing: list[int] = []
+        for cid in dict.fromkeys(concept_ids):
+            found = cache.get((cid, max_levels))
+            if found is None:
+                missing.append(cid)
+            else:
+                result[cid] = found
+
+        bounded = max_levels is not None
+        stmt = statement(bounded)
+        for i in range(0, len(missing), self.batch_size):
+            chunk = missing[i:i + self.batch_size]
+            grouped: dict[int, set[int]] = {cid: set() for cid in chunk}
+            params = {"concept_ids": chunk, **({"max_levels": max_levels} if bounded else {})}
+            for cid, other in self.session.execute(stmt, params):
+                grouped[cid].add(other)
+            for cid, found in grouped.items():
+                result[cid] = frozenset(found)
+                cache.put((cid, max_levels), result[cid])
+
+        return result
+
+    def is_descendant(
+        self,
+        pairs: Iterable[tuple[int, int]],
+    ) -> dict[tuple[int, int], bool]:
+        """
+        For each (descendant_id, ancestor_id) pair, whether the first concept
+        is a proper descendant of the second in concept_ancestor.
+
+        Pairs whose descendant already has cached unbounded ancestors are
+        answered without a query; the rest share one query per chunk.
+        """
+        cache = self.caches.get("is_descendant", 500_000)
+        closures = self.caches.get("ancestors", 200_000)
+        result: dict[tuple[int, int], bool] = {}
+        missing: list[tuple[int, int]] = []
+        for pair in dict.fromkeys(pairs):
+            answer = cache.get(pair)
+            if answer is None:
+                known = closures.get((pair[0], None))
+                if known is not None:
+                    answer = pair[1] in known
+            if answer is None:
+                missing.append(pair)
+            else:
+                result[pair] = answer
+
+        for i in range(0, len(missing), self.batch_size):
+            chunk = missing[i:i + self.batch_size]
+            params = {
+                "descendant_ids": sorted({d for d, _ in chunk}),
+                "ancestor_ids": sorted({a for _, a in chunk}),
+            }
+            hits = set(map(tuple, self.session.execute(s_ancestor_pairs(), params)))
+            for pair in chunk:
+                result[pair] = pair in hits
+                cache.put(pair, result[pair])
+
+        return result
+
+    @cached("roots", maxsize=20_000)
     def roots(self, domain_id: str | None = None, vocabulary_id: str | None = None) -> tuple[int, ...]:
         return tuple(
             self.session.execute(
@@ -238,7 +887,7 @@ class KnowledgeGraph(GraphBackend):
             ).scalars()
         )
     
-    @lru_cache(maxsize=20_000)
+    @cached("leaves", maxsize=20_000)
     def leaves(self, domain_id: str | None = None, vocabulary_id: str | None = None) -> tuple[int, ...]:
         return tuple(
             self.session.execute(
@@ -246,7 +895,7 @@ class KnowledgeGraph(GraphBackend):
             ).scalars()
         )
 
-    @lru_cache(maxsize=20_000)
+    @cached("singletons", maxsize=20_000)
     def singletons(self, domain_id: str | None = None, vocabulary_id: str | None = None) -> tuple[int, ...]:
         return tuple(
             self.session.execute(
@@ -254,7 +903,7 @@ class KnowledgeGraph(GraphBackend):
             ).scalars()
         )
 
-    @lru_cache(maxsize=50_000)
+    @cached("synonyms_for_concept", maxsize=50_000)
     def synonyms_for_concept(self, concept_id: int) -> tuple[str, ...]:
         rows = self.session.execute(
             q_concept_synonym_filtered(concept_id)
@@ -267,14 +916,3 @@ class KnowledgeGraph(GraphBackend):
             self.session.rollback()
         except (PendingRollbackError, InvalidRequestError):
             pass
-
-    def clear_caches(self) -> None:
-        self.concept_view.cache_clear()
-        self.concept_id_by_code.cache_clear()
-        self.label_lookup.cache_clear()
-        self.concept_ids_by_label.cache_clear()
-        self.predicate.cache_clear()
-        self.predicate_name.cache_clear()
-        self.parents.cache_clear()
-        self.outgoing_edges.cache_clear()
-        self.incoming_edges.cache_clear()
\ No newline at end of file
@@ -0,0 +1,162 @@
+from __future__ import annotations
+from array import array
+import os
+from typing import Iterable, Sequence
+
+from sqlalchemy.orm import Session
+
+from .labels import LabelTable, kind_code, read_sidecar, write_sidecar
+from .nodes import LabelMatch, LabelMatchKind, normalise_label
+
+"""
+Exact label dictionary over concept names and synonyms.
+
+Replaces ``lower(concept_name) = lower(:x)`` queries: the distinct
+normalised labels are kept as a sorted UTF-8 string table, and each key
+points at the range of label entries that normalise to it. A lookup is one
+binary search over byte strings, with no database access.
+"""
+
+FORMAT = "omop-graph-labels-1"
+
+
+class LabelDictionary:
+    """
+    Normalised label -> LabelTable entries.
+
+    keys[k] is ``key_blob[key_offsets[k]:key_offsets[k + 1]]`` in ascending
+    byte order; its entries are ``entries[entry_offsets[k]:entry_offsets[k + 1]]``.
+    """
+
+    def __init__(
+        self,
+        table: LabelTable,
+        *,
+        key_offsets: Sequence[int],
+        key_blob: Sequence[int],
+        entry_offsets: Sequence[int],
+        entries: Sequence[int],
+    ):
+        self.table = table
+        self.key_offsets = key_offsets
+        self.key_blob = memoryview(key_blob)
+        self.entry_offsets = entry_offsets
+        self.entries = entries
+
+    @classmethod
+    def build(cls, table: LabelTable) -> LabelDictionary:
+        keyed = sorted(
+            (normalise_label(label).encode("utf-8"), entry)
+            for entry, label in enumerate(table.iter_labels())
+        )
+        key_offsets, key_blob = array("q", [0]), bytearray()
+        entry_offsets, entries = array("q", [0]), array("i")
+        previous = None
+        for key, entry in keyed:
+            if key != previous:
+                if previous is not None:
+                    entry_offsets.append(len(entries))
+                key_blob += key
+                key_offsets.append(len(key_blob))
+                previous = key
+            entries.append(entry)
+        if previous is not None:
+            entry_offsets.append(len(entries))
+        return cls(
+            table,
+            key_offsets=key_offsets,
+            key_blob=array("B", key_blob),
+            entry_offsets=entry_offsets,
+            entries=entries,
+        )
+
+    @classmethod
+    def from_session(cls, session: Session, *, batch_size: int = 50_000) -> LabelDictionary:
+        return cls.build(LabelTable.from_session(session, batch_size=batch_size))
+
+    def arrays(self) -> dict[str, Sequence[int]]:
+        return {
+            **self.table.arrays(),
+            "key_offsets": self.key_offsets,
+            "key_blob": self.key_blob,
+            "entry_offsets": self.entry_offsets,
+            "entries": self.entries,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: dict[str, Sequence[int]]) -> LabelDictionary:
+        return cls(
+            LabelTable.from_arrays(arrays),
+            key_offsets=arrays["key_offsets"],
+            key_blob=arrays["key_blob"],
+            entry_offsets=arrays["entry_offsets"],
+            entries=arrays["entries"],
+        )
+
+    def save(self, directory: str | os.PathLike) -> None:
+        write_sidecar(directory, self.arrays(), format=FORMAT)
+
+    @classmethod
+    def open(cls, directory: str | os.PathLike) -> LabelDictionary:
+        arrays, _ = read_sidecar(directory, format=FORMAT)
+        return cls.from_arrays(arrays)
+
+    def __len__(self) -> int:
+        return len(self.key_offsets) - 1
+
+    def _key(self, k: int) -> bytes:
+        return self.key_blob[self.key_offsets[k]:self.key_offsets[k + 1]].tobytes()
+
+    def _find(self, key: bytes) -> int | None:
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self) and self._key(lo) == key:
+            return lo
+        return None
+
+    def key(self, k: int) -> str:
+        return self._key(k).decode("utf-8")
+
+    def matches(
+        self,
+        k: int,
+        input_label: str,
+        *,
+        kind: LabelMatchKind | None = None,
+    ) -> tuple[LabelMatch, ...]:
+        """LabelMatch for every entry of key k, reported against input_label."""
+        code = kind_code(kind)
+        table = self.table
+        return tuple(
+            table.match(entry, input_label)
+            for entry in self.entries[self.entry_offsets[k]:self.entry_offsets[k + 1]]
+            if code is None or table.kinds[entry] == code
+        )
+
+    def lookup(self, label: str, *, kind: LabelMatchKind | None = None) -> tuple[LabelMatch, ...]:
+        """Entries whose normalised label equals normalise_label(label)."""
+        input_label = normalise_label(label)
+        k = self._find(input_label.encode("utf-8")) if input_label else None
+        if k is None:
+            return ()
+        return self.matches(k, input_label, kind=kind)
+
+    def lookup_many(
+        self,
+        labels: Iterable[str],
+        *,
+        kind: LabelMatchKind | None = None,
+    ) -> dict[str, tuple[LabelMatch, ...]]:
+        return {label: self.lookup(label, kind=kind) for label in dict.fromkeys(labels)}
+
+    @property
+    def nbytes(self) -> int:
+        return self.table.nbytes + sum(
+            memoryview(a).nbytes
+            for a in (self.key_offsets, self.key_blob, self.entry_offsets, self.entries)
+        )
@@ -0,0 +1,175 @@
+from __future__ import annotations
+from array import array
+from dataclasses import dataclass
+import json
+import os
+from pathlib import Path
+import sys
+from typing import Any, Iterable, Sequence
+
+from sqlalchemy.orm import Session
+
+from .csr import _stream
+from .nodes import LabelMatch, LabelMatchKind
+from .queries import q_concept_name, q_concept_synonym
+from .snapshot import _Strings, _map_array
+
+"""
+Concept labels (names and synonyms) as compact columns.
+
+Scope: the label entries that the in-memory label indexes are built over,
+loaded in one streaming pass over concept and concept_synonym, and the
+sidecar-directory format those indexes are saved in (raw ``<name>.bin``
+arrays plus a ``manifest.json``, as for vocabulary snapshots).
+"""
+
+KINDS = (LabelMatchKind.DIRECT, LabelMatchKind.SYNONYM)
+_KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+_STANDARD, _ACTIVE = 1, 2
+
+_TABLE_ARRAYS = ("concept_ids", "kinds", "flags", "label_offsets", "labels")
+
+
+@dataclass(frozen=True)
+class LabelTable:
+    """
+    One entry per concept name or synonym row.
+
+    Entry ``i`` has concept_ids[i], a kind code (index into KINDS), flag
+    bits for is_standard / is_active, and its label text at
+    ``labels[label_offsets[i]:label_offsets[i + 1]]`` (UTF-8).
+    """
+    concept_ids: Sequence[int]
+    kinds: Sequence[int]
+    flags: Sequence[int]
+    label_offsets: Sequence[int]
+    labels: Sequence[int]
+
+    @classmethod
+    def from_rows(
+        cls,
+        names: Iterable[tuple],
+        synonyms: Iterable[tuple] = (),
+    ) -> LabelTable:
+        """
+        Build from ``(concept_id, label, is_standard, is_active)`` rows, as
+        returned by q_concept_name and q_concept_synonym.
+        """
+        concept_ids, kinds, flags = array("q"), array("B"), array("B")
+        labels = _Strings()
+        for kind, rows in ((0, names), (1, synonyms)):
+            for cid, label, is_standard, is_active in rows:
+                concept_ids.append(cid)
+                kinds.append(kind)
+                flags.append((_STANDARD if is_standard else 0) | (_ACTIVE if is_active else 0))
+                labels.append(label)
+        return cls(concept_ids, kinds, flags, labels.offsets, array("B", labels.blob))
+
+    @classmethod
+    def from_session(cls, session: Session, *, batch_size: int = 50_000) -> LabelTable:
+        return cls.from_rows(
+            _stream(session, q_concept_name(), batch_size),
+            _stream(session, q_concept_synonym(), batch_size),
+        )
+
+    def __len__(self) -> int:
+        return len(self.concept_ids)
+
+    def label(self, i: int) -> str:
+        return bytes(self.labels[self.label_offsets[i]:self.label_offsets[i + 1]]).decode("utf-8")
+
+    def iter_labels(self) -> Iterable[str]:
+        blob = bytes(self.labels)
+        offsets = self.label_offsets
+        for i in range(len(self.concept_ids)):
+            yield blob[offsets[i]:offsets[i + 1]].decode("utf-8")
+
+    def kind(self, i: int) -> LabelMatchKind:
+        return KINDS[self.kinds[i]]
+
+    def match(self, i: int, input_label: str) -> LabelMatch:
+        flags = self.flags[i]
+        return LabelMatch(
+            input_label=input_label,
+            matched_label=self.label(i),
+            concept_id=self.concept_ids[i],
+            match_kind=KINDS[self.kinds[i]],
+            is_standard=bool(flags & _STANDARD),
+            is_active=bool(flags & _ACTIVE),
+        )
+
+    def arrays(self) -> dict[str, Sequence[int]]:
+        return {name: getattr(self, name) for name in _TABLE_ARRAYS}
+
+    @classmethod
+    def from_arrays(cls, arrays: dict[str, Sequence[int]]) -> LabelTable:
+        return cls(*(arrays[name] for name in _TABLE_ARRAYS))
+
+    @property
+    def nbytes(self) -> int:
+        return sum(memoryview(a).nbytes for a in self.arrays().values())
+
+
+def kind_code(kind: LabelMatchKind | None) -> int | None:
+    return None if kind is None else _KIND_CODES[kind]
+
+
+def write_sidecar(
+    directory: str | os.PathLike,
+    arrays: dict[str, array],
+    *,
+    format: str,
+    **manifest: Any,
+) -> Path:
+    """
+    Write arrays and a manifest to ``directory``; the manifest goes last,
+    so a partially written directory is never opened as an index.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    specs = {}
+    for name, values in arrays.items():
+        if not isinstance(values, array):
+            values = array(memoryview(values).format, values)
+        with open(directory / f"{name}.bin", "wb") as f:
+            values.tofile(f)
+        specs[name] = dict(typecode=values.typecode, itemsize=values.itemsize, length=len(values))
+    tmp = directory / "manifest.json.tmp"
+    tmp.write_text(json.dumps(
+        {"format": format, "byteorder": sys.byteorder, "arrays": specs, **manifest}, indent=1,
+    ))
+    tmp.replace(directory / "manifest.json")
+    return directory
+
+
+def read_sidecar(
+    directory: str | os.PathLike,
+    *,
+    format: str,
+) -> tuple[dict[str, Sequence[int]], dict[str, Any]]:
+    """Memory-map the arrays written by write_sidecar; returns (arrays, manifest)."""
+    directory = Path(directory)
+    manifest = json.loads((directory / "manifest.json").read_text())
+    if manifest.get("format") != format:
+        raise ValueError(f"{directory} is not a {format} index: {manifest.get('format')!r}")
+    if manifest["byteorder"] != sys.byteorder:
+        raise ValueError(f"index written on a {manifest['byteorder']}-endian host")
+    arrays = {
+        name: _map_array(directory / f"{name}.bin", **spec)
+        for name, spec in manifest["arrays"].items()
+    }
+    return arrays, manifest
+
+
+def pack_strings(values: Iterable[str]) -> tuple[array, array]:
+    """(offsets, UTF-8 blob) for a list of strings."""
+    strings = _Strings()
+    for s in values:
+        strings.append(s)
+    return strings.offsets, array("B", strings.blob)
+
+
+def unpack_strings(offsets: Sequence[int], blob: Sequence[int]) -> list[str]:
+    data = bytes(blob)
+    return [data[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+
@@ -1,11 +1,23 @@
 
 from dataclasses import dataclass
 from datetime import date
-from typing import Optional
+import re
+import sys
+from typing import Optional, Sequence
 from enum import Enum, auto
 
 
-@dataclass(frozen=True)
+def normalise_label(s: str) -> str:
+    """Lowercase and collapse whitespace; the key for every label lookup."""
+    return re.sub(r"\s+", " ", s.strip().lower())
+
+
+def intern_str(s: Optional[str]) -> Optional[str]:
+    """sys.intern that passes None through; for low-cardinality columns."""
+    return sys.intern(s) if s is not None else None
+
+
+@dataclass(frozen=True, slots=True)
 class ConceptView:
     concept_id: int
     concept_name: str
@@ -18,6 +30,26 @@ class ConceptView:
     valid_end_date: date
     invalid_reason: Optional[str]
 
+    @classmethod
+    def from_row(cls, row: Sequence) -> "ConceptView":
+        """
+        Build from a q_concept_rows row, interning the vocabulary, domain,
+        class, standard and invalid_reason strings shared across concepts.
+        """
+        cid, name, code, vocab, domain, cls_id, std, start, end, reason = row
+        return cls(
+            cid,
+            name,
+            code,
+            intern_str(vocab),
+            intern_str(domain),
+            intern_str(cls_id),
+            intern_str(std),
+            start,
+            end,
+            intern_str(reason),
+        )
+
     def __repr__(self):
         return (
             f"ConceptView("
@@ -30,7 +62,7 @@ class LabelMatchKind(Enum):
     DIRECT = auto()
     SYNONYM = auto()
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LabelMatch:
     input_label: str
     matched_label: str
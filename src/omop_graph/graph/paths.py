@@ -1,10 +1,11 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from collections import deque, defaultdict
+from collections import defaultdict
 from typing import Optional
 
 from omop_graph.graph import kg
 
+from .base import AlgorithmCore, Prefetch, run_core, run_core_async
 from .edges import PredicateKind, EdgeView
 from .traverse import traverse, GraphTrace, TraceStep
 
@@ -18,13 +19,13 @@ Scope: Algorithms that find paths between nodes.
 i.e. What paths exist between nodes (does not yet score or explain them)
 """
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PathStep:
     subject: int
     predicate: str
     object: int
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GraphPath:
     steps: tuple[PathStep, ...]
 
@@ -68,16 +69,75 @@ def find_shortest_paths(
     """
     Find shortest paths using bidirectional BFS.
 
+    The smaller frontier is expanded one whole level at a time, so backends
+    that implement prefetch_edges issue one batch query per level.
+
     If trace=True, returns a GraphTrace containing only the
     nodes and edges actually expanded during the search.
     """
+    return run_core(kg, find_shortest_paths_core(
+        kg,
+        source,
+        target,
+        predicate_kinds=predicate_kinds,
+        max_depth=max_depth,
+        on=on,
+        max_paths=max_paths,
+        traced=traced,
+    ))
+
+
+async def find_shortest_paths_async(
+    kg,
+    source: int,
+    target: int,
+    *,
+    predicate_kinds: set[PredicateKind] | None = None,
+    max_depth: int = 6,
+    on=None,
+    max_paths: int = 20,
+    traced: bool = False,
+) -> tuple[list[GraphPath], GraphTrace | None]:
+    """
+    find_shortest_paths() over an AsyncKnowledgeGraph; each expanded level
+    is one awaited batch.
+    """
+    return await run_core_async(kg, find_shortest_paths_core(
+        kg.cached,
+        source,
+        target,
+        predicate_kinds=predicate_kinds,
+        max_depth=max_depth,
+        on=on,
+        max_paths=max_paths,
+        traced=traced,
+    ))
+
+
+def find_shortest_paths_core(
+    kg,
+    source: int,
+    target: int,
+    *,
+    predicate_kinds: set[PredicateKind] | None = None,
+    max_depth: int = 6,
+    on=None,
+    max_paths: int = 20,
+    traced: bool = False,
+) -> AlgorithmCore:
+    """
+    find_shortest_paths() as a generator yielding one Prefetch per level;
+    see run_core.
+    """
     if source == target:
         path = GraphPath(steps=())
         trace = GraphTrace(seeds=(source,), steps=[], terminated_reason="source_equals_target") if traced else None
         return [path], trace
 
-    q_fwd = deque([source])
-    q_bwd = deque([target])
+    # frontiers hold the nodes of a single BFS level; each iteration expands
+    # the smaller side one whole level at a time so edges can be batch-fetched
+    frontier_fwd = [source]
+    frontier_bwd = [target]
 
     depth_fwd = {source: 0}
     depth_bwd = {target: 0}
@@ -89,91 +149,96 @@ def find_shortest_paths(
     meeting_nodes: set[int] = set()
     trace_steps: list[TraceStep] = []
 
-    while q_fwd and q_bwd:
-        expand_forward = len(q_fwd) <= len(q_bwd)
+    while frontier_fwd and frontier_bwd:
+        fwd_open = depth_fwd[frontier_fwd[0]] < max_depth
+        bwd_open = depth_bwd[frontier_bwd[0]] < max_depth
+        if not (fwd_open or bwd_open):
+            break
 
+        expand_forward = fwd_open and (
+            not bwd_open or len(frontier_fwd) <= len(frontier_bwd)
+        )
+        frontier = frontier_fwd if expand_forward else frontier_bwd
+        d = (depth_fwd if expand_forward else depth_bwd)[frontier[0]]
+
+        yield Prefetch(frontier, "out" if expand_forward else "in", predicate_kinds, True, on)
+        next_frontier: list[int] = []
+
+        for cur in frontier:
+            expanded: list[EdgeView] = []
+            if expand_forward:
+                for e in kg.iter_edges(
+                    cur,
+                    direction="out",
+                    predicate_kinds=predicate_kinds,
+                    on=on,
+                ):
+                    nxt = e.object_id
+                    nd = d + 1
+                    if nd > max_depth:
+                        continue
+
+                    expanded.append(e)
+
+                    if nxt not in depth_fwd:
+                        depth_fwd[nxt] = nd
+                        next_frontier.append(nxt)
+
+                    if depth_fwd[nxt] == nd:
+                        parents_fwd[nxt].append((cur, e.predicate_id))
+
+                    if nxt in depth_bwd:
+                        total = nd + depth_bwd[nxt]
+                        if best_total_depth is None or total < best_total_depth:
+                            best_total_depth = total
+                            meeting_nodes = {nxt}
+                        elif total == best_total_depth:
+                            meeting_nodes.add(nxt)
+
+            else:
+                for e in kg.iter_edges(
+                    cur,
+                    direction="in",
+                    predicate_kinds=predicate_kinds,
+                    on=on,
+                ):
+                    expanded.append(e)
+                    prev = e.subject_id
+                    nd = d + 1
+                    if nd > max_depth:
+                        continue
+
+                    if prev not in depth_bwd:
+                        depth_bwd[prev] = nd
+                        next_frontier.append(prev)
+
+                    if depth_bwd[prev] == nd:
+                        parents_bwd[prev].append((cur, e.predicate_id))
+
+                    if prev in depth_fwd:
+                        total = depth_fwd[prev] + nd
+                        if best_total_depth is None or total < best_total_depth:
+                            best_total_depth = total
+                            meeting_nodes = {prev}
+                        elif total == best_total_depth:
+                            meeting_nodes.add(prev)
+
+            if traced:
+                trace_steps.append(TraceStep(depth=d, node=cur, expanded_edges=tuple(expanded)))
 
-        expanded: list[EdgeView] = []
         if expand_forward:
-            cur = q_fwd.popleft()
-            d = depth_fwd[cur]
-
-            if d >= max_depth:
-                continue
-            
-            for e in kg.iter_edges(
-                cur,
-                direction="out",
-                predicate_kinds=predicate_kinds,
-                on=on,
-            ):
-                nxt = e.object_id
-                nd = d + 1
-                if nd > max_depth:
-                    continue
-
-                expanded.append(e)
-
-                if nxt not in depth_fwd:
-                    depth_fwd[nxt] = nd
-                    q_fwd.append(nxt)
-
-                if depth_fwd[nxt] == nd:
-                    parents_fwd[nxt].append((cur, e.predicate_id))
-
-                if nxt in depth_bwd:
-                    total = nd + depth_bwd[nxt]
-                    if best_total_depth is None or total < best_total_depth:
-                        best_total_depth = total
-                        meeting_nodes = {nxt}
-                    elif total == best_total_depth:
-                        meeting_nodes.add(nxt)
-
+            frontier_fwd = next_frontier
         else:
-            cur = q_bwd.popleft()
-            d = depth_bwd[cur]
-
-            if d >= max_depth:
-                continue
-
-            for e in kg.iter_edges(
-                cur,
-                direction="in",
-                predicate_kinds=predicate_kinds,
-                on=on,
-            ):
-                expanded.append(e)
-                prev = e.subject_id
-                nd = d + 1
-                if nd > max_depth:
-                    continue
-
-                if prev not in depth_bwd:
-                    depth_bwd[prev] = nd
-                    q_bwd.append(prev)
-
-                if depth_bwd[prev] == nd:
-                    parents_bwd[prev].append((cur, e.predicate_id))
-
-                if prev in depth_fwd:
-                    total = depth_fwd[prev] + nd
-                    if best_total_depth is None or total < best_total_depth:
-                        best_total_depth = total
-                        meeting_nodes = {prev}
-                    elif total == best_total_depth:
-                        meeting_nodes.add(prev)
-
-        if traced:
-            trace_steps.append(TraceStep(depth=d, node=cur, expanded_edges=tuple(expanded)))
+            frontier_bwd = next_frontier
 
         # no shorter path possible
         if best_total_depth is not None:
             min_fwd = min(
-                (depth_fwd[n] for n in q_fwd),
+                (depth_fwd[n] for n in frontier_fwd),
                 default=depth_fwd[source],
             )
             min_bwd = min(
-                (depth_bwd[n] for n in q_bwd),
+                (depth_bwd[n] for n in frontier_bwd),
                 default=depth_bwd[target],
             )
             if min_fwd + min_bwd >= best_total_depth:
@@ -0,0 +1,287 @@
+from __future__ import annotations
+from datetime import date
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Iterable, Optional, Sequence
+
+from .edges import PredicateKind
+from .nodes import ConceptView
+
+"""
+Persistent warm cache.
+
+Scope: a local SQLite file sitting between the in-memory caches and the
+live database. It stores concept rows and edge rows, so restarted workers
+start warm. Entries are tagged with the vocabulary release; opening the
+file against a different release empties it.
+"""
+
+FORMAT_VERSION = "1"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS concept (
+    concept_id INTEGER PRIMARY KEY,
+    concept_name TEXT,
+    concept_code TEXT,
+    vocabulary_id TEXT,
+    domain_id TEXT,
+    concept_class_id TEXT,
+    standard_concept TEXT,
+    valid_start_date INTEGER,
+    valid_end_date INTEGER,
+    invalid_reason TEXT
+);
+CREATE TABLE IF NOT EXISTS edges (
+    direction TEXT NOT NULL,
+    concept_id INTEGER NOT NULL,
+    filters TEXT NOT NULL,
+    rows TEXT NOT NULL,
+    PRIMARY KEY (direction, concept_id, filters)
+) WITHOUT ROWID;
+"""
+
+# SQLite's default limit on host parameters is 999 on older builds
+_MAX_PARAMS = 900
+
+
+def _ordinal(d: date | None) -> int | None:
+    return d.toordinal() if d is not None else None
+
+
+def _date(ordinal: int | None) -> date | None:
+    return date.fromordinal(ordinal) if ordinal is not None else None
+
+
+def vocabulary_release(rows: Iterable[tuple[str, str | None]]) -> str:
+    """
+    Release tag from ``(vocabulary_id, vocabulary_version)`` rows.
+
+    Athena drops record their release on the 'None' vocabulary row; without
+    one, a digest of every vocabulary version is used instead.
+    """
+    rows = sorted((vid, version or "") for vid, version in rows)
+    for vid, version in rows:
+        if vid == "None" and version:
+            return version
+    digest = hashlib.sha1(
+        "\n".join(f"{vid}\t{version}" for vid, version in rows).encode()
+    )
+    return f"sha1:{digest.hexdigest()}"
+
+
+def filter_key(
+    relationship_id: str | None,
+    predicate_kinds: Iterable[PredicateKind] | None,
+    active_only: bool,
+    on: date | None,
+) -> str:
+    """Stable text form of an edge filter signature."""
+    kinds = ",".join(sorted(k.name for k in predicate_kinds)) if predicate_kinds else ""
+    return json.dumps(
+        [relationship_id, kinds, bool(active_only), _ordinal(on)],
+        separators=(",", ":"),
+    )
+
+
+def _encode_edges(rows: Sequence[tuple]) -> str:
+    return json.dumps(
+        [
+            [s, p, o, _ordinal(start), _ordinal(end), reason, *rest]
+            for s, p, o, start, end, reason, *rest in rows
+        ],
+        separators=(",", ":"),
+    )
+
+
+def _decode_edges(payload: str) -> list[tuple]:
+    return [
+        (s, p, o, _date(start), _date(end), reason, *rest)
+        for s, p, o, start, end, reason, *rest in json.loads(payload)
+    ]
+
+
+class PersistentCache:
+    """
+    SQLite-backed store of ConceptView rows and edge rows.
+
+    Edge rows are stored as queried, i.e. ``(subject, predicate, object,
+    valid_start, valid_end, invalid_reason, *extra)``, under a direction,
+    concept id and filter key. Safe to share between threads; separate
+    processes may open the same file (WAL mode).
+    """
+
+    def __init__(self, path: str | os.PathLike, release: str):
+        self.path = os.fspath(path)
+        self.release = release
+        self.hits = self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path,
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._check_release()
+
+    def _check_release(self) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                meta = dict(self._conn.execute("SELECT key, value FROM meta"))
+                if meta.get("release") != self.release or meta.get("format") != FORMAT_VERSION:
+                    self._conn.execute("DELETE FROM concept")
+                    self._conn.execute("DELETE FROM edges")
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                        [("release", self.release), ("format", FORMAT_VERSION)],
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _count(self, found: bool) -> None:
+        # callers hold self._lock, so concurrent lookups don't lose counts
+        if found:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def get_concept(self, concept_id: int) -> Optional[ConceptView]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM concept WHERE concept_id = ?", (concept_id,)
+            ).fetchone()
+            self._count(row is not None)
+        if row is None:
+            return None
+        *head, start, end, reason = row
+        return ConceptView.from_row((*head, _date(start), _date(end), reason))
+
+    def get_concepts(self, concept_ids: Sequence[int]) -> dict[int, ConceptView]:
+        """Stored ConceptViews for whichever of ``concept_ids`` are present."""
+        found: dict[int, ConceptView] = {}
+        for i in range(0, len(concept_ids), _MAX_PARAMS):
+            chunk = list(concept_ids[i:i + _MAX_PARAMS])
+            marks = ",".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT * FROM concept WHERE concept_id IN ({marks})", chunk
+                ).fetchall()
+                self.hits += len(rows)
+                self.misses += len(chunk) - len(rows)
+            for *head, start, end, reason in rows:
+                found[head[0]] = ConceptView.from_row((*head, _date(start), _date(end), reason))
+        return found
+
+    def put_concept(self, view: ConceptView) -> None:
+        self.put_concepts([view])
+
+    def put_concepts(self, views: Iterable[ConceptView]) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO concept VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            view.concept_id,
+                            view.concept_name,
+                            view.concept_code,
+                            view.vocabulary_id,
+                            view.domain_id,
+                            view.concept_class_id,
+                            view.standard_concept,
+                            _ordinal(view.valid_start_date),
+                            _ordinal(view.valid_end_date),
+                            view.invalid_reason,
+                        )
+                        for view in views
+                    ],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def get_edges(self, direction: str, concept_id: int, filters: str) -> Optional[list[tuple]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT rows FROM edges WHERE direction = ? AND concept_id = ? AND filters = ?",
+                (direction, concept_id, filters),
+            ).fetchone()
+            self._count(row is not None)
+        return None if row is None else _decode_edges(row[0])
+
+    def get_edges_many(
+        self,
+        direction: str,
+        concept_ids: Sequence[int],
+        filters: str,
+    ) -> dict[int, list[tuple]]:
+        """Stored edge rows for whichever of ``concept_ids`` are present."""
+        found: dict[int, list[tuple]] = {}
+        for i in range(0, len(concept_ids), _MAX_PARAMS):
+            chunk = list(concept_ids[i:i + _MAX_PARAMS])
+            marks = ",".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT concept_id, rows FROM edges WHERE direction = ? "
+                    f"AND filters = ? AND concept_id IN ({marks})",
+                    (direction, filters, *chunk),
+                ).fetchall()
+                self.hits += len(rows)
+                self.misses += len(chunk) - len(rows)
+            for cid, payload in rows:
+                found[cid] = _decode_edges(payload)
+        return found
+
+    def put_edges(self, direction: str, concept_id: int, filters: str, rows: Sequence[tuple]) -> None:
+        self.put_edges_many(direction, {concept_id: rows}, filters)
+
+    def put_edges_many(
+        self,
+        direction: str,
+        rows_by_concept: dict[int, Sequence[tuple]],
+        filters: str,
+    ) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO edges VALUES (?, ?, ?, ?)",
+                    [
+                        (direction, cid, filters, _encode_edges(rows))
+                        for cid, rows in rows_by_concept.items()
+                    ],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def __len__(self) -> int:
+        with self._lock:
+            (concepts,) = self._conn.execute("SELECT count(*) FROM concept").fetchone()
+            (edges,) = self._conn.execute("SELECT count(*) FROM edges").fetchone()
+        return concepts + edges
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM concept")
+            self._conn.execute("DELETE FROM edges")
+            self.hits = self.misses = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,6 +1,10 @@
 from __future__ import annotations
+from datetime import date
+from functools import lru_cache
+from typing import Any, Collection
 
-from sqlalchemy import select, func, case, literal, exists, and_
+from sqlalchemy import select, func, case, literal, exists, and_, or_, bindparam, union_all
+from sqlalchemy.orm import aliased
 from sqlalchemy.sql import Select
 
 from omop_alchemy.cdm.model.vocabulary import (
@@ -9,9 +13,11 @@ from omop_alchemy.cdm.model.vocabulary import (
     Concept_Relationship,
     Relationship,
     Concept_Synonym,
+    Vocabulary,
 )
 
-def q_concept_view(concept_id: int) -> Select:
+def q_concept_rows() -> Select:
+    """ConceptView columns, in ConceptView field order."""
     return (
         select(
             Concept.concept_id,
@@ -25,9 +31,14 @@ def q_concept_view(concept_id: int) -> Select:
             Concept.valid_end_date,
             Concept.invalid_reason,
         )
-        .where(Concept.concept_id == concept_id)
     )
 
+def q_concept_view(concept_id: int) -> Select:
+    return q_concept_rows().where(Concept.concept_id == concept_id)
+
+def q_concept_views(concept_ids: Collection[int]) -> Select:
+    return q_concept_rows().where(Concept.concept_id.in_(concept_ids))
+
 def q_concept_id_by_code(vocabulary_id: str, concept_code: str) -> Select:
     return (
         select(Concept.concept_id)
@@ -114,8 +125,8 @@ def q_predicate_row(relationship_id: str) -> Select:
     )
 
 
-def q_outgoing_edges(concept_id: int, relationship_id: str | None = None) -> Select:
-    stmt = (
+def q_edges() -> Select:
+    return (
         select(
             Concept_Relationship.concept_id_1,
             Concept_Relationship.relationship_id,
@@ -124,45 +135,124 @@ def q_outgoing_edges(concept_id: int, relationship_id: str | None = None) -> Sel
             Concept_Relationship.valid_end_date,
             Concept_Relationship.invalid_reason,
         )
-        .where(Concept_Relationship.concept_id_1 == concept_id)
     )
+
+
+def filter_edges(
+    stmt: Select,
+    *,
+    relationship_id: str | None = None,
+    relationship_ids: Collection[str] | None = None,
+    active_only: bool = False,
+    on: date | None = None,
+) -> Select:
+    """
+    Predicate and validity filters shared by all edge queries.
+
+    Mirrors edges.is_active: active means no invalid_reason and, when ``on``
+    is given, a validity window containing that date.
+    """
     if relationship_id is not None:
         stmt = stmt.where(Concept_Relationship.relationship_id == relationship_id)
+    if relationship_ids is not None:
+        stmt = stmt.where(Concept_Relationship.relationship_id.in_(sorted(relationship_ids)))
+    if active_only:
+        stmt = stmt.where(Concept_Relationship.invalid_reason.is_(None))
+        if on is not None:
+            stmt = stmt.where(
+                or_(Concept_Relationship.valid_start_date.is_(None), Concept_Relationship.valid_start_date <= on),
+                or_(Concept_Relationship.valid_end_date.is_(None), Concept_Relationship.valid_end_date >= on),
+            )
     return stmt
 
 
-def q_outgoing_edges_batch(concept_ids: list[int], relationship_id: str | None = None) -> Select:
-    stmt = (
-        select(
-            Concept_Relationship.concept_id_1,
-            Concept_Relationship.relationship_id,
-            Concept_Relationship.concept_id_2,
-            Concept_Relationship.valid_start_date,
-            Concept_Relationship.valid_end_date,
-            Concept_Relationship.invalid_reason,
-        )
-        .where(Concept_Relationship.concept_id_1.in_(concept_ids))
+def q_outgoing_edges(
+    concept_id: int,
+    relationship_id: str | None = None,
+    *,
+    relationship_ids: Collection[str] | None = None,
+    active_only: bool = False,
+    on: date | None = None,
+) -> Select:
+    return filter_edges(
+        q_edges().where(Concept_Relationship.concept_id_1 == concept_id),
+        relationship_id=relationship_id,
+        relationship_ids=relationship_ids,
+        active_only=active_only,
+        on=on,
     )
-    if relationship_id is not None:
-        stmt = stmt.where(Concept_Relationship.relationship_id == relationship_id)
-    return stmt
 
 
-def q_incoming_edges(concept_id: int, relationship_id: str | None = None) -> Select:
-    stmt = (
-        select(
-            Concept_Relationship.concept_id_1,
-            Concept_Relationship.relationship_id,
-            Concept_Relationship.concept_id_2,
-            Concept_Relationship.valid_start_date,
-            Concept_Relationship.valid_end_date,
-            Concept_Relationship.invalid_reason,
+def q_outgoing_edges_batch(
+    concept_ids: list[int],
+    relationship_id: str | None = None,
+    *,
+    relationship_ids: Collection[str] | None = None,
+    active_only: bool = False,
+    on: date | None = None,
+) -> Select:
+    return filter_edges(
+        q_edges().where(Concept_Relationship.concept_id_1.in_(concept_ids)),
+        relationship_id=relationship_id,
+        relationship_ids=relationship_ids,
+        active_only=active_only,
+        on=on,
+    )
+
+
+def q_incoming_edges_batch(
+    concept_ids: list[int],
+    relationship_id: str | None = None,
+    *,
+    relationship_ids: Collection[str] | None = None,
+    active_only: bool = False,
+    on: date | None = None,
+) -> Select:
+    return filter_edges(
+        q_edges().where(Concept_Relationship.concept_id_2.in_(concept_ids)),
+        relationship_id=relationship_id,
+        relationship_ids=relationship_ids,
+        active_only=active_only,
+        on=on,
+    )
+
+
+def q_incoming_edges(
+    concept_id: int,
+    relationship_id: str | None = None,
+    *,
+    relationship_ids: Collection[str] | None = None,
+    active_only: bool = False,
+    on: date | None = None,
+) -> Select:
+    return filter_edges(
+        q_edges().where(Concept_Relationship.concept_id_2 == concept_id),
+        relationship_id=relationship_id,
+        relationship_ids=relationship_ids,
+        active_only=active_only,
+        on=on,
+    )
+
+
+_subject_concept = aliased(Concept, name="subject_concept")
+_object_concept = aliased(Concept, name="object_concept")
+
+def with_endpoint_domains(stmt: Select) -> Select:
+    """
+    Append subject and object domain_id columns to a concept_relationship query.
+
+    Outer joins, so edges to concepts missing from the concept table are kept
+    (with NULL domains).
+    """
+    return (
+        stmt
+        .outerjoin(_subject_concept, _subject_concept.concept_id == Concept_Relationship.concept_id_1)
+        .outerjoin(_object_concept, _object_concept.concept_id == Concept_Relationship.concept_id_2)
+        .add_columns(
+            _subject_concept.domain_id.label("subject_domain_id"),
+            _object_concept.domain_id.label("object_domain_id"),
         )
-        .where(Concept_Relationship.concept_id_2 == concept_id)
     )
-    if relationship_id is not None:
-        stmt = stmt.where(Concept_Relationship.relationship_id == relationship_id)
-    return stmt
 
 
 def q_parents(concept_id: int) -> Select:
@@ -269,3 +359,219 @@ def q_leaves(*, vocabulary_id: str | None = None, domain_id: str | None = None)
             )
         )
     )
+
+def q_predicates() -> Select:
+    return (
+        select(
+            Relationship.relationship_id,
+            Relationship.relationship_name,
+            Relationship.reverse_relationship_id,
+            Relationship.is_hierarchical,
+            Relationship.defines_ancestry,
+        )
+    )
+
+def q_concept_domains() -> Select:
+    return (
+        select(Concept.concept_id, Concept.domain_id)
+        .order_by(Concept.concept_id)
+    )
+
+def q_vocabulary_versions() -> Select:
+    return (
+        select(Vocabulary.vocabulary_id, Vocabulary.vocabulary_version)
+        .order_by(Vocabulary.vocabulary_id)
+    )
+
+def q_concept_table() -> Select:
+    return q_concept_rows().order_by(Concept.concept_id)
+
+
+# Prebuilt statements.
+#
+# The s_* functions return one shared statement per query shape, with values
+# left as bind parameters; callers execute them as ``session.execute(stmt,
+# params)``. Reusing the statement object skips statement construction and
+# cache-key generation on every call, so only parameter binding remains.
+
+@lru_cache(maxsize=None)
+def s_concept_view() -> Select:
+    return q_concept_rows().where(Concept.concept_id == bindparam("concept_id"))
+
+@lru_cache(maxsize=None)
+def s_concept_views() -> Select:
+    return q_concept_rows().where(
+        Concept.concept_id.in_(bindparam("concept_ids", expanding=True))
+    )
+
+@lru_cache(maxsize=None)
+def s_concept_name_match() -> Select:
+    return q_concept_name().where(
+        func.lower(Concept.concept_name) == func.lower(bindparam("label"))
+    )
+
+@lru_cache(maxsize=None)
+def s_concept_name_ilike() -> Select:
+    return q_concept_name().where(Concept.concept_name.ilike(bindparam("pattern")))
+
+@lru_cache(maxsize=None)
+def s_concept_synonym_match() -> Select:
+    return q_concept_synonym().where(
+        func.lower(Concept_Synonym.concept_synonym_name) == func.lower(bindparam("label"))
+    )
+
+@lru_cache(maxsize=None)
+def s_concept_synonym_ilike() -> Select:
+    return q_concept_synonym().where(
+        Concept_Synonym.concept_synonym_name.ilike(bindparam("pattern"))
+    )
+
+@lru_cache(maxsize=None)
+def s_concept_names_in() -> Select:
+    return q_concept_name().where(
+        func.lower(Concept.concept_name).in_(bindparam("labels", expanding=True))
+    )
+
+@lru_cache(maxsize=None)
+def s_concept_synonyms_in() -> Select:
+    return q_concept_synonym().where(
+        func.lower(Concept_Synonym.concept_synonym_name).in_(bindparam("labels", expanding=True))
+    )
+
+def _labels_union(names: Select, synonyms: Select) -> Select:
+    """
+    Name and synonym rows in one statement, with a kind column (0 = name,
+    1 = synonym), ordered as label_match_rank: standard, active, names first.
+    """
+    labels = union_all(
+        names.add_columns(literal(0).label("kind")),
+        synonyms.add_columns(literal(1).label("kind")),
+    ).subquery("labels")
+    return select(labels).order_by(
+        labels.c.is_standard.desc(), labels.c.is_active.desc(), labels.c.kind, labels.c.concept_id,
+    )
+
+@lru_cache(maxsize=None)
+def s_concept_labels_match() -> Select:
+    return _labels_union(s_concept_name_match(), s_concept_synonym_match())
+
+@lru_cache(maxsize=None)
+def s_concept_labels_ilike() -> Select:
+    return _labels_union(s_concept_name_ilike(), s_concept_synonym_ilike())
+
+def label_params(label: str, fuzzy: bool) -> dict[str, str]:
+    """Parameters for the s_*_match (exact) or s_*_ilike (fuzzy) statements."""
+    return {"pattern": f"%{label}%"} if fuzzy else {"label": label}
+
+
+@lru_cache(maxsize=None)
+def s_edges(
+    direction: str,
+    batch: bool,
+    relationship: bool,
+    kinds: bool,
+    active_only: bool,
+    dated: bool,
+) -> Select:
+    """
+    Edge statement for one filter shape, with endpoint domains joined in.
+
+    Bind parameters: concept_id (or expanding concept_ids when ``batch``),
+    relationship_id, expanding relationship_ids, and on.
+    """
+    key = Concept_Relationship.concept_id_1 if direction == "out" else Concept_Relationship.concept_id_2
+    stmt = q_edges().where(
+        key.in_(bindparam("concept_ids", expanding=True)) if batch
+        else key == bindparam("concept_id")
+    )
+    if relationship:
+        stmt = stmt.where(Concept_Relationship.relationship_id == bindparam("relationship_id"))
+    if kinds:
+        stmt = stmt.where(
+            Concept_Relationship.relationship_id.in_(bindparam("relationship_ids", expanding=True))
+        )
+    if active_only:
+        stmt = stmt.where(Concept_Relationship.invalid_reason.is_(None))
+        if dated:
+            on = bindparam("on")
+            stmt = stmt.where(
+                or_(Concept_Relationship.valid_start_date.is_(None), Concept_Relationship.valid_start_date <= on),
+                or_(Concept_Relationship.valid_end_date.is_(None), Concept_Relationship.valid_end_date >= on),
+            )
+    return with_endpoint_domains(stmt)
+
+def bound_edges(
+    direction: str,
+    concept_ids: int | list[int],
+    relationship_id: str | None = None,
+    *,
+    relationship_ids: Collection[str] | None = None,
+    active_only: bool = False,
+    on: date | None = None,
+) -> tuple[Select, dict[str, Any]]:
+    """
+    Prebuilt edge statement and its parameters; the filters are those of
+    q_outgoing_edges / q_incoming_edges (and their _batch forms when
+    ``concept_ids`` is a list).
+    """
+    batch = not isinstance(concept_ids, int)
+    dated = active_only and on is not None
+    stmt = s_edges(
+        direction, batch, relationship_id is not None,
+        relationship_ids is not None, active_only, dated,
+    )
+    params: dict[str, Any] = {"concept_ids" if batch else "concept_id": concept_ids}
+    if relationship_id is not None:
+        params["relationship_id"] = relationship_id
+    if relationship_ids is not None:
+        params["relationship_ids"] = sorted(relationship_ids)
+    if dated:
+        params["on"] = on
+    return stmt, params
+
+
+@lru_cache(maxsize=None)
+def s_ancestors(bounded: bool) -> Select:
+    """
+    (descendant_id, ancestor_id) closure rows for expanding concept_ids,
+    excluding each concept itself; ``bounded`` adds a max_levels parameter.
+    """
+    stmt = (
+        select(Concept_Ancestor.descendant_concept_id, Concept_Ancestor.ancestor_concept_id)
+        .where(
+            Concept_Ancestor.descendant_concept_id.in_(bindparam("concept_ids", expanding=True)),
+            Concept_Ancestor.min_levels_of_separation >= 1,
+        )
+    )
+    if bounded:
+        stmt = stmt.where(Concept_Ancestor.min_levels_of_separation <= bindparam("max_levels"))
+    return stmt
+
+@lru_cache(maxsize=None)
+def s_descendants(bounded: bool) -> Select:
+    """(ancestor_id, descendant_id) closure rows; see s_ancestors."""
+    stmt = (
+        select(Concept_Ancestor.ancestor_concept_id, Concept_Ancestor.descendant_concept_id)
+        .where(
+            Concept_Ancestor.ancestor_concept_id.in_(bindparam("concept_ids", expanding=True)),
+            Concept_Ancestor.min_levels_of_separation >= 1,
+        )
+    )
+    if bounded:
+        stmt = stmt.where(Concept_Ancestor.min_levels_of_separation <= bindparam("max_levels"))
+    return stmt
+
+@lru_cache(maxsize=None)
+def s_ancestor_pairs() -> Select:
+    """
+    (descendant_id, ancestor_id) closure rows between two id sets; callers
+    keep the pairs they asked about.
+    """
+    return (
+        select(Concept_Ancestor.descendant_concept_id, Concept_Ancestor.ancestor_concept_id)
+        .where(
+            Concept_Ancestor.descendant_concept_id.in_(bindparam("descendant_ids", expanding=True)),
+            Concept_Ancestor.ancestor_concept_id.in_(bindparam("ancestor_ids", expanding=True)),
+            Concept_Ancestor.min_levels_of_separation >= 1,
+        )
+    )
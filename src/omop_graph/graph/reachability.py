@@ -0,0 +1,238 @@
+from __future__ import annotations
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .csr import CSRGraph
+
+"""
+Reachability index over the hierarchy of an in-memory graph.
+
+Responsibilities:
+- constant-time "is X a descendant of Y" checks with no database access
+- multiple inheritance and cycles in the hierarchy
+
+Labelling: the hierarchy is condensed into its strongly connected
+components, a spanning forest of the resulting DAG is numbered in
+postorder, and every component keeps the merged postorder intervals of
+all its descendants. A descendant check is then one bisect over the
+ancestor's intervals, which are few in practice because tree-shaped parts
+of the hierarchy collapse into a single interval.
+"""
+
+# child -> parent predicates followed when building the index
+UPWARD_PREDICATES = ("Is a",)
+
+
+def _components(n: int, parents: list[list[int]]) -> tuple[array, int]:
+    """Tarjan's strongly connected components, iteratively; node -> component."""
+    index = array("i", [-1]) * n
+    low = array("i", [0]) * n
+    component = array("i", [-1]) * n
+    on_stack = bytearray(n)
+    stack: list[int] = []
+    counter = n_components = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        work = [(root, 0)]
+        while work:
+            v, i = work.pop()
+            if i == 0:
+                index[v] = low[v] = counter
+                counter += 1
+                stack.append(v)
+                on_stack[v] = 1
+            elif i > 0:
+                # returning from parents[v][i - 1]
+                low[v] = min(low[v], low[parents[v][i - 1]])
+            for j in range(i, len(parents[v])):
+                w = parents[v][j]
+                if index[w] == -1:
+                    work.append((v, j + 1))
+                    work.append((w, 0))
+                    break
+                if on_stack[w]:
+                    low[v] = min(low[v], index[w])
+            else:
+                if low[v] == index[v]:
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = 0
+                        component[w] = n_components
+                        if w == v:
+                            break
+                    n_components += 1
+    return component, n_components
+
+
+def _merge(intervals: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    intervals.sort()
+    merged = [intervals[0]]
+    for lo, hi in intervals[1:]:
+        last_lo, last_hi = merged[-1]
+        if lo <= last_hi + 1:
+            if hi > last_hi:
+                merged[-1] = (last_lo, hi)
+        else:
+            merged.append((lo, hi))
+    return merged
+
+
+class ReachabilityIndex:
+    """
+    Descendant checks over concept ids in constant time.
+
+    Build with from_csr (or from_edges); concepts absent from the hierarchy
+    are nobody's descendant. A concept is not its own descendant, matching
+    KnowledgeGraph.is_descendant.
+    """
+
+    def __init__(
+        self,
+        *,
+        node_ids: Sequence[int],
+        component: Sequence[int],
+        post: Sequence[int],
+        offsets: Sequence[int],
+        lows: Sequence[int],
+        highs: Sequence[int],
+    ):
+        self.node_ids = node_ids
+        self.component = component
+        self.post = post
+        self.offsets = offsets
+        self.lows = lows
+        self.highs = highs
+
+    @classmethod
+    def from_csr(
+        cls,
+        graph: CSRGraph,
+        predicates: Iterable[str] = UPWARD_PREDICATES,
+    ) -> ReachabilityIndex:
+        """
+        Index the active child -> parent edges of ``predicates`` in a
+        CSRGraph (or SnapshotGraph).
+        """
+        codes = {graph._predicate_codes[p] for p in predicates if p in graph._predicate_codes}
+        adj = graph.outgoing
+        n = len(graph.node_ids)
+        parents: list[list[int]] = [[] for _ in range(n)]
+        for v in range(n):
+            for pos in range(adj.offsets[v], adj.offsets[v + 1]):
+                if adj.predicates[pos] in codes and not adj.invalid_reasons[pos]:
+                    w = adj.neighbours[pos]
+                    if w != v:
+                        parents[v].append(w)
+        return cls._build(graph.node_ids, parents)
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[tuple[int, int]]) -> ReachabilityIndex:
+        """Index ``(child_id, parent_id)`` pairs."""
+        edges = list(edges)
+        node_ids = array("q", sorted({cid for e in edges for cid in e}))
+        parents: list[list[int]] = [[] for _ in node_ids]
+        for child, parent in edges:
+            if child != parent:
+                parents[bisect_left(node_ids, child)].append(bisect_left(node_ids, parent))
+        return cls._build(node_ids, parents)
+
+    @classmethod
+    def _build(cls, node_ids: Sequence[int], parents: list[list[int]]) -> ReachabilityIndex:
+        component, n = _components(len(node_ids), parents)
+
+        # condensed DAG, parent component -> child components
+        children: list[set[int]] = [set() for _ in range(n)]
+        has_parent = bytearray(n)
+        for v, ps in enumerate(parents):
+            cv = component[v]
+            for w in ps:
+                cw = component[w]
+                if cw != cv:
+                    children[cw].add(cv)
+                    has_parent[cv] = 1
+        ordered = [sorted(c) for c in children]
+        del children
+
+        # spanning-forest postorder; in a DAG every child finishes before its parents
+        post = array("i", [0]) * n
+        low = array("i", [0]) * n
+        visited = bytearray(n)
+        finished: list[int] = []
+        for root in range(n):
+            if has_parent[root]:
+                continue
+            visited[root] = 1
+            low[root] = len(finished)
+            work = [(root, 0)]
+            while work:
+                c, i = work.pop()
+                kids = ordered[c]
+                while i < len(kids) and visited[kids[i]]:
+                    i += 1
+                if i < len(kids):
+                    d = kids[i]
+                    visited[d] = 1
+                    low[d] = len(finished)
+                    work.append((c, i + 1))
+                    work.append((d, 0))
+                else:
+                    post[c] = len(finished)
+                    finished.append(c)
+
+        # descendants of c = its own subtree interval plus its children's intervals
+        intervals: list[list[tuple[int, int]]] = [[] for _ in range(n)]
+        for c in finished:
+            own = [(low[c], post[c])]
+            for d in ordered[c]:
+                own.extend(intervals[d])
+            intervals[c] = _merge(own)
+
+        offsets = array("q", [0])
+        lows, highs = array("i"), array("i")
+        for c in range(n):
+            for lo, hi in intervals[c]:
+                lows.append(lo)
+                highs.append(hi)
+            offsets.append(len(lows))
+
+        return cls(
+            node_ids=node_ids,
+            component=component,
+            post=post,
+            offsets=offsets,
+            lows=lows,
+            highs=highs,
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            memoryview(a).nbytes
+            for a in (self.component, self.post, self.offsets, self.lows, self.highs)
+        )
+
+    def _index(self, concept_id: int) -> int | None:
+        i = bisect_left(self.node_ids, concept_id)
+        if i < len(self.node_ids) and self.node_ids[i] == concept_id:
+            return i
+        return None
+
+    def is_descendant(self, descendant_id: int, ancestor_id: int) -> bool:
+        i = self._index(descendant_id)
+        j = self._index(ancestor_id)
+        if i is None or j is None or i == j:
+            return False
+        ci, cj = self.component[i], self.component[j]
+        if ci == cj:
+            return True  # same cycle
+        p = self.post[ci]
+        end = self.offsets[cj + 1]
+        k = bisect_left(self.highs, p, self.offsets[cj], end)
+        return k < end and self.lows[k] <= p
+
+    def is_ancestor(self, ancestor_id: int, descendant_id: int) -> bool:
+        return self.is_descendant(descendant_id, ancestor_id)
@@ -61,8 +61,10 @@ def path_profile(kg: KnowledgeGraph, path: GraphPath) -> PathProfile:
     vocab_switches = 0
 
     prev_vocab = None
+    views = kg.concept_views(path.nodes())
     for cid in path.nodes():
-        c = kg.concept_view(cid)
+        # concept_views omits ids without a concept row; concept_view raises for them
+        c = views.get(cid) or kg.concept_view(cid)
         if c.invalid_reason:
             invalid += 1
         if c.standard_concept is None:
@@ -133,6 +135,8 @@ def rank_paths(
     kg: KnowledgeGraph,
     paths: list[GraphPath],
 ) -> list[GraphPath]:
+    # one batched lookup for every node on every path
+    kg.concept_views(cid for path in paths for cid in path.nodes())
     profiles = {
         path: path_profile(kg, path)
         for path in paths
@@ -0,0 +1,379 @@
+from __future__ import annotations
+from array import array
+import argparse
+from dataclasses import dataclass
+import json
+import mmap
+import os
+from pathlib import Path
+import sys
+from typing import Iterable, Sequence
+
+from sqlalchemy.orm import Session
+
+from .csr import Adjacency, CSRGraph, _NO_DATE, _date, _ordinal, _stream
+from .edges import Predicate, PredicateCatalog
+from .nodes import ConceptView
+from .persistent import vocabulary_release
+from .queries import (
+    q_concept_domains,
+    q_concept_table,
+    q_edges,
+    q_predicates,
+    q_vocabulary_versions,
+)
+
+"""
+Memory-mapped vocabulary snapshots.
+
+Scope: export a vocabulary to a directory of raw arrays (CSR adjacency plus
+columnar concept metadata) and map it back read-only. Processes that open
+the same snapshot share one physical copy through the page cache.
+
+Layout: one ``<name>.bin`` file per array, in native byte order, and a
+``manifest.json`` holding typecodes, lengths, string tables and the
+predicate catalog. Variable-length strings are stored as an offsets array
+plus a UTF-8 blob; a negative offset marks a None.
+"""
+
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+
+_ADJACENCY_FIELDS = (
+    "offsets",
+    "neighbours",
+    "predicates",
+    "valid_start",
+    "valid_end",
+    "invalid_reasons",
+)
+
+# file names of the ConceptColumns arrays, in field order
+_CONCEPT_ARRAYS = (
+    "concept_name_offsets",
+    "concept_names",
+    "concept_code_offsets",
+    "concept_codes",
+    "concept_vocabularies",
+    "concept_classes",
+    "concept_standard",
+    "concept_valid_start",
+    "concept_valid_end",
+    "concept_invalid_reasons",
+)
+
+
+class _Strings:
+    """
+    Offsets + blob builder for variable-length strings.
+
+    With nullable=True a None is stored as the bitwise inverse of its end
+    offset (always negative), so text() reads it back as None, not "".
+    """
+
+    def __init__(self, nullable: bool = False):
+        self.offsets = array("q", [0])
+        self.blob = bytearray()
+        self.nullable = nullable
+
+    def append(self, s: str | None) -> None:
+        if s:
+            self.blob += s.encode("utf-8")
+        end = len(self.blob)
+        self.offsets.append(~end if s is None and self.nullable else end)
+
+    @staticmethod
+    def text(offsets: Sequence[int], blob: Sequence[int], i: int) -> str | None:
+        start, end = offsets[i], offsets[i + 1]
+        if end < 0:
+            return None
+        if start < 0:
+            start = ~start
+        return bytes(blob[start:end]).decode("utf-8")
+
+
+class _Codes:
+    """Interns low-cardinality strings to small codes; code 0 is None."""
+
+    def __init__(self, typecode: str):
+        self.table: dict[str | None, int] = {None: 0}
+        self.codes = array(typecode)
+
+    def append(self, s: str | None) -> None:
+        self.codes.append(self.table.setdefault(s, len(self.table)))
+
+    @property
+    def values(self) -> list[str | None]:
+        return list(self.table)
+
+
+@dataclass(frozen=True)
+class ConceptColumns:
+    """
+    Concept metadata aligned with a graph's node indexes.
+
+    Nodes without a concept row (dangling relationship endpoints) have
+    vocabulary code 0.
+    """
+    name_offsets: Sequence[int]
+    names: Sequence[int]
+    code_offsets: Sequence[int]
+    codes: Sequence[int]
+    vocabularies: Sequence[int]
+    concept_classes: Sequence[int]
+    standard_concepts: Sequence[int]
+    valid_start: Sequence[int]
+    valid_end: Sequence[int]
+    invalid_reasons: Sequence[int]
+    vocabulary_ids: tuple[str | None, ...]
+    concept_class_ids: tuple[str | None, ...]
+    standard_values: tuple[str | None, ...]
+    invalid_values: tuple[str | None, ...]
+
+    @classmethod
+    def build(cls, rows: Iterable[tuple], node_ids: Sequence[int]) -> ConceptColumns:
+        """Merge concept rows (ordered by concept_id) onto ``node_ids``."""
+        names, codes = _Strings(nullable=True), _Strings(nullable=True)
+        vocabularies, classes = _Codes("H"), _Codes("H")
+        standard, invalid = _Codes("B"), _Codes("B")
+        starts, ends = array("i"), array("i")
+
+        rows = iter(rows)
+        row = next(rows, None)
+        for cid in node_ids:
+            while row is not None and row[0] < cid:
+                row = next(rows, None)
+            if row is None or row[0] != cid:
+                names.append(None)
+                codes.append(None)
+                for col in (vocabularies, classes, standard, invalid):
+                    col.append(None)
+                starts.append(_NO_DATE)
+                ends.append(_NO_DATE)
+                continue
+            _, name, code, vocab, _domain, cls_id, std, start, end, reason = row
+            names.append(name)
+            codes.append(code)
+            vocabularies.append(vocab)
+            classes.append(cls_id)
+            standard.append(std)
+            invalid.append(reason)
+            starts.append(_ordinal(start))
+            ends.append(_ordinal(end))
+
+        return cls(
+            name_offsets=names.offsets,
+            names=array("B", names.blob),
+            code_offsets=codes.offsets,
+            codes=array("B", codes.blob),
+            vocabularies=vocabularies.codes,
+            concept_classes=classes.codes,
+            standard_concepts=standard.codes,
+            valid_start=starts,
+            valid_end=ends,
+            invalid_reasons=invalid.codes,
+            vocabulary_ids=tuple(vocabularies.values),
+            concept_class_ids=tuple(classes.values),
+            standard_values=tuple(standard.values),
+            invalid_values=tuple(invalid.values),
+        )
+
+    def arrays(self) -> dict[str, Sequence[int]]:
+        return dict(zip(_CONCEPT_ARRAYS, (
+            self.name_offsets,
+            self.names,
+            self.code_offsets,
+            self.codes,
+            self.vocabularies,
+            self.concept_classes,
+            self.standard_concepts,
+            self.valid_start,
+            self.valid_end,
+            self.invalid_reasons,
+        )))
+
+    def tables(self) -> dict[str, list[str | None]]:
+        return {
+            "vocabulary_ids": list(self.vocabulary_ids),
+            "concept_class_ids": list(self.concept_class_ids),
+            "standard_concepts": list(self.standard_values),
+            "concept_invalid_reasons": list(self.invalid_values),
+        }
+
+    def view(self, i: int, concept_id: int, domain_id: str | None) -> ConceptView:
+        if self.vocabularies[i] == 0:
+            raise KeyError(concept_id)
+        return ConceptView(
+            concept_id,
+            _Strings.text(self.name_offsets, self.names, i),
+            _Strings.text(self.code_offsets, self.codes, i),
+            self.vocabulary_ids[self.vocabularies[i]],
+            domain_id,
+            self.concept_class_ids[self.concept_classes[i]],
+            self.standard_values[self.standard_concepts[i]],
+            _date(self.valid_start[i]),
+            _date(self.valid_end[i]),
+            self.invalid_values[self.invalid_reasons[i]],
+        )
+
+
+class SnapshotGraph(CSRGraph):
+    """
+    CSRGraph whose arrays are memory-mapped from a snapshot directory.
+
+    concept_view is served from the snapshot's concept columns, so no
+    database session is needed.
+    """
+
+    def __init__(self, *, columns: ConceptColumns, release: str | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self.columns = columns
+        self.release = release
+
+    @classmethod
+    def open(cls, directory: str | os.PathLike) -> SnapshotGraph:
+        directory = Path(directory)
+        manifest = json.loads((directory / MANIFEST).read_text())
+        if manifest.get("format") != FORMAT_VERSION:
+            raise ValueError(f"unsupported snapshot format: {manifest.get('format')!r}")
+        if manifest["byteorder"] != sys.byteorder:
+            raise ValueError(f"snapshot written on a {manifest['byteorder']}-endian host")
+
+        arrays = {
+            name: _map_array(directory / f"{name}.bin", **spec)
+            for name, spec in manifest["arrays"].items()
+        }
+        tables = manifest["tables"]
+
+        def adjacency(prefix: str) -> Adjacency:
+            return Adjacency(*(arrays[f"{prefix}_{f}"] for f in _ADJACENCY_FIELDS))
+
+        columns = ConceptColumns(
+            *(arrays[name] for name in _CONCEPT_ARRAYS),
+            vocabulary_ids=tuple(tables["vocabulary_ids"]),
+            concept_class_ids=tuple(tables["concept_class_ids"]),
+            standard_values=tuple(tables["standard_concepts"]),
+            invalid_values=tuple(tables["concept_invalid_reasons"]),
+        )
+        return cls(
+            node_ids=arrays["node_ids"],
+            node_domains=arrays["node_domains"],
+            domains=tables["domains"],
+            outgoing=adjacency("out"),
+            incoming=adjacency("in"),
+            predicate_ids=tables["predicate_ids"],
+            catalog=PredicateCatalog(Predicate(*p) for p in manifest["predicates"]),
+            invalid_reasons=tables["edge_invalid_reasons"],
+            columns=columns,
+            release=manifest.get("release"),
+        )
+
+    def concept_view(self, concept_id: int) -> ConceptView:
+        i = self._index(concept_id)
+        if i is None:
+            raise KeyError(concept_id)
+        return self.columns.view(i, concept_id, self.domains[self.node_domains[i]])
+
+
+
+def _map_array(path: Path, *, typecode: str, itemsize: int, length: int) -> Sequence[int]:
+    if array(typecode).itemsize != itemsize:
+        raise ValueError(f"{path.name}: item size {itemsize} does not match typecode {typecode!r}")
+    if length == 0:
+        return array(typecode)
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped).cast(typecode)
+    if len(view) != length:
+        raise ValueError(f"{path.name}: expected {length} items, found {len(view)}")
+    return view
+
+
+def export_snapshot(
+    session: Session,
+    directory: str | os.PathLike,
+    *,
+    batch_size: int = 50_000,
+) -> Path:
+    """
+    Write the vocabulary behind ``session`` as a snapshot directory.
+
+    The manifest is written last, so a partially written directory is not
+    mistaken for a snapshot.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    catalog = PredicateCatalog.from_rows(session.execute(q_predicates()).all())
+    graph = CSRGraph.from_rows(
+        _stream(session, q_edges(), batch_size),
+        domains=_stream(session, q_concept_domains(), batch_size),
+        predicates=catalog,
+    )
+    columns = ConceptColumns.build(
+        _stream(session, q_concept_table(), batch_size), graph.node_ids
+    )
+
+    arrays: dict[str, array] = {
+        "node_ids": graph.node_ids,
+        "node_domains": graph.node_domains,
+        **{f"out_{f}": getattr(graph.outgoing, f) for f in _ADJACENCY_FIELDS},
+        **{f"in_{f}": getattr(graph.incoming, f) for f in _ADJACENCY_FIELDS},
+        **columns.arrays(),
+    }
+    specs = {}
+    for name, values in arrays.items():
+        with open(directory / f"{name}.bin", "wb") as f:
+            values.tofile(f)
+        specs[name] = dict(typecode=values.typecode, itemsize=values.itemsize, length=len(values))
+
+    manifest = {
+        "format": FORMAT_VERSION,
+        "release": vocabulary_release(session.execute(q_vocabulary_versions()).all()),
+        "byteorder": sys.byteorder,
+        "num_nodes": graph.num_nodes,
+        "num_edges": graph.num_edges,
+        "arrays": specs,
+        "tables": {
+            "domains": list(graph.domains),
+            "predicate_ids": list(graph.predicate_ids),
+            "edge_invalid_reasons": list(graph.invalid_reasons),
+            **columns.tables(),
+        },
+        "predicates": [
+            [p.relationship_id, p.name, p.reverse_id, p.is_hierarchical, p.defines_ancestry]
+            for p in (catalog.predicate(rid) for rid in catalog)
+        ],
+    }
+    tmp = directory / f"{MANIFEST}.tmp"
+    tmp.write_text(json.dumps(manifest, indent=1))
+    tmp.replace(directory / MANIFEST)
+    return directory
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    from omop_graph.db.session import make_session
+
+    parser = argparse.ArgumentParser(
+        prog="omop-graph-snapshot",
+        description="Export an OMOP vocabulary as a memory-mappable graph snapshot.",
+    )
+    parser.add_argument("url", help="SQLAlchemy database URL of the CDM")
+    parser.add_argument("directory", help="output directory")
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    args = parser.parse_args(argv)
+
+    session = make_session(args.url)
+    try:
+        out = export_snapshot(session, args.directory, batch_size=args.batch_size)
+    finally:
+        session.close()
+    manifest = json.loads((out / MANIFEST).read_text())
+    print(
+        f"wrote {manifest['num_nodes']} concepts / {manifest['num_edges']} edges "
+        f"({manifest['release']}) to {out}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+from __future__ import annotations
+from array import array
+from bisect import bisect_left
+from itertools import combinations
+import os
+from typing import Sequence
+from zlib import crc32
+
+from sqlalchemy.orm import Session
+
+from .label_dictionary import LabelDictionary
+from .labels import LabelTable, read_sidecar, write_sidecar
+from .nodes import LabelMatch, LabelMatchKind, normalise_label
+
+"""
+Symmetric-delete spelling index over concept names and synonyms.
+
+Finds labels within a small edit distance of a misspelt query without
+scanning the vocabulary. Every distinct normalised label contributes the
+strings obtained by deleting up to max_distance characters from its first
+prefix_length characters; a query generates the same deletes and only the
+labels sharing one of them are verified with a bounded edit distance.
+
+Deletes are stored as CRC32 hashes: a collision only adds a candidate that
+verification then rejects, so the key array stays four bytes per entry.
+"""
+
+FORMAT = "omop-graph-symspell-1"
+
+
+def deletes(term: str, max_distance: int) -> set[str]:
+    """term and every string made by deleting up to max_distance characters."""
+    out = {term}
+    for d in range(1, min(max_distance, len(term)) + 1):
+        for drop in combinations(range(len(term)), d):
+            out.add("".join(c for i, c in enumerate(term) if i not in drop))
+    return out
+
+
+def _hash(term: str) -> int:
+    return crc32(term.encode("utf-8"))
+
+
+def edit_distance(a: str, b: str, bound: int) -> int:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent
+    transpositions), or bound + 1 once it is known to exceed bound.
+    """
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+    # common affixes don't change the distance and shrink the table
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if not a or not b:
+        return len(a) or len(b)
+
+    previous2: list[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+        if min(current) > bound:
+            return bound + 1
+        previous2, previous = previous, current
+    return min(previous[-1], bound + 1)
+
+
+class SymSpellIndex:
+    """
+    Delete hash -> LabelDictionary keys, in CSR arrays.
+
+    Postings for hashes[s] are ``postings[offsets[s]:offsets[s + 1]]``,
+    ascending key numbers of ``dictionary``.
+    """
+
+    def __init__(
+        self,
+        dictionary: LabelDictionary,
+        *,
+        max_distance: int,
+        prefix_length: int,
+        hashes: Sequence[int],
+        offsets: Sequence[int],
+        postings: Sequence[int],
+    ):
+        self.dictionary = dictionary
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.hashes = hashes
+        self.offsets = offsets
+        self.postings = memoryview(postings)
+
+    @classmethod
+    def build(
+        cls,
+        table: LabelTable | LabelDictionary,
+        *,
+        max_distance: int = 2,
+        prefix_length: int = 7,
+    ) -> SymSpellIndex:
+        dictionary = table if isinstance(table, LabelDictionary) else LabelDictionary.build(table)
+        lists: dict[int, array] = {}
+        for k in range(len(dictionary)):
+            prefix = dictionary.key(k)[:prefix_length]
+            for h in {_hash(d) for d in deletes(prefix, max_distance)}:
+                postings = lists.get(h)
+                if postings is None:
+                    postings = lists[h] = array("i")
+                postings.append(k)
+
+        hashes = array("I", sorted(lists))
+        offsets, postings = array("q", [0]), array("i")
+        for h in hashes:
+            postings.extend(lists.pop(h))
+            offsets.append(len(postings))
+        return cls(
+            dictionary,
+            max_distance=max_distance,
+            prefix_length=prefix_length,
+            hashes=hashes,
+            offsets=offsets,
+            postings=postings,
+        )
+
+    @classmethod
+    def from_session(
+        cls,
+        session: Session,
+        *,
+        batch_size: int = 50_000,
+        **options: int,
+    ) -> SymSpellIndex:
+        return cls.build(LabelTable.from_session(session, batch_size=batch_size), **options)
+
+    def save(self, directory: str | os.PathLike) -> None:
+        write_sidecar(
+            directory,
+            {
+                **self.dictionary.arrays(),
+                "hashes": self.hashes,
+                "offsets": self.offsets,
+                "postings": self.postings,
+            },
+            format=FORMAT,
+            max_distance=self.max_distance,
+            prefix_length=self.prefix_length,
+        )
+
+    @classmethod
+    def open(cls, directory: str | os.PathLike) -> SymSpellIndex:
+        """Map an index written by save(); nothing is rebuilt on load."""
+        arrays, manifest = read_sidecar(directory, format=FORMAT)
+        return cls(
+            LabelDictionary.from_arrays(arrays),
+            max_distance=manifest["max_distance"],
+            prefix_length=manifest["prefix_length"],
+            hashes=arrays["hashes"],
+            offsets=arrays["offsets"],
+            postings=arrays["postings"],
+        )
+
+    def _candidates(self, input_label: str, max_distance: int) -> set[int]:
+        found: set[int] = set()
+        hashes = self.hashes
+        for d in deletes(input_label[:self.prefix_length], max_distance):
+            h = _hash(d)
+            s = bisect_left(hashes, h)
+            if s < len(hashes) and hashes[s] == h:
+                found.update(self.postings[self.offsets[s]:self.offsets[s + 1]])
+        return found
+
+    def search(
+        self,
+        label: str,
+        *,
+        max_distance: int | None = None,
+        kind: LabelMatchKind | None = None,
+        limit: int | None = None,
+    ) -> list[tuple[int, LabelMatch]]:
+        """
+        (distance, LabelMatch) pairs for labels within max_distance edits
+        (at most the index's own max_distance), nearest first and then
+        closest in length.
+        """
+        input_label = normalise_label(label)
+        if not input_label:
+            return []
+        bound = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+
+        scored = []
+        for k in self._candidates(input_label, bound):
+            term = self.dictionary.key(k)
+            distance = edit_distance(input_label, term, bound)
+            if distance <= bound:
+                scored.append((distance, abs(len(term) - len(input_label)), term, k))
+        scored.sort()
+
+        results: list[tuple[int, LabelMatch]] = []
+        for distance, _, _, k in scored:
+            for match in self.dictionary.matches(k, input_label, kind=kind):
+                results.append((distance, match))
+            if limit is not None and len(results) >= limit:
+                return results[:limit]
+        return results
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.dictionary.nbytes
+            + memoryview(self.hashes).nbytes
+            + memoryview(self.offsets).nbytes
+            + self.postings.nbytes
+        )
@@ -1,8 +1,8 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from collections import deque
 from typing import Iterable
 from datetime import date
+from .base import AlgorithmCore, Prefetch, run_core, run_core_async
 from .edges import EdgeView, PredicateKind
 
 
@@ -32,6 +32,22 @@ class GraphTrace:
     steps: list[TraceStep]
     terminated_reason: str | None = None
 
+    def concept_ids(self, per_predicate: int | None = None) -> list[int]:
+        """
+        Expanded nodes and their edge targets, in trace order; with
+        per_predicate, only the first targets of each predicate per step.
+        """
+        ids: dict[int, None] = {}
+        for step in self.steps:
+            ids[step.node] = None
+            seen: dict[str, int] = {}
+            for e in step.expanded_edges:
+                n = seen.get(e.predicate_id, 0)
+                seen[e.predicate_id] = n + 1
+                if per_predicate is None or n < per_predicate:
+                    ids[e.object_id] = None
+        return list(ids)
+
 
 def traverse(
     kg,
@@ -43,48 +59,107 @@ def traverse(
     max_nodes: int | None,
     trace: bool,
 ) -> tuple[Subgraph, GraphTrace | None]:
-    
+    return run_core(kg, traverse_core(
+        kg,
+        seeds,
+        predicate_kinds=predicate_kinds,
+        max_depth=max_depth,
+        on=on,
+        max_nodes=max_nodes,
+        trace=trace,
+    ))
+
+
+async def traverse_async(
+    kg,
+    seeds: Iterable[int],
+    *,
+    predicate_kinds: set[PredicateKind] | None,
+    max_depth: int,
+    on: date | None,
+    max_nodes: int | None,
+    trace: bool,
+) -> tuple[Subgraph, GraphTrace | None]:
+    """
+    traverse() over an AsyncKnowledgeGraph; each level is one awaited batch.
+    """
+    return await run_core_async(kg, traverse_core(
+        kg.cached,
+        seeds,
+        predicate_kinds=predicate_kinds,
+        max_depth=max_depth,
+        on=on,
+        max_nodes=max_nodes,
+        trace=trace,
+    ))
+
+
+def traverse_core(
+    kg,
+    seeds: Iterable[int],
+    *,
+    predicate_kinds: set[PredicateKind] | None,
+    max_depth: int,
+    on: date | None,
+    max_nodes: int | None,
+    trace: bool,
+) -> AlgorithmCore:
+    """
+    traverse() as a generator yielding one Prefetch per level; see run_core.
+    """
     seeds = tuple(dict.fromkeys(seeds))  # deduplicate while preserving order
     visited = set()
     edges_out = []
     steps = []
 
-    q = deque((s, 0) for s in seeds)
+    # breadth-first, one frontier level at a time so the backend can fetch
+    # the edges of the whole level in one go
+    level = list(seeds)
+    depth = 0
     terminated = None
 
-    while q:
-        node, depth = q.popleft()
+    while level and terminated is None:
+        if depth < max_depth:
+            pending = [n for n in dict.fromkeys(level) if n not in visited]
+            if max_nodes:
+                pending = pending[:max(max_nodes - len(visited), 0)]
+            yield Prefetch(pending, "out", predicate_kinds, True, on)
+
+        next_level: list[int] = []
+        for node in level:
+            if node in visited:
+                continue
 
-        if node in visited:
-            continue
+            visited.add(node)
 
-        visited.add(node)
+            if max_nodes and len(visited) >= max_nodes:
+                terminated = "max_nodes"
+                break
 
-        if max_nodes and len(visited) >= max_nodes:
-            terminated = "max_nodes"
-            break
+            if depth >= max_depth:
+                continue
 
-        if depth >= max_depth:
-            continue
+            expanded: list[EdgeView] = []
 
-        expanded: list[EdgeView] = []
+            for e in kg.iter_edges(
+                node,
+                direction="out",
+                predicate_kinds=predicate_kinds,
+                active_only=True,
+                on=on,
+            ):
+                expanded.append(e)
+                edges_out.append(e)
 
-        for e in kg.iter_edges(
-            node,
-            direction="out",
-            predicate_kinds=predicate_kinds,
-            active_only=True,
-            on=on,
-        ):
-            expanded.append(e)
-            edges_out.append(e)
+                nxt = e.object_id
+                if nxt not in visited:
+                    next_level.append(nxt)
 
-            nxt = e.object_id
-            if nxt not in visited:
-                q.append((nxt, depth + 1))
+            if trace:
+                steps.append(TraceStep(depth=depth, node=node, expanded_edges=tuple(expanded)))
 
-        if trace:
-            steps.append(TraceStep(depth=depth, node=node, expanded_edges=tuple(expanded)))
+        level = next_level
+        depth += 1
 
     dedup = {(e.subject_id, e.predicate_id, e.object_id): e for e in edges_out}
     sg = Subgraph(frozenset(visited), tuple(dedup.values()))
@@ -0,0 +1,175 @@
+from __future__ import annotations
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import groupby
+from math import ceil
+import os
+from typing import Any, Callable, Sequence
+
+from sqlalchemy.orm import Session
+
+from .labels import LabelTable, kind_code, pack_strings, read_sidecar, unpack_strings, write_sidecar
+from .nodes import LabelMatch, LabelMatchKind, normalise_label
+
+"""
+Character-trigram index over concept names and synonyms.
+
+Replaces leading-wildcard ILIKE scans for partial label matching: each
+normalised label is split into padded character trigrams, and every
+trigram keeps the sorted list of label entries containing it. A query
+counts shared trigrams using the rarest lists first (prefix filtering), so
+common trigrams are only probed with bisect for surviving candidates.
+"""
+
+FORMAT = "omop-graph-trigram-1"
+
+
+def trigrams(label: str) -> set[str]:
+    """Character trigrams of a normalised label, padded with one space."""
+    padded = f" {label} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    Inverted index trigram -> label entries, in CSR arrays.
+
+    Entries are LabelTable rows; postings for grams[s] are
+    ``postings[offsets[s]:offsets[s + 1]]``, ascending.
+    """
+
+    # results per fuzzy label_lookup when no limit is given
+    default_limit: int = 100
+
+    def __init__(
+        self,
+        table: LabelTable,
+        *,
+        grams: Sequence[str],
+        offsets: Sequence[int],
+        postings: Sequence[int],
+    ):
+        self.table = table
+        self.grams = grams
+        self.offsets = offsets
+        self.postings = memoryview(postings)
+        self._slots = {g: s for s, g in enumerate(grams)}
+
+    @classmethod
+    def build(cls, table: LabelTable) -> TrigramIndex:
+        lists: dict[str, array] = {}
+        for entry, label in enumerate(table.iter_labels()):
+            for gram in trigrams(normalise_label(label)):
+                postings = lists.get(gram)
+                if postings is None:
+                    postings = lists[gram] = array("i")
+                postings.append(entry)
+
+        grams = sorted(lists)
+        offsets, postings = array("q", [0]), array("i")
+        for gram in grams:
+            postings.extend(lists.pop(gram))
+            offsets.append(len(postings))
+        return cls(table, grams=grams, offsets=offsets, postings=postings)
+
+    @classmethod
+    def from_session(cls, session: Session, *, batch_size: int = 50_000) -> TrigramIndex:
+        return cls.build(LabelTable.from_session(session, batch_size=batch_size))
+
+    def save(self, directory: str | os.PathLike) -> None:
+        gram_offsets, gram_blob = pack_strings(self.grams)
+        write_sidecar(
+            directory,
+            {
+                **self.table.arrays(),
+                "gram_offsets": gram_offsets,
+                "grams": gram_blob,
+                "offsets": self.offsets,
+                "postings": self.postings,
+            },
+            format=FORMAT,
+        )
+
+    @classmethod
+    def open(cls, directory: str | os.PathLike) -> TrigramIndex:
+        """Map an index written by save(); postings stay on disk until read."""
+        arrays, _ = read_sidecar(directory, format=FORMAT)
+        return cls(
+            LabelTable.from_arrays(arrays),
+            grams=unpack_strings(arrays["gram_offsets"], arrays["grams"]),
+            offsets=arrays["offsets"],
+            postings=arrays["postings"],
+        )
+
+    def _postings(self, gram: str) -> Sequence[int]:
+        s = self._slots[gram]
+        return self.postings[self.offsets[s]:self.offsets[s + 1]]
+
+    def search(
+        self,
+        label: str,
+        *,
+        kind: LabelMatchKind | None = None,
+        limit: int | None = None,
+        min_similarity: float = 0.5,
+        rank: Callable[[str], Any] | None = None,
+    ) -> list[tuple[float, LabelMatch]]:
+        """
+        Up to ``limit`` (similarity, LabelMatch) pairs, best first.
+
+        Similarity is the fraction of the query's trigrams found in the
+        label; entries below min_similarity are dropped. Ties are ordered by
+        ``rank(matched_label)`` (shorter labels first by default).
+        """
+        input_label = normalise_label(label)
+        if not input_label:
+            return []
+        grams = trigrams(input_label)
+        need = max(1, ceil(min_similarity * len(grams)))
+        lists = sorted((self._postings(g) for g in grams if g in self._slots), key=len)
+        if len(lists) < need:
+            return []
+
+        # an entry with `need` shared trigrams appears in one of the
+        # len(lists) - need + 1 rarest lists
+        split = len(lists) - need + 1
+        counts: Counter[int] = Counter()
+        for postings in lists[:split]:
+            counts.update(postings)
+        for left, postings in zip(range(need - 1, 0, -1), lists[split:]):
+            for entry, count in list(counts.items()):
+                if count + left < need:
+                    del counts[entry]
+                    continue
+                i = bisect_left(postings, entry)
+                if i < len(postings) and postings[i] == entry:
+                    counts[entry] = count + 1
+
+        code = kind_code(kind)
+        table = self.table
+        hits = sorted(
+            (
+                (count, entry) for entry, count in counts.items()
+                if count >= need and (code is None or table.kinds[entry] == code)
+            ),
+            reverse=True,
+        )
+        rank = rank or len
+        limit = self.default_limit if limit is None else limit
+        results: list[tuple[float, LabelMatch]] = []
+        for count, group in groupby(hits, key=lambda h: h[0]):
+            labelled = sorted((rank(table.label(entry)), entry) for _, entry in group)
+            for _, entry in labelled[:limit - len(results)]:
+                results.append((count / len(grams), table.match(entry, input_label)))
+            if len(results) >= limit:
+                break
+        return results
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.table.nbytes
+            + memoryview(self.offsets).nbytes
+            + self.postings.nbytes
+        )
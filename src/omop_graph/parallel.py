@@ -0,0 +1,155 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import partial
+import traceback
+from typing import Any, Callable, Iterable, Mapping, Sequence
+
+from omop_graph.db.session import dispose_engines
+from omop_graph.graph.base import GraphBackend
+from omop_graph.graph.kg import KnowledgeGraph
+from omop_graph.graph.paths import find_shortest_paths
+from omop_graph.reasoning.phenotypes.phenotype_simplifier import find_common_parents
+from omop_graph.reasoning.resolvers import ResolverPipeline
+from omop_graph.reasoning.term_grounding import GroundingConstraints, ground_term
+
+"""
+Process-pool driver for batch grounding and path search.
+
+Responsibilities:
+- one graph per worker process, built after fork from a URL or a factory
+- chunked submission, ordered results and per-item error capture
+
+Graphs hold live sessions and caches, so they never cross process
+boundaries: only the graph source, the task and the items are pickled.
+"""
+
+GraphSource = str | Callable[[], GraphBackend]
+
+# the worker's graph, set by _init_worker in each pool process
+_GRAPH: GraphBackend | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class WorkResult:
+    """Outcome of one work item; ``error`` holds the formatted traceback."""
+    index: int
+    value: Any = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _init_worker(source: GraphSource, graph_options: Mapping[str, Any]) -> None:
+    global _GRAPH
+    # pools inherited through fork belong to the parent: drop, don't close
+    dispose_engines(close=False)
+    if isinstance(source, str):
+        _GRAPH = KnowledgeGraph.from_url(source, scope="shared", **graph_options)
+    else:
+        _GRAPH = source()
+
+
+def _run_chunk(task: Callable[[GraphBackend, Any], Any], chunk: list[tuple[int, Any]]) -> list[WorkResult]:
+    results = []
+    for index, item in chunk:
+        try:
+            results.append(WorkResult(index, task(_GRAPH, item)))
+        except Exception:
+            if isinstance(_GRAPH, KnowledgeGraph):
+                _GRAPH.rollback_session()
+            results.append(WorkResult(index, error=traceback.format_exc()))
+    return results
+
+
+def run_parallel(
+    task: Callable[[GraphBackend, Any], Any],
+    items: Iterable[Any],
+    *,
+    graph: GraphSource,
+    workers: int | None = None,
+    chunk_size: int = 64,
+    graph_options: Mapping[str, Any] | None = None,
+    mp_context=None,
+) -> list[WorkResult]:
+    """
+    Apply ``task(graph, item)`` to every item across a process pool.
+
+    graph is a database URL (each worker opens KnowledgeGraph.from_url with
+    graph_options) or a picklable zero-argument factory, e.g.
+    ``functools.partial(SnapshotGraph.open, path)``. task must be picklable
+    too: a module-level function or a partial of one.
+
+    Items are sent in chunks of chunk_size. Results come back in input
+    order; an item that raises gets a WorkResult with its traceback instead
+    of failing the batch.
+    """
+    indexed = list(enumerate(items))
+    chunks = [indexed[i:i + chunk_size] for i in range(0, len(indexed), chunk_size)]
+    results: list[WorkResult | None] = [None] * len(indexed)
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp_context,
+        initializer=_init_worker,
+        initargs=(graph, dict(graph_options or {})),
+    ) as pool:
+        futures = [pool.submit(_run_chunk, task, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            for result in future.result():
+                results[result.index] = result
+
+    return results  # type: ignore[return-value]
+
+
+def _ground(kg, text: str, *, constraints: GroundingConstraints, resolver_pipeline: ResolverPipeline):
+    return ground_term(kg, text, constraints=constraints, resolver_pipeline=resolver_pipeline)
+
+
+def _shortest_paths(kg, pair: tuple[int, int], **kwargs):
+    paths, _ = find_shortest_paths(kg, *pair, **kwargs)
+    return paths
+
+
+def _common_parents(kg, seeds: Sequence[int], **kwargs):
+    return find_common_parents(list(seeds), kg, **kwargs)
+
+
+def ground_term_parallel(
+    graph: GraphSource,
+    texts: Iterable[str],
+    *,
+    constraints: GroundingConstraints,
+    resolver_pipeline: ResolverPipeline,
+    **options: Any,
+) -> list[WorkResult]:
+    """ground_term() for every text; options go to run_parallel."""
+    task = partial(_ground, constraints=constraints, resolver_pipeline=resolver_pipeline)
+    return run_parallel(task, texts, graph=graph, **options)
+
+
+def find_shortest_paths_parallel(
+    graph: GraphSource,
+    pairs: Iterable[tuple[int, int]],
+    *,
+    search: Mapping[str, Any] | None = None,
+    **options: Any,
+) -> list[WorkResult]:
+    """
+    find_shortest_paths() for every (source, target) pair; search holds its
+    keyword arguments and the values are path lists (traces are dropped).
+    """
+    return run_parallel(partial(_shortest_paths, **(search or {})), pairs, graph=graph, **options)
+
+
+def find_common_parents_parallel(
+    graph: GraphSource,
+    seed_sets: Iterable[Sequence[int]],
+    *,
+    search: Mapping[str, Any] | None = None,
+    **options: Any,
+) -> list[WorkResult]:
+    """find_common_parents() for every seed list; see find_shortest_paths_parallel."""
+    return run_parallel(partial(_common_parents, **(search or {})), seed_sets, graph=graph, **options)
@@ -1,6 +1,9 @@
 from .base import CandidateResolver
-from .exact_label_resolver import ExactLabelResolver, ExactSynonymResolver
+from .exact_label_resolver import ExactLabelResolver, ExactSynonymResolver, ExactLabelSynonymResolver
 from .partial_label_reesolver import PartialLabelResolver
+from .edit_distance_resolver import EditDistanceResolver
+from .token_resolver import TokenResolver
+from .embedding_resolver import EmbeddingResolver
 from .resolver_pipeline import ResolverPipeline, ResolverConfidence
 
 __all__ = [
@@ -10,4 +13,8 @@ __all__ = [
     "ResolverConfidence",
     "PartialLabelResolver",
     "ExactSynonymResolver",
+    "ExactLabelSynonymResolver",
+    "EditDistanceResolver",
+    "TokenResolver",
+    "EmbeddingResolver",
 ]
\ No newline at end of file
@@ -9,6 +9,8 @@ from omop_graph.graph.kg import KnowledgeGraph
 class CandidateHit:
     concept_id: int
     resolver: str
+    # resolver-specific relevance (higher is better), where the resolver ranks
+    score: float | None = None
 
 class ResolverConfidence(Enum):
     EXACT = 0
@@ -34,3 +36,33 @@ class CandidateResolver(ABC):
         limit: int | None = None,
     ) -> Iterable[CandidateHit]:
         ...
+
+    def prefetch(self, kg: KnowledgeGraph, texts: Iterable[str]) -> None:
+        """
+        Optional hook: warm the graph's lookups for many texts before they
+        are resolved one by one (see ground_terms).
+        """
+        return None
+
+    def _index(self, kg, attribute: str):
+        """The graph's in-memory index ``attribute``, for resolvers that need one."""
+        index = getattr(kg, attribute, None)
+        if index is None:
+            raise ValueError(
+                f"{type(self).__name__} needs a graph opened with {attribute}=..."
+            )
+        return index
+
+    async def resolve_async(
+        self,
+        kg,
+        text: str,
+        *,
+        limit: int | None = None,
+    ) -> Iterable[CandidateHit]:
+        """
+        resolve() against an AsyncKnowledgeGraph. By default resolve() runs
+        on a synchronous view of the graph (AsyncKnowledgeGraph.run_sync),
+        one query at a time; override it to await the graph's lookups.
+        """
+        return await kg.run_sync(lambda g: list(self.resolve(g, text, limit=limit)))
@@ -0,0 +1,31 @@
+from typing import Iterable
+from omop_graph.graph import KnowledgeGraph
+from .base import CandidateResolver, CandidateHit, ResolverConfidence
+
+
+class EditDistanceResolver(CandidateResolver):
+    """
+    Misspelt names and synonyms, via the graph's SymSpellIndex.
+
+    Hits are ordered by edit distance. The graph (sync or async) must be
+    opened with symspell_index; there is no database fallback.
+    """
+    name = "edit_distance"
+    confidence = ResolverConfidence.PARTIAL
+
+    def __init__(self, max_distance: int | None = None):
+        self.max_distance = max_distance
+
+    def resolve(self, kg: KnowledgeGraph, text: str, *, limit: int | None = None) -> Iterable[CandidateHit]:
+        index = self._index(kg, "symspell_index")
+        hits: dict[int, CandidateHit] = {}
+        for _, m in index.search(text, max_distance=self.max_distance):
+            if m.concept_id not in hits:
+                hits[m.concept_id] = CandidateHit(m.concept_id, self.name)
+                if limit and len(hits) >= limit:
+                    break
+        return list(hits.values())
+
+    async def resolve_async(self, kg, text: str, *, limit: int | None = None) -> Iterable[CandidateHit]:
+        # searches the async graph's in-memory index; no queries to await
+        return self.resolve(kg, text, limit=limit)
@@ -0,0 +1,63 @@
+from typing import Iterable
+from omop_graph.graph import KnowledgeGraph
+from .base import CandidateResolver, CandidateHit, ResolverConfidence
+
+
+class EmbeddingResolver(CandidateResolver):
+    """
+    Nearest names and synonyms by vector similarity, via the graph's
+    EmbeddingIndex.
+
+    Hits carry their cosine score, best first, one per concept; those below
+    min_score are dropped. The graph (sync or async) must be opened with
+    embedding_index; there is no database fallback.
+    prefetch() encodes and searches a whole batch of texts in one pass.
+    """
+    name = "embedding"
+    confidence = ResolverConfidence.EMBEDDING
+
+    def __init__(self, min_score: float = 0.0):
+        self.min_score = min_score
+
+    def _searches(self, kg, texts: list[str], limit: int | None) -> list[tuple]:
+        """
+        Ranked (score, LabelMatch) pairs per text. Cached per normalised
+        label with the depth it was searched to, so a deeper search serves
+        every shallower one by slicing and prefetch() serves resolve().
+        """
+        index = kg.embedding_index
+        # over-fetch: several labels of one concept may rank
+        depth = limit * 4 if limit else index.default_limit
+        cache = kg.caches.get("embedding_search", 10_000)
+        keys = [kg._normalise_label(t) for t in texts]
+        found: dict[str, tuple] = {}
+        for key in dict.fromkeys(keys):
+            entry = cache.get(key)
+            if entry is not None and entry[0] >= depth:
+                found[key] = entry[1][:depth]
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        if missing:
+            for key, hits in zip(missing, index.search_many(missing, limit=depth)):
+                found[key] = tuple(hits)
+                cache.put(key, (depth, found[key]))
+        return [found[key] for key in keys]
+
+    def prefetch(self, kg: KnowledgeGraph, texts: Iterable[str]) -> None:
+        if getattr(kg, "embedding_index", None) is not None:
+            self._searches(kg, list(texts), None)
+
+    def resolve(self, kg: KnowledgeGraph, text: str, *, limit: int | None = None) -> Iterable[CandidateHit]:
+        self._index(kg, "embedding_index")
+        [ranked] = self._searches(kg, [text], limit)
+        hits: dict[int, CandidateHit] = {}
+        for score, m in ranked:
+            if score < self.min_score:
+                break
+            if m.concept_id not in hits:
+                hits[m.concept_id] = CandidateHit(m.concept_id, self.name, score)
+        out = list(hits.values())
+        return out[:limit] if limit else out
+
+    async def resolve_async(self, kg, text: str, *, limit: int | None = None) -> Iterable[CandidateHit]:
+        # searches the async graph's in-memory index; no queries to await
+        return self.resolve(kg, text, limit=limit)
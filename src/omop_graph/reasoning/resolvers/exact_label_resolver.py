@@ -9,18 +9,52 @@ class ExactLabelResolver(CandidateResolver):
 
     def get_matches(self, kg: KnowledgeGraph, text: str) -> Tuple[LabelMatch, ...]:
         return kg.label_lookup(text)
-    
-    def resolve(self, kg: KnowledgeGraph, text: str, *, limit: int | None = None) -> Iterable[CandidateHit]:
-        matches = self.get_matches(kg, text)
+
+    def prefetch(self, kg: KnowledgeGraph, texts: Iterable[str]) -> None:
+        kg.label_lookup_many(texts)
+
+    async def get_matches_async(self, kg, text: str) -> Tuple[LabelMatch, ...]:
+        return await kg.label_lookup(text)
+
+    def _hits(self, matches: Iterable[LabelMatch], limit: int | None) -> list[CandidateHit]:
         hits = [
             CandidateHit(m.concept_id, self.name)
             for m in matches
         ]
         return hits[:limit] if limit else hits
+    
+    def resolve(self, kg: KnowledgeGraph, text: str, *, limit: int | None = None) -> Iterable[CandidateHit]:
+        return self._hits(self.get_matches(kg, text), limit)
+
+    async def resolve_async(self, kg, text: str, *, limit: int | None = None) -> Iterable[CandidateHit]:
+        return self._hits(await self.get_matches_async(kg, text), limit)
 
 
 class ExactSynonymResolver(ExactLabelResolver):
     name = "exact_synonym"
     
     def get_matches(self, kg: KnowledgeGraph, text: str) -> Tuple[LabelMatch, ...]:
-        return kg.synonym_lookup(text)
\ No newline at end of file
+        return kg.synonym_lookup(text)
+
+    def prefetch(self, kg: KnowledgeGraph, texts: Iterable[str]) -> None:
+        kg.synonym_lookup_many(texts)
+
+    async def get_matches_async(self, kg, text: str) -> Tuple[LabelMatch, ...]:
+        return await kg.synonym_lookup(text)
+
+
+class ExactLabelSynonymResolver(ExactLabelResolver):
+    """
+    ExactLabelResolver and ExactSynonymResolver in one query per text:
+    names and synonyms together, standard and active concepts first.
+    """
+    name = "exact_label_synonym"
+
+    def get_matches(self, kg: KnowledgeGraph, text: str) -> Tuple[LabelMatch, ...]:
+        return kg.label_and_synonym_lookup(text)
+
+    def prefetch(self, kg: KnowledgeGraph, texts: Iterable[str]) -> None:
+        kg.label_and_synonym_lookup_many(texts)
+
+    async def get_matches_async(self, kg, text: str) -> Tuple[LabelMatch, ...]:
+        return await kg.label_and_synonym_lookup(text)
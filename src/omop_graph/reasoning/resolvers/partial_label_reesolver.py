@@ -1,5 +1,7 @@
+from functools import partial
 from typing import Iterable
 from omop_graph.graph import KnowledgeGraph
+from omop_graph.graph.nodes import LabelMatchKind
 from .base import CandidateResolver, CandidateHit, ResolverConfidence
 
 def _similarity_score(query: str, label: str) -> tuple:
@@ -18,7 +20,26 @@ class PartialLabelResolver(CandidateResolver):
     confidence = ResolverConfidence.PARTIAL
 
     def resolve(self, kg: KnowledgeGraph, text: str, *, limit: int | None = None) -> Iterable[CandidateHit]:
-        matches = kg.label_lookup(text, fuzzy=True)
+        if getattr(kg, "trigram_index", None) is not None:
+            return self._search(kg.trigram_index, text, limit)
+        return self._rank(text, kg.label_lookup(text, fuzzy=True), limit)
+
+    async def resolve_async(self, kg, text: str, *, limit: int | None = None) -> Iterable[CandidateHit]:
+        if getattr(kg, "trigram_index", None) is not None:
+            return self._search(kg.trigram_index, text, limit)
+        return self._rank(text, await kg.label_lookup(text, fuzzy=True), limit)
+
+    def _search(self, index, text: str, limit: int | None) -> list[CandidateHit]:
+        # ranked by trigram overlap, then by _similarity_score
+        ranked = index.search(
+            text,
+            kind=LabelMatchKind.DIRECT,
+            limit=limit,
+            rank=partial(_similarity_score, text),
+        )
+        return [CandidateHit(m.concept_id, self.name) for _, m in ranked]
+
+    def _rank(self, text: str, matches, limit: int | None) -> list[CandidateHit]:
         ranked = sorted(
             matches,
             key=lambda m: _similarity_score(text, m.matched_label)
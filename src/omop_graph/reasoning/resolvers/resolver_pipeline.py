@@ -1,9 +1,20 @@
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
+import threading
 
 from omop_graph.graph import KnowledgeGraph
 from .base import CandidateResolver, CandidateHit, ResolverConfidence
 
 
+def _run(resolver: CandidateResolver, kg, text: str, limit: int | None) -> list[CandidateHit]:
+    return list(resolver.resolve(kg, text, limit=limit))
+
+
+async def _run_async(resolver: CandidateResolver, kg, text: str, limit: int | None) -> list[CandidateHit]:
+    return list(await resolver.resolve_async(kg, text, limit=limit))
+
+
 @dataclass
 class ResolverPipeline:
     resolvers: tuple[CandidateResolver, ...]
@@ -13,9 +24,66 @@ class ResolverPipeline:
         resolvers: tuple[CandidateResolver, ...],
         *,
         stop_after_confidence: ResolverConfidence | None = None,
+        concurrent: bool = False,
+        max_workers: int | None = None,
+        executor: Executor | None = None,
     ):
+        """
+        concurrent=True runs the resolvers at the same time (threads for
+        resolve, tasks for resolve_async) and merges their hits in declared
+        order, so results match sequential runs. Once a resolver returns
+        hits, the tiers that stop_after_confidence would skip are cancelled
+        if still queued; a resolver already running on a thread can't be
+        interrupted and finishes in the background.
+        Threads share the graph: use KnowledgeGraph.from_url (scope "thread"
+        or "call"), not a plain Session.
+
+        The threads come from executor if given (left open by close()), or
+        else from a pool of max_workers threads that the pipeline starts on
+        first use and shuts down in close() / on leaving a with block.
+        """
         self.resolvers = resolvers
         self.stop_after_confidence = stop_after_confidence
+        self.concurrent = concurrent
+        self.max_workers = max_workers
+        self.executor = executor
+        self._pool: ThreadPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+
+    def __getstate__(self):
+        # pipelines are sent to worker processes; threads and locks stay here
+        return {**self.__dict__, "executor": None, "_pool": None, "_pool_lock": None}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state, _pool_lock=threading.Lock())
+
+    def __enter__(self) -> "ResolverPipeline":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Shut down the pipeline's own thread pool, waiting for resolvers still
+        running after their results were discarded, so the graph can be
+        closed safely. A later concurrent resolve starts a new pool.
+        """
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def _executor(self) -> Executor:
+        if self.executor is not None:
+            return self.executor
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers or len(self.resolvers),
+                    thread_name_prefix="resolver",
+                )
+            return self._pool
 
     def resolve(
         self,
@@ -24,15 +92,14 @@ class ResolverPipeline:
         *,
         limit_per_resolver: int | None = None,
     ) -> list[CandidateHit]:
+        if self.concurrent and len(self.resolvers) > 1:
+            return self._resolve_concurrent(kg, text, limit_per_resolver)
+
         seen = set()
         results: list[CandidateHit] = []
 
         for resolver in self.resolvers:
-            if (
-                len(results) > 0 
-                and self.stop_after_confidence is not None
-                and resolver.confidence.value > self.stop_after_confidence.value
-            ):
+            if self._stop_before(resolver, results):
                 break
 
             hits = resolver.resolve(
@@ -40,9 +107,114 @@ class ResolverPipeline:
                 text,
                 limit=limit_per_resolver,
             )
-            for hit in hits:
-                if hit.concept_id not in seen:
-                    seen.add(hit.concept_id)
-                    results.append(hit)
+            self._merge(hits, seen, results)
+
+        return results
+
+    def _resolve_concurrent(self, kg, text: str, limit: int | None) -> list[CandidateHit]:
+        executor = self._executor()
+        futures = [executor.submit(_run, r, kg, text, limit) for r in self.resolvers]
+        index = {f: i for i, f in enumerate(futures)}
+
+        cut = len(futures)
+        pending: set[Future] = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = index[future]
+                if i < cut and future.exception() is None and future.result():
+                    cut = min(cut, self._cut_after(i))
+            for future in futures[cut:]:
+                future.cancel()
+            # running futures past the cut finish unobserved (close() waits for them)
+            pending = {f for f in pending if index[f] < cut}
+
+        return self._merge_in_order(f.result() for f in futures[:cut])
+
+    def prefetch(self, kg: KnowledgeGraph, texts: list[str]) -> None:
+        """Let every resolver warm its lookups for a batch of texts."""
+        for resolver in self.resolvers:
+            resolver.prefetch(kg, texts)
+
+    async def resolve_async(
+        self,
+        kg,
+        text: str,
+        *,
+        limit_per_resolver: int | None = None,
+    ) -> list[CandidateHit]:
+        """resolve() against an AsyncKnowledgeGraph."""
+        if self.concurrent and len(self.resolvers) > 1:
+            return await self._resolve_concurrent_async(kg, text, limit_per_resolver)
+
+        seen = set()
+        results: list[CandidateHit] = []
+
+        for resolver in self.resolvers:
+            if self._stop_before(resolver, results):
+                break
+
+            hits = await resolver.resolve_async(
+                kg,
+                text,
+                limit=limit_per_resolver,
+            )
+            self._merge(hits, seen, results)
 
         return results
+
+    async def _resolve_concurrent_async(self, kg, text: str, limit: int | None) -> list[CandidateHit]:
+        tasks = [asyncio.ensure_future(_run_async(r, kg, text, limit)) for r in self.resolvers]
+        index = {t: i for i, t in enumerate(tasks)}
+
+        cut = len(tasks)
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    i = index[task]
+                    if i < cut and task.exception() is None and task.result():
+                        cut = min(cut, self._cut_after(i))
+                pending = {t for t in pending if index[t] < cut}
+        finally:
+            for task in tasks[cut:]:
+                if task.done():
+                    if not task.cancelled():
+                        task.exception()  # retrieved: its outcome is discarded
+                else:
+                    task.cancel()
+
+        return self._merge_in_order(t.result() for t in tasks[:cut])
+
+    def _cut_after(self, i: int) -> int:
+        """First resolver skipped once resolver i has returned hits."""
+        for j in range(i + 1, len(self.resolvers)):
+            if self._outranked(self.resolvers[j]):
+                return j
+        return len(self.resolvers)
+
+    def _merge_in_order(self, hit_lists) -> list[CandidateHit]:
+        seen = set()
+        results: list[CandidateHit] = []
+        for resolver, hits in zip(self.resolvers, hit_lists):
+            if self._stop_before(resolver, results):
+                break
+            self._merge(hits, seen, results)
+        return results
+
+    def _outranked(self, resolver: CandidateResolver) -> bool:
+        return (
+            self.stop_after_confidence is not None
+            and resolver.confidence.value > self.stop_after_confidence.value
+        )
+
+    def _stop_before(self, resolver: CandidateResolver, results: list[CandidateHit]) -> bool:
+        return len(results) > 0 and self._outranked(resolver)
+
+    @staticmethod
+    def _merge(hits, seen: set[int], results: list[CandidateHit]) -> None:
+        for hit in hits:
+            if hit.concept_id not in seen:
+                seen.add(hit.concept_id)
+                results.append(hit)
@@ -0,0 +1,30 @@
+from typing import Iterable
+from omop_graph.graph import KnowledgeGraph
+from .base import CandidateResolver, CandidateHit, ResolverConfidence
+
+
+class TokenResolver(CandidateResolver):
+    """
+    Word-order-independent matches on names and synonyms, via the graph's
+    TokenIndex.
+
+    Hits carry their BM25 score, best first, one per concept. The graph
+    (sync or async) must be opened with token_index; there is no database
+    fallback.
+    """
+    name = "bm25"
+    confidence = ResolverConfidence.PARTIAL
+
+    def resolve(self, kg: KnowledgeGraph, text: str, *, limit: int | None = None) -> Iterable[CandidateHit]:
+        index = self._index(kg, "token_index")
+        hits: dict[int, CandidateHit] = {}
+        # several labels of one concept may rank: over-fetch, keep the best
+        for score, m in index.search(text, limit=limit * 4 if limit else None):
+            if m.concept_id not in hits:
+                hits[m.concept_id] = CandidateHit(m.concept_id, self.name, score)
+        ranked = list(hits.values())
+        return ranked[:limit] if limit else ranked
+
+    async def resolve_async(self, kg, text: str, *, limit: int | None = None) -> Iterable[CandidateHit]:
+        # searches the async graph's in-memory index; no queries to await
+        return self.resolve(kg, text, limit=limit)
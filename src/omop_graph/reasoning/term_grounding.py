@@ -1,8 +1,12 @@
 
+import asyncio
 from dataclasses import dataclass
-from typing import Optional, Iterable
-from ..graph.paths import GraphPath, find_shortest_paths
+from typing import Literal, Optional, Iterable
+from ..graph.base import AlgorithmCore, Prefetch, run_core, run_core_async
+from ..graph.paths import GraphPath, PathStep, find_shortest_paths, find_shortest_paths_async
+from ..graph.reachability import UPWARD_PREDICATES
 from ..graph.kg import KnowledgeGraph
+from ..graph.nodes import ConceptView
 from ..graph.edges import PredicateKind
 from ..graph.scoring import PathProfile, rank_paths, path_profile
 from .resolvers import ResolverPipeline
@@ -23,6 +27,9 @@ class GroundingConstraints:
     allowed_vocabularies: Optional[tuple[str, ...]] = None
     require_standard: bool = False
     max_depth: int = 6
+    # "search": shortest ONTOLOGICAL paths per (candidate, parent) pair;
+    # "closure": one shared upward walk over all candidates, best path per parent
+    hierarchy: Literal["search", "closure"] = "search"
 
 
 def _passes_constraints(
@@ -30,9 +37,14 @@ def _passes_constraints(
     concept_id: int,
     constraints: GroundingConstraints,
 ) -> tuple[bool, list[str]]:
-    reasons = []
+    return _check_concept(kg.concept_view(concept_id), constraints)
 
-    c = kg.concept_view(concept_id)
+
+def _check_concept(
+    c: ConceptView,
+    constraints: GroundingConstraints,
+) -> tuple[bool, list[str]]:
+    reasons = []
 
     # domain constraint
     if constraints.allowed_domains:
@@ -78,6 +90,76 @@ def _find_hierarchy_paths(
     return paths
 
 
+_ONTOLOGICAL = frozenset({PredicateKind.ONTOLOGICAL})
+
+
+def _hierarchy_closure_core(
+    kg,
+    candidate_ids: list[int],
+    parent_ids: tuple[int, ...],
+    *,
+    max_depth: int,
+) -> AlgorithmCore:
+    """
+    Upward hierarchy paths from every candidate to the parent_ids it reaches.
+
+    All candidates walk up one level at a time together, so each level is a
+    single Prefetch and an ancestor shared by several candidates has its
+    edges read once. Returns candidate_id -> one shortest path per matched
+    parent.
+    """
+    targets = set(parent_ids)
+    # concept_id -> upward (parent_id, predicate_id) steps, shared by all walks
+    up: dict[int, list[tuple[int, str]]] = {}
+    # per candidate: concept_id -> (previous concept_id, predicate_id)
+    via: dict[int, dict[int, tuple[int, str] | None]] = {
+        c: {c: None} for c in candidate_ids
+    }
+    frontiers = {c: [c] for c in candidate_ids}
+
+    for _ in range(max_depth):
+        frontiers = {
+            c: f for c, f in frontiers.items()
+            if f and not targets <= via[c].keys()
+        }
+        if not frontiers:
+            break
+        unseen = list(dict.fromkeys(n for f in frontiers.values() for n in f if n not in up))
+        if unseen:
+            yield Prefetch(unseen, "out", set(_ONTOLOGICAL), True, None)
+            for n in unseen:
+                up[n] = [
+                    (e.object_id, e.predicate_id)
+                    for e in kg.iter_edges(n, direction="out", predicate_kinds=_ONTOLOGICAL)
+                    if e.predicate_id in UPWARD_PREDICATES
+                ]
+        for c, frontier in frontiers.items():
+            seen = via[c]
+            next_frontier = []
+            for n in frontier:
+                for parent, predicate in up[n]:
+                    if parent not in seen:
+                        seen[parent] = (n, predicate)
+                        next_frontier.append(parent)
+            frontiers[c] = next_frontier
+
+    paths: dict[int, list[GraphPath]] = {}
+    for c, seen in via.items():
+        found = []
+        for parent in parent_ids:
+            if parent not in seen:
+                continue
+            steps: list[PathStep] = []
+            node = parent
+            while seen[node] is not None:
+                prev, predicate = seen[node]
+                steps.append(PathStep(prev, predicate, node))
+                node = prev
+            found.append(GraphPath(tuple(reversed(steps))))
+        paths[c] = found
+    return paths
+
+
 def _best_profile(
     kg: KnowledgeGraph,
     paths: list[GraphPath],
@@ -85,6 +167,20 @@ def _best_profile(
     profiles = [path_profile(kg, p) for p in paths]
     return min(profiles)  # uses PathProfile.__lt__
 
+def _candidate(
+    kg,
+    c: ConceptView,
+    reasons: list[str],
+    paths: list[GraphPath],
+) -> GroundingCandidate:
+    return GroundingCandidate(
+        concept_id=c.concept_id,
+        label=c.concept_name,
+        best_path_profile=_best_profile(kg, paths),
+        reasons=tuple(reasons),
+        paths=tuple(paths),
+    )
+
 def ground_term(
     kg: KnowledgeGraph,
     text: str,
@@ -93,6 +189,9 @@ def ground_term(
     resolver_pipeline: ResolverPipeline,
 ) -> list[GroundingCandidate]:
 
+    if constraints.hierarchy == "closure":
+        return _ground_by_closure(kg, resolver_pipeline.resolve(kg, text), constraints)
+
     results: list[GroundingCandidate] = []
 
     for hit in resolver_pipeline.resolve(kg, text):
@@ -110,19 +209,145 @@ def ground_term(
         if not paths:
             continue  # fails hierarchy constraint
 
-        best_path_profile = _best_profile(kg, paths)
+        results.append(_candidate(kg, kg.concept_view(hit.concept_id), reasons, paths))
+
+    results.sort(key=lambda r: r.best_path_profile)
+    return results
+
+
+def _admitted(views, hits, constraints) -> list[tuple[ConceptView, list[str]]]:
+    admitted: list[tuple[ConceptView, list[str]]] = []
+    for hit in hits:
+        ok, reasons = _check_concept(views[hit.concept_id], constraints)
+        if ok:
+            admitted.append((views[hit.concept_id], reasons))
+    return admitted
+
 
-        c = kg.concept_view(hit.concept_id)
+def _ranked(kg, admitted, found, built=None) -> list[GroundingCandidate]:
+    built = {} if built is None else built
+    results = []
+    for c, reasons in admitted:
+        if not found[c.concept_id]:
+            continue  # fails hierarchy constraint
+        candidate = built.get(c.concept_id)
+        if candidate is None:
+            candidate = built[c.concept_id] = _candidate(kg, c, reasons, found[c.concept_id])
+        results.append(candidate)
+    results.sort(key=lambda r: r.best_path_profile)
+    return results
 
-        results.append(
-            GroundingCandidate(
-                concept_id=hit.concept_id,
-                label=c.concept_name,
-                best_path_profile=best_path_profile,
-                reasons=tuple(reasons),
-                paths=tuple(paths),
+
+def _ground_by_closure(
+    kg: KnowledgeGraph,
+    hits,
+    constraints: GroundingConstraints,
+) -> list[GroundingCandidate]:
+    hits = list(hits)
+    views = kg.concept_views(hit.concept_id for hit in hits)
+    admitted = _admitted(views, hits, constraints)
+    found = run_core(kg, _hierarchy_closure_core(
+        kg,
+        [c.concept_id for c, _ in admitted],
+        constraints.parent_ids,
+        max_depth=constraints.max_depth,
+    ))
+    return _ranked(kg, admitted, found)
+
+
+def ground_terms(
+    kg: KnowledgeGraph,
+    texts: Iterable[str],
+    *,
+    constraints: GroundingConstraints,
+    resolver_pipeline: ResolverPipeline,
+) -> list[list[GroundingCandidate]]:
+    """
+    ground_term() for many texts, returning one result list per input text.
+
+    Texts are normalised and deduplicated; the pipeline's exact lookups are
+    prefetched in bulk, candidate concepts are fetched in one batch, and the
+    hierarchy check runs once over the union of candidates.
+    """
+    texts = list(texts)
+    keys = [kg._normalise_label(t) for t in texts]
+    unique = [k for k in dict.fromkeys(keys) if k]
+
+    resolver_pipeline.prefetch(kg, unique)
+    hits = {k: resolver_pipeline.resolve(kg, k) for k in unique}
+    views = kg.concept_views(h.concept_id for k in unique for h in hits[k])
+    admitted = {k: _admitted(views, hits[k], constraints) for k in unique}
+
+    candidate_ids = list(dict.fromkeys(c.concept_id for k in unique for c, _ in admitted[k]))
+    if constraints.hierarchy == "closure":
+        found = run_core(kg, _hierarchy_closure_core(
+            kg, candidate_ids, constraints.parent_ids, max_depth=constraints.max_depth,
+        ))
+    else:
+        found = {
+            cid: _find_hierarchy_paths(kg, cid, constraints.parent_ids, max_depth=constraints.max_depth)
+            for cid in candidate_ids
+        }
+    # path scoring reads concept metadata for every node on every path
+    kg.concept_views(cid for paths in found.values() for p in paths for cid in p.nodes())
+
+    built: dict[int, GroundingCandidate] = {}
+    grounded = {k: _ranked(kg, admitted[k], found, built) for k in unique}
+    return [list(grounded[k]) if k else [] for k in keys]
+
+
+async def ground_term_async(
+    kg,
+    text: str,
+    *,
+    constraints: GroundingConstraints,
+    resolver_pipeline: ResolverPipeline,
+) -> list[GroundingCandidate]:
+    """
+    ground_term() over an AsyncKnowledgeGraph.
+
+    Candidate concepts are fetched in one batch, and the hierarchy path
+    searches for every (candidate, parent) pair run concurrently.
+    """
+    hits = await resolver_pipeline.resolve_async(kg, text)
+    views = await kg.concept_views(hit.concept_id for hit in hits)
+    admitted = _admitted(views, hits, constraints)
+
+    if constraints.hierarchy == "closure":
+        found = await run_core_async(kg, _hierarchy_closure_core(
+            kg.cached,
+            [c.concept_id for c, _ in admitted],
+            constraints.parent_ids,
+            max_depth=constraints.max_depth,
+        ))
+        await kg.concept_views(cid for paths in found.values() for p in paths for cid in p.nodes())
+        return _ranked(kg.cached, admitted, found)
+
+    searches = await asyncio.gather(*(
+        asyncio.gather(*(
+            find_shortest_paths_async(
+                kg,
+                source=c.concept_id,
+                target=parent,
+                predicate_kinds={PredicateKind.ONTOLOGICAL},
+                max_depth=constraints.max_depth,
+                max_paths=3,
             )
-        )
+            for parent in constraints.parent_ids
+        ))
+        for c, _ in admitted
+    ))
+    found = [
+        [p for paths, _ in per_parent for p in paths]
+        for per_parent in searches
+    ]
+    # path scoring reads concept metadata for every node on every path
+    await kg.concept_views(cid for paths in found for p in paths for cid in p.nodes())
 
+    results = [
+        _candidate(kg.cached, c, reasons, paths)
+        for (c, reasons), paths in zip(admitted, found)
+        if paths  # fails hierarchy constraint otherwise
+    ]
     results.sort(key=lambda r: r.best_path_profile)
     return results
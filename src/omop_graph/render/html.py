@@ -44,8 +44,10 @@ def concept_card_compact(c: ConceptView) -> str:
 
 
 def subgraph_html(kg, sg: Subgraph) -> str:
-    nodes = [kg.concept_view(cid) for cid in sg.nodes]
-    node_html = "".join(concept_card(n) for n in nodes[:20])
+    # only the first 20 nodes are shown as cards
+    shown = list(sg.nodes)[:20]
+    views = kg.concept_views(shown)
+    node_html = "".join(concept_card(views[cid]) for cid in shown)
 
     return f"""
     <div>
@@ -60,9 +62,11 @@ def subgraph_html(kg, sg: Subgraph) -> str:
 
 def trace_html_with_cards(kg, trace: GraphTrace) -> str:
     blocks: list[str] = []
+    MAX = 5
+    views = kg.concept_views(trace.concept_ids(per_predicate=MAX))
 
     for step in trace.steps:
-        c = kg.concept_view(step.node)
+        c = views[step.node]
         blocks.append(f"""
         <div style="margin-bottom:16px;">
             <div style="margin-bottom:6px; color:#666;">
@@ -83,9 +87,8 @@ def trace_html_with_cards(kg, trace: GraphTrace) -> str:
             </div>
             """)
 
-            MAX = 5
             for e in edges[:MAX]:
-                obj = kg.concept_view(e.object_id)
+                obj = views[e.object_id]
                 blocks.append(f"""
                 <div style="margin-left:40px;">
                     → {escape(obj.concept_name)}
@@ -114,9 +117,10 @@ def trace_html_with_cards(kg, trace: GraphTrace) -> str:
 
 def path_html(kg, path: GraphPath) -> str:
     lines = []
+    views = kg.concept_views(path.nodes())
     for step in path.steps:
-        s = kg.concept_view(step.subject)
-        o = kg.concept_view(step.object)
+        s = views[step.subject]
+        o = views[step.object]
         lines.append(
             f"{escape(s.concept_name)} "
             f"<b>--[{escape(step.predicate)}]--></b> "
@@ -127,9 +131,10 @@ def path_html(kg, path: GraphPath) -> str:
 
 def explained_path_html(kg, explanation: PathExplanation) -> str:
     rows = []
+    views = kg.concept_views(explanation.path.nodes())
     for s in explanation.steps:
-        subj = kg.concept_view(s.step.subject)
-        obj = kg.concept_view(s.step.object)
+        subj = views[s.step.subject]
+        obj = views[s.step.object]
         rows.append(f"""
         <tr>
             <td>{escape(subj.concept_name)}</td>
@@ -7,8 +7,9 @@ def subgraph_mermaid(kg, sg: Subgraph) -> str:
     lines = ["graph TD"]
 
     # nodes
+    views = kg.concept_views(sg.nodes)
     for cid in sg.nodes:
-        c = kg.concept_view(cid)
+        c = views[cid]
         label = f"{c.concept_name}\\n{c.vocabulary_id}:{c.concept_code}"
         lines.append(f'  {cid}["{label}"]')
 
@@ -22,10 +23,11 @@ def subgraph_mermaid(kg, sg: Subgraph) -> str:
 
 def path_mermaid(kg, path: GraphPath) -> str:
     lines = ["graph LR"]
+    views = kg.concept_views(path.nodes())
 
     for step in path.steps:
-        s = kg.concept_view(step.subject)
-        o = kg.concept_view(step.object)
+        s = views[step.subject]
+        o = views[step.object]
         lines.append(
             f'{step.subject}["{s.concept_name}"] -->|{step.predicate}| '
             f'{step.object}["{o.concept_name}"]'
@@ -13,8 +13,9 @@ def subgraph_text(kg, sg: Subgraph) -> str:
         "",
     ]
 
+    views = kg.concept_views(sg.nodes)
     for cid in sorted(sg.nodes):
-        c = kg.concept_view(cid)
+        c = views[cid]
         lines.append(f"- {c.concept_name} ({c.vocabulary_id}:{c.concept_code})")
 
     return "\n".join(lines)
@@ -22,9 +23,10 @@ def subgraph_text(kg, sg: Subgraph) -> str:
 
 def trace_text(kg, trace: GraphTrace) -> str:
     lines: list[str] = []
+    views = kg.concept_views(trace.concept_ids(per_predicate=6))
 
     for step in trace.steps:
-        c = kg.concept_view(step.node)
+        c = views[step.node]
         lines.append(f"[depth {step.depth}] {c.concept_name}")
 
         by_pred = {}
@@ -36,7 +38,7 @@ def trace_text(kg, trace: GraphTrace) -> str:
             lines.append(f"    └─ {pname}")
 
             for e in edges[:6]:
-                obj = kg.concept_view(e.object_id)
+                obj = views[e.object_id]
                 lines.append(f"        → {obj.concept_name}")
 
             if len(edges) > 6:
@@ -49,19 +51,21 @@ def trace_text(kg, trace: GraphTrace) -> str:
 
 def path_text(kg, path: GraphPath) -> str:
     parts = []
+    views = kg.concept_views(path.nodes())
     for step in path.steps:
-        s = kg.concept_view(step.subject)
-        o = kg.concept_view(step.object)
+        s = views[step.subject]
+        o = views[step.object]
         parts.append(f"{s.concept_name} --[{step.predicate}]--> {o.concept_name}")
     return "\n".join(parts)
 
 
 def explained_path_text(kg, explanation: PathExplanation) -> str:
     lines = [f"Path score: {explanation.profile.path_rank():.2f}", "Steps:"]
+    views = kg.concept_views(explanation.path.nodes())
 
     for s in explanation.steps:
-        subj = kg.concept_view(s.step.subject)
-        obj = kg.concept_view(s.step.object)
+        subj = views[s.step.subject]
+        obj = views[s.step.object]
         lines.append(
             f"- {subj.concept_name} --[{s.step.predicate}]--> {obj.concept_name} "
             f"({s.predicate_kind.name}, "#Δ={s.score_delta:+.2f}) "
@@ -0,0 +1,192 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from omop_alchemy.cdm.model.vocabulary import (
+    Concept,
+    Concept_Ancestor,
+    Concept_Relationship,
+    Concept_Synonym,
+    Relationship,
+    Vocabulary,
+)
+
+"""
+A tiny OMOP vocabulary on SQLite, shaped like the examples in the README.
+
+    Drug (100)
+      └─ Antiplatelet agent (101)
+           └─ Aspirin (102) ── May treat ──> Hypertensive disorder (204)
+                ├─ Aspirin 81 MG Oral Tablet (103)   [Has ingredient]
+                └─ Acetylsalicylic acid (104)         [Maps to, non-standard]
+
+    Clinical finding (200)
+      ├─ Disorder of breast (201)
+      │    └─ Carcinoma of breast (202)
+      │         └─ Ductal carcinoma of breast (203)
+      └─ Hypertensive disorder (204)
+           ├─ Essential hypertension (205)
+           └─ Old hypertension (206)              [deprecated, replaced by 205]
+"""
+
+START = date(1970, 1, 1)
+END = date(2099, 12, 31)
+
+CONCEPTS = [
+    (100, "Drug", "Drug", "SNOMED", "Pharma/Biol Product", "S", "373873005"),
+    (101, "Antiplatelet agent", "Drug", "SNOMED", "Pharma/Biol Product", "S", "108972005"),
+    (102, "Aspirin", "Drug", "RxNorm", "Ingredient", "S", "1191"),
+    (103, "Aspirin 81 MG Oral Tablet", "Drug", "RxNorm", "Clinical Drug", "S", "243670"),
+    (104, "Acetylsalicylic acid", "Drug", "SNOMED", "Substance", None, "387458008"),
+    (200, "Clinical finding", "Condition", "SNOMED", "Clinical Finding", "S", "404684003"),
+    (201, "Disorder of breast", "Condition", "SNOMED", "Disorder", "S", "79604008"),
+    (202, "Carcinoma of breast", "Condition", "SNOMED", "Disorder", "S", "254838004"),
+    (203, "Ductal carcinoma of breast", "Condition", "SNOMED", "Disorder", "S", "82711006"),
+    (204, "Hypertensive disorder", "Condition", "SNOMED", "Disorder", "S", "38341003"),
+    (205, "Essential hypertension", "Condition", "SNOMED", "Disorder", "S", "59621000"),
+    (206, "Old hypertension", "Condition", "SNOMED", "Disorder", None, "0000001"),
+]
+
+RELATIONSHIPS = [
+    ("Is a", "Is a", 1, 1, "Subsumes"),
+    ("Subsumes", "Subsumes", 1, 1, "Is a"),
+    ("Maps to", "Maps to", 0, 0, "Mapped from"),
+    ("Mapped from", "Mapped from", 0, 0, "Maps to"),
+    ("Has ingredient", "Has ingredient", 0, 0, "Ingredient of"),
+    ("Ingredient of", "Ingredient of", 0, 0, "Has ingredient"),
+    ("Concept replaced by", "Concept replaced by", 0, 0, "Concept replaces"),
+    ("Concept replaces", "Concept replaces", 0, 0, "Concept replaced by"),
+    ("May treat", "May treat", 0, 0, "May be treated by"),
+    ("May be treated by", "May be treated by", 0, 0, "May treat"),
+]
+
+# (subject, relationship, object, invalid_reason)
+EDGES = [
+    (101, "Is a", 100, None),
+    (102, "Is a", 101, None),
+    (103, "Has ingredient", 102, None),
+    (104, "Maps to", 102, None),
+    (102, "May treat", 204, None),
+    (201, "Is a", 200, None),
+    (202, "Is a", 201, None),
+    (203, "Is a", 202, None),
+    (204, "Is a", 200, None),
+    (205, "Is a", 204, None),
+    (206, "Is a", 204, "D"),
+    (206, "Concept replaced by", 205, None),
+]
+
+SYNONYMS = [
+    (102, "Acetylsalicylic acid"),
+    (102, "ASA"),
+    (203, "Carcinoma of breast, ductal"),
+    (204, "High blood pressure"),
+    (205, "Primary hypertension"),
+]
+
+REVERSE = {r[0]: r[4] for r in RELATIONSHIPS}
+
+
+def _ancestor_rows() -> list[tuple[int, int, int]]:
+    parents: dict[int, set[int]] = {}
+    for s, rel, o, invalid in EDGES:
+        if rel == "Is a" and invalid is None:
+            parents.setdefault(s, set()).add(o)
+
+    rows = []
+    for cid, *_, std, _code in CONCEPTS:
+        if std is None:
+            continue
+        rows.append((cid, cid, 0))
+        frontier, depth, seen = {cid}, 0, {cid}
+        while frontier:
+            depth += 1
+            frontier = {p for n in frontier for p in parents.get(n, ())} - seen
+            seen |= frontier
+            rows.extend((a, cid, depth) for a in frontier)
+    return rows
+
+
+def build_vocabulary(engine) -> None:
+    tables = (Vocabulary, Concept, Relationship, Concept_Relationship, Concept_Synonym, Concept_Ancestor)
+    for model in tables:
+        model.__table__.create(engine)
+
+    with engine.begin() as conn:
+        conn.execute(insert(Concept), [
+            dict(
+                concept_id=cid, concept_name=name, domain_id=domain,
+                vocabulary_id=vocab, concept_class_id=cls, standard_concept=std,
+                concept_code=code, valid_start_date=START, valid_end_date=END,
+                invalid_reason="D" if cid == 206 else None,
+            )
+            for cid, name, domain, vocab, cls, std, code in CONCEPTS
+        ])
+        conn.execute(insert(Vocabulary), [
+            dict(vocabulary_id="None", vocabulary_name="OMOP Standardized Vocabularies",
+                 vocabulary_version="v5.0 TEST-RELEASE", vocabulary_concept_id=0),
+        ])
+        conn.execute(insert(Relationship), [
+            dict(relationship_id=rid, relationship_name=name, is_hierarchical=str(h),
+                 defines_ancestry=str(a), reverse_relationship_id=rev, relationship_concept_id=0)
+            for rid, name, h, a, rev in RELATIONSHIPS
+        ])
+        rows = []
+        for s, rel, o, invalid in EDGES:
+            rows.append((s, rel, o, invalid))
+            rows.append((o, REVERSE[rel], s, invalid))
+        conn.execute(insert(Concept_Relationship), [
+            dict(concept_id_1=s, relationship_id=rel, concept_id_2=o,
+                 valid_start_date=START, valid_end_date=END, invalid_reason=invalid)
+            for s, rel, o, invalid in rows
+        ])
+        conn.execute(insert(Concept_Synonym), [
+            dict(concept_id=cid, concept_synonym_name=name, language_concept_id=4180186)
+            for cid, name in SYNONYMS
+        ])
+        conn.execute(insert(Concept_Ancestor), [
+            dict(ancestor_concept_id=a, descendant_concept_id=d,
+                 min_levels_of_separation=lvl, max_levels_of_separation=lvl)
+            for a, d, lvl in _ancestor_rows()
+        ])
+
+
+@pytest.fixture
+def vocab_url(tmp_path) -> str:
+    return f"sqlite:///{tmp_path / 'cdm.db'}"
+
+
+@pytest.fixture
+def vocab_engine(tmp_path, vocab_url):
+    engine = create_engine(vocab_url)
+    vocab_file = tmp_path / "vocab.db"
+
+    @event.listens_for(engine, "connect")
+    def _attach_vocab_schema(dbapi_conn, _):
+        dbapi_conn.execute(f"ATTACH DATABASE '{vocab_file}' AS vocab")
+
+    build_vocabulary(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def vocab_session(vocab_engine):
+    session = sessionmaker(bind=vocab_engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def queries(vocab_engine):
+    """SQL statements issued on vocab_engine while the test runs."""
+    statements: list[str] = []
+
+    @event.listens_for(vocab_engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    yield statements
+    event.remove(vocab_engine, "before_cursor_execute", _record)
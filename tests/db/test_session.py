@@ -0,0 +1,80 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from omop_graph.db.session import PerCallSession, PerThreadSession, dispose_engines, get_engine, open_session
+from omop_graph.graph.kg import KnowledgeGraph
+from omop_graph.graph.queries import s_concept_view
+from omop_graph.reasoning.resolvers import (
+    ExactLabelResolver, ExactSynonymResolver, PartialLabelResolver, ResolverPipeline,
+)
+
+
+@pytest.fixture
+def registry_engine(vocab_engine, vocab_url, tmp_path):
+    # the registry engine needs the same vocab schema attachment as the fixture engine
+    engine = get_engine(vocab_url)
+    vocab_file = tmp_path / "vocab.db"
+
+    @event.listens_for(engine, "connect")
+    def _attach_vocab_schema(dbapi_conn, _):
+        dbapi_conn.execute(f"ATTACH DATABASE '{vocab_file}' AS vocab")
+
+    yield engine
+    dispose_engines()
+
+
+def test_engines_are_shared_per_url_and_options(registry_engine, vocab_url):
+    assert get_engine(vocab_url) is registry_engine
+    assert get_engine(vocab_url, pool_pre_ping=False) is not registry_engine
+    assert isinstance(open_session(vocab_url), Session)
+    assert isinstance(open_session(vocab_url, scope="thread"), PerThreadSession)
+    assert isinstance(open_session(vocab_url, scope="call"), PerCallSession)
+    with pytest.raises(ValueError):
+        open_session(vocab_url, scope="process")
+
+
+@pytest.mark.parametrize("scope", ["thread", "call"])
+def test_graph_is_usable_from_a_thread_pool(registry_engine, vocab_url, scope):
+    kg = KnowledgeGraph.from_url(vocab_url, scope=scope)
+    ids = [100, 101, 102, 103, 200, 201, 202, 203, 204, 205] * 8
+
+    def work(cid):
+        return kg.concept_view(cid).concept_name, kg.outgoing_edges(cid), kg.incoming_edges(cid)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        concurrent = list(pool.map(work, ids))
+
+    assert concurrent == [work(cid) for cid in ids]
+    assert kg.cache_info()["concept_view"].currsize == 10
+
+
+def test_idle_threads_hold_no_connections(registry_engine, vocab_url):
+    pool = registry_engine.pool
+    threads = pool.size() + pool._max_overflow + 5
+    kg = KnowledgeGraph.from_url(vocab_url, scope="thread")
+    # every thread queries, then waits until all the others have queried too
+    barrier = threading.Barrier(threads, timeout=10)
+
+    def work(cid):
+        row = kg.session.execute(s_concept_view(), {"concept_id": cid}).one()
+        barrier.wait()
+        return row.concept_name
+
+    with ThreadPoolExecutor(max_workers=threads) as workers:
+        names = list(workers.map(work, [102] * threads))
+
+    assert names == ["Aspirin"] * threads
+    assert pool.checkedout() == 0
+
+
+def test_concurrent_pipeline_on_thread_scoped_graph(registry_engine, vocab_url):
+    kg = KnowledgeGraph.from_url(vocab_url, scope="thread")
+    resolvers = (ExactLabelResolver(), ExactSynonymResolver(), PartialLabelResolver())
+    for text in ("aspirin", "ASA", "hypertension"):
+        sequential = ResolverPipeline(resolvers).resolve(kg, text)
+        kg.clear_caches()
+        assert ResolverPipeline(resolvers, concurrent=True).resolve(kg, text) == sequential
@@ -0,0 +1,177 @@
+import asyncio
+import importlib.util
+
+import pytest
+from sqlalchemy import event
+
+pytest.importorskip("aiosqlite")
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from omop_graph.graph.async_kg import AsyncKnowledgeGraph
+from omop_graph.graph.edges import PredicateKind
+from omop_graph.graph.kg import KnowledgeGraph
+from omop_graph.graph.paths import find_shortest_paths, find_shortest_paths_async
+from omop_graph.graph.traverse import traverse, traverse_async
+from omop_graph.graph.label_dictionary import LabelDictionary
+from omop_graph.graph.bm25 import TokenIndex
+from omop_graph.graph.symspell import SymSpellIndex
+from omop_graph.graph.trigram import TrigramIndex
+from omop_graph.reasoning.resolvers import (
+    ExactLabelResolver,
+    EditDistanceResolver,
+    EmbeddingResolver,
+    ExactSynonymResolver,
+    PartialLabelResolver,
+    ResolverPipeline,
+    TokenResolver,
+)
+from omop_graph.reasoning.term_grounding import GroundingConstraints, ground_term, ground_term_async
+
+
+def _run_async(vocab_url, tmp_path, body, **graph_options):
+    async def main():
+        engine = create_async_engine(vocab_url.replace("sqlite://", "sqlite+aiosqlite://"))
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def _attach_vocab_schema(dbapi_conn, _):
+            cursor = dbapi_conn.cursor()
+            cursor.execute(f"ATTACH DATABASE '{tmp_path / 'vocab.db'}' AS vocab")
+            cursor.close()
+
+        try:
+            return await body(await AsyncKnowledgeGraph.connect(engine, **graph_options))
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+def test_async_lookups_match_sync(vocab_session, vocab_url, tmp_path):
+    kg = KnowledgeGraph(vocab_session)
+
+    async def body(akg):
+        views = await akg.concept_views([202, 203, 999])
+        assert sorted(views) == [202, 203]
+        assert await akg.concept_view(205) == kg.concept_view(205)
+        assert await akg.outgoing_edges(206) == kg.outgoing_edges(206)
+        assert await akg.incoming_edges(204, active_only=True) == kg.incoming_edges(204, active_only=True)
+        assert await akg.label_lookup("aspirin") == kg.label_lookup("aspirin")
+        assert await akg.synonym_lookup("ASA") == kg.synonym_lookup("ASA")
+        assert await akg.label_lookup("carcinoma", fuzzy=True) == kg.label_lookup("carcinoma", fuzzy=True)
+        assert await akg.label_and_synonym_lookup("hypertension", fuzzy=True) == kg.label_and_synonym_lookup("hypertension", fuzzy=True)
+
+    _run_async(vocab_url, tmp_path, body)
+
+
+def test_async_algorithms_match_sync(vocab_session, vocab_url, tmp_path):
+    kg = KnowledgeGraph(vocab_session)
+    kinds = {PredicateKind.ONTOLOGICAL}
+    constraints = GroundingConstraints(parent_ids=(200,), allowed_domains=("Condition",))
+    closure = GroundingConstraints(parent_ids=(200,), allowed_domains=("Condition",), hierarchy="closure")
+    pipeline = ResolverPipeline((ExactLabelResolver(), ExactSynonymResolver()))
+
+    async def body(akg):
+        akg.batch_size = 1
+        assert await traverse_async(
+            akg, [200], predicate_kinds=None, max_depth=2, on=None, max_nodes=None, trace=True,
+        ) == traverse(kg, [200], predicate_kinds=None, max_depth=2, on=None, max_nodes=None, trace=True)
+        assert await find_shortest_paths_async(akg, 203, 200, predicate_kinds=kinds) == (
+            find_shortest_paths(kg, 203, 200, predicate_kinds=kinds)
+        )
+        for text in ("High blood pressure", "Ductal carcinoma of breast", "Aspirin"):
+            assert await ground_term_async(
+                akg, text, constraints=constraints, resolver_pipeline=pipeline,
+            ) == ground_term(kg, text, constraints=constraints, resolver_pipeline=pipeline)
+            assert await ground_term_async(
+                akg, text, constraints=closure, resolver_pipeline=pipeline,
+            ) == ground_term(kg, text, constraints=closure, resolver_pipeline=pipeline)
+
+    _run_async(vocab_url, tmp_path, body)
+
+
+def test_cached_view_refuses_to_block(vocab_engine, vocab_url, tmp_path):
+    async def body(akg):
+        with pytest.raises(LookupError):
+            akg.cached.concept_view(203)
+        with pytest.raises(LookupError):
+            list(akg.cached.iter_edges(203))
+
+    _run_async(vocab_url, tmp_path, body)
+
+
+def test_cached_view_needs_endpoint_domains(vocab_session, vocab_url, tmp_path):
+    kg = KnowledgeGraph(vocab_session)
+
+    async def body(akg):
+        # 102 "May treat" 204 crosses from Drug into Condition
+        await akg.prefetch_edges([204], direction="in")
+        akg._domains.clear()
+        with pytest.raises(LookupError):
+            list(akg.cached.iter_edges(204, direction="in"))
+        assert list(akg.cached.iter_edges(204, direction="in", within_domain=False)) == (
+            list(kg.iter_edges(204, direction="in", within_domain=False))
+        )
+
+        # prefetching again reloads the evicted domains
+        await akg.prefetch_edges([204], direction="in")
+        assert list(akg.cached.iter_edges(204, direction="in")) == list(kg.iter_edges(204, direction="in"))
+        assert 102 not in {e.subject_id for e in akg.cached.iter_edges(204, direction="in")}
+
+    _run_async(vocab_url, tmp_path, body)
+
+
+def test_async_resolvers_use_in_memory_indexes(vocab_session, vocab_url, tmp_path):
+    indexes = dict(
+        trigram_index=TrigramIndex.from_session(vocab_session),
+        label_dictionary=LabelDictionary.from_session(vocab_session),
+        symspell_index=SymSpellIndex.from_session(vocab_session),
+        token_index=TokenIndex.from_session(vocab_session),
+    )
+    if importlib.util.find_spec("numpy"):
+        from omop_graph.graph.embeddings import EmbeddingIndex
+        indexes["embedding_index"] = EmbeddingIndex.from_session(vocab_session)
+    kg = KnowledgeGraph(vocab_session, **indexes)
+    checks = [
+        (PartialLabelResolver(), "breast", 2),
+        (EditDistanceResolver(), "esential hypertenson", None),
+        (TokenResolver(), "hypertension essential", 2),
+    ]
+    if "embedding_index" in indexes:
+        checks.append((EmbeddingResolver(min_score=0.3), "essential hypertenshun", 3))
+
+    async def body(akg):
+        assert await akg.label_lookup("breast", fuzzy=True) == kg.label_lookup("breast", fuzzy=True)
+        assert await akg.label_and_synonym_lookup("acetylsalicylic acid") == kg.label_and_synonym_lookup("acetylsalicylic acid")
+        assert akg.label_dictionary is not None
+        for resolver, text, limit in checks:
+            hits = await resolver.resolve_async(akg, text, limit=limit)
+            assert hits and list(hits) == list(resolver.resolve(kg, text, limit=limit))
+
+    _run_async(vocab_url, tmp_path, body, **indexes)
+
+
+def test_sync_only_resolver_runs_under_async_grounding(vocab_session, vocab_url, tmp_path):
+    from omop_graph.reasoning.resolvers.base import CandidateHit, CandidateResolver, ResolverConfidence
+
+    class SynonymsOfLabel(CandidateResolver):
+        # a third-party resolver written against the synchronous graph only
+        name = "synonyms_of_label"
+        confidence = ResolverConfidence.PARTIAL
+
+        def resolve(self, kg, text, *, limit=None):
+            ids = {m.concept_id for m in kg.label_lookup(text)}
+            ids |= {m.concept_id for m in kg.synonym_lookup(text)}
+            return [CandidateHit(cid, self.name) for cid in sorted(ids)][:limit]
+
+    kg = KnowledgeGraph(vocab_session)
+    pipeline = ResolverPipeline((SynonymsOfLabel(),))
+
+    async def body(akg):
+        hits = await pipeline.resolve_async(akg, "aspirin")
+        assert hits and hits == pipeline.resolve(kg, "aspirin")
+        # the synchronous view fills the async graph's caches
+        assert akg.cache_info()["synonym_lookup"].currsize == 1
+        await pipeline.resolve_async(akg, "aspirin")
+        assert akg.cache_info()["synonym_lookup"].hits == 1
+
+    _run_async(vocab_url, tmp_path, body)
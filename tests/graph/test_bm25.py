@@ -0,0 +1,46 @@
+import pytest
+
+from omop_graph.graph.bm25 import TokenIndex
+from omop_graph.graph.kg import KnowledgeGraph
+from omop_graph.graph.labels import LabelTable
+from omop_graph.graph.nodes import LabelMatchKind
+from omop_graph.reasoning.resolvers import ResolverPipeline, TokenResolver
+
+
+def test_search_ignores_word_order(vocab_session):
+    index = TokenIndex.from_session(vocab_session)
+
+    hits = index.search("breast carcinoma, ductal")
+    assert [m.concept_id for _, m in hits][:2] == [203, 203]  # name and synonym
+    assert hits[0][0] > hits[2][0] > 0
+    assert {m.concept_id for _, m in hits} == {201, 202, 203}
+
+    [(_, synonym)] = index.search("pressure high", kind=LabelMatchKind.SYNONYM)
+    assert (synonym.concept_id, synonym.matched_label) == (204, "High blood pressure")
+    assert index.search("zzzz") == []
+
+
+def test_early_termination_keeps_the_top_k():
+    # "of" is in every label; only the rare tokens should decide the top 2
+    names = [(i, f"disorder {i} of organ", True, True) for i in range(500)]
+    names += [(1000, "carcinoma of breast", True, True), (1001, "breast of carcinoma cell", True, True)]
+    index = TokenIndex.build(LabelTable.from_rows(names))
+
+    full = index.search("carcinoma of breast", limit=1000)
+    top = index.search("carcinoma of breast", limit=2)
+    assert [m.concept_id for _, m in top] == [m.concept_id for _, m in full[:2]] == [1000, 1001]
+    assert [s for s, _ in top] == [s for s, _ in full[:2]]
+
+
+def test_saved_index_backs_resolver(vocab_session, queries, tmp_path):
+    TokenIndex.from_session(vocab_session).save(tmp_path / "tokens")
+    kg = KnowledgeGraph(vocab_session, token_index=tmp_path / "tokens")
+    queries.clear()
+
+    hits = ResolverPipeline((TokenResolver(),)).resolve(kg, "hypertension essential", limit_per_resolver=2)
+    assert [h.concept_id for h in hits] == [205, 206]
+    assert hits[0].resolver == "bm25" and hits[0].score > hits[1].score
+    assert queries == []
+
+    with pytest.raises(ValueError, match="token_index"):
+        TokenResolver().resolve(KnowledgeGraph(vocab_session), "hypertension")
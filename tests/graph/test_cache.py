@@ -0,0 +1,45 @@
+import gc
+import weakref
+
+from omop_graph.graph.cache import LRUCache
+from omop_graph.graph.kg import KnowledgeGraph
+
+
+def test_lru_counts_hits_misses_and_evictions():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)  # evicts "b", the least recently used
+
+    assert "b" not in cache and cache.get("b") is None
+    info = cache.info()
+    assert (info.hits, info.misses, info.evictions, info.currsize) == (1, 1, 1, 2)
+
+
+def test_lru_byte_budget():
+    cache = LRUCache(maxsize=100, max_bytes=300)
+    for i in range(10):
+        cache.put(i, "x" * 100)
+
+    assert cache.info().nbytes <= 300
+    assert 9 in cache and 0 not in cache
+
+
+def test_kg_caches_are_per_instance(vocab_session):
+    small = KnowledgeGraph(vocab_session, cache_sizes={"concept_view": 1})
+    other = KnowledgeGraph(vocab_session)
+
+    small.concept_view(100)
+    small.concept_view(101)
+    small.label_lookup("aspirin")
+    assert small.cache_info()["concept_view"].evictions == 1
+    assert "concept_view" not in other.cache_info()
+
+    small.clear_caches()
+    assert all(info.currsize == 0 for info in small.cache_info().values())
+
+    ref = weakref.ref(small)
+    del small
+    gc.collect()
+    assert ref() is None
@@ -0,0 +1,45 @@
+from datetime import date
+
+from omop_graph.graph.csr import CSRGraph
+from omop_graph.graph.edges import PredicateKind
+from omop_graph.graph.kg import KnowledgeGraph
+from omop_graph.graph.paths import find_shortest_paths
+from omop_graph.graph.traverse import traverse
+
+
+def _edge_keys(edges):
+    return sorted((e.subject_id, e.predicate_id, e.object_id, e.invalid_reason) for e in edges)
+
+
+def test_csr_edges_match_sql_backend(vocab_session):
+    kg = KnowledgeGraph(vocab_session)
+    csr = CSRGraph.from_session(vocab_session)
+
+    assert csr.num_nodes == 12
+    for cid in (100, 102, 204, 206):
+        for direction in ("out", "in"):
+            for kwargs in (
+                {},
+                {"within_domain": False},
+                {"active_only": False, "within_domain": False},
+                {"predicate": "Is a"},
+                {"predicate_kinds": {PredicateKind.MAPPING}, "within_domain": False},
+                {"on": date(2000, 1, 1)},
+            ):
+                assert _edge_keys(csr.iter_edges(cid, direction=direction, **kwargs)) == _edge_keys(
+                    kg.iter_edges(cid, direction=direction, **kwargs)
+                )
+
+
+def test_csr_algorithms(vocab_session):
+    csr = CSRGraph.from_session(vocab_session)
+
+    paths, _ = find_shortest_paths(csr, 203, 200, predicate_kinds={PredicateKind.ONTOLOGICAL})
+    assert [p.nodes() for p in paths] == [(203, 202, 201, 200)]
+
+    sg, _ = traverse(csr, [102], predicate_kinds=None, max_depth=1, on=None, max_nodes=None, trace=False)
+    assert sg.nodes == {101, 102, 103, 104}
+    assert csr.concept_view(203).concept_name == "Ductal carcinoma of breast"
+    assert csr.predicate_name("Maps to") == "Maps to"
+    assert csr.domain_id(204) == "Condition"
+    assert 999 not in csr
@@ -0,0 +1,76 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from omop_graph.graph.embeddings import EmbeddingIndex, HashingEncoder
+from omop_graph.graph.kg import KnowledgeGraph
+from omop_graph.graph.labels import LabelTable
+from omop_graph.graph.nodes import LabelMatchKind
+from omop_graph.reasoning.resolvers import EmbeddingResolver, ResolverPipeline
+
+
+def test_hashing_encoder_is_deterministic():
+    encode = HashingEncoder(dim=64)
+    a, b = encode(["Carcinoma of breast", "carcinoma  of BREAST"])
+    assert a.shape == (64,) and np.array_equal(a, b)
+
+
+def test_search_ranks_by_similarity(vocab_session):
+    index = EmbeddingIndex.from_session(vocab_session, dtype="float16")
+    assert index.vectors.dtype == np.float16
+
+    [breast, pressure] = index.search_many(["carcinoma of the breast", "high blood presure"], limit=3)
+    assert breast[0][1].concept_id == 202 and breast[0][0] > breast[1][0]
+    assert pressure[0][1].concept_id == 204
+    assert pressure[0][1].match_kind == LabelMatchKind.SYNONYM
+    assert index.search("aspirin", kind=LabelMatchKind.SYNONYM)[0][1].concept_id == 102
+
+
+def test_ivf_probes_nearest_lists():
+    names = [(i, f"concept number {i} {'alpha' if i % 2 else 'beta'}", True, True) for i in range(400)]
+    index = EmbeddingIndex.build(LabelTable.from_rows(names), n_lists=8)
+    assert len(index.list_rows) == 400 and index.list_offsets[-1] == 400
+
+    exact = EmbeddingIndex.build(LabelTable.from_rows(names), n_lists=0)
+    for probe in ("concept number 17 alpha", "concept number 250 beta"):
+        assert index.search(probe, n_probe=8, limit=5) == exact.search(probe, limit=5)
+        assert index.search(probe, n_probe=1, limit=1)[0][1].concept_id == int(probe.split()[2])
+
+
+def test_saved_index_backs_resolver(vocab_session, queries, tmp_path):
+    EmbeddingIndex.from_session(vocab_session, n_lists=2).save(tmp_path / "embeddings")
+    kg = KnowledgeGraph(vocab_session, embedding_index=tmp_path / "embeddings")
+    assert isinstance(kg.embedding_index.vectors, np.memmap)
+    queries.clear()
+
+    resolver = EmbeddingResolver(min_score=0.3)
+    pipeline = ResolverPipeline((resolver,))
+    pipeline.prefetch(kg, ["essential hypertenshun"])
+    hits = pipeline.resolve(kg, "essential hypertenshun")
+    assert hits[0].concept_id == 205 and hits[0].resolver == "embedding"
+    assert all(h.score >= 0.3 for h in hits)
+    assert kg.cache_info()["embedding_search"].hits == 1
+    assert queries == []
+
+    with pytest.raises(ValueError, match="embedding_index"):
+        resolver.resolve(KnowledgeGraph(vocab_session), "aspirin")
+
+
+def test_resolver_searches_once_per_normalised_label(vocab_session):
+    kg = KnowledgeGraph(vocab_session, embedding_index=EmbeddingIndex.from_session(vocab_session))
+    calls = []
+    search_many = kg.embedding_index.search_many
+    kg.embedding_index.search_many = lambda labels, **kw: calls.append((labels, kw)) or search_many(labels, **kw)
+
+    resolver = EmbeddingResolver()
+    resolver.prefetch(kg, ["Essential Hypertenshun"])
+    shallow = resolver.resolve(kg, "essential  hypertenshun", limit=2)
+    full = resolver.resolve(kg, "ESSENTIAL HYPERTENSHUN")
+    assert calls == [(["essential hypertenshun"], {"limit": EmbeddingIndex.default_limit})]
+    assert shallow == full[:2]
+
+    # a deeper search replaces the entry and serves the shallower ones after it
+    resolver.resolve(kg, "essential hypertenshun", limit=10)
+    resolver.resolve(kg, "essential hypertenshun", limit=3)
+    resolver.resolve(kg, "essential hypertenshun")
+    assert [kw["limit"] for _, kw in calls] == [EmbeddingIndex.default_limit, 40]
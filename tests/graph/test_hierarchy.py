@@ -0,0 +1,31 @@
+from omop_graph.graph.kg import KnowledgeGraph
+
+
+def test_ancestors_and_descendants_from_closure(vocab_session, queries):
+    kg = KnowledgeGraph(vocab_session)
+    queries.clear()
+
+    up = kg.ancestors([203, 205, 203])
+    assert up == {203: {202, 201, 200}, 205: {204, 200}}
+    assert kg.ancestors([203], max_levels=1) == {203: {202}}
+    assert kg.descendants([200], max_levels=2)[200] == {201, 202, 204, 205}
+    assert kg.descendants([203]) == {203: frozenset()}
+    assert len(queries) == 4
+
+    kg.ancestors([205, 203])
+    assert len(queries) == 4
+
+
+def test_is_descendant_in_bulk(vocab_session, queries):
+    kg = KnowledgeGraph(vocab_session)
+    queries.clear()
+
+    pairs = [(203, 200), (205, 201), (202, 202), (201, 203)]
+    assert kg.is_descendant(pairs) == {
+        (203, 200): True, (205, 201): False, (202, 202): False, (201, 203): False,
+    }
+    assert len(queries) == 1
+
+    kg.ancestors([102])
+    assert kg.is_descendant([(102, 100), (102, 204)]) == {(102, 100): True, (102, 204): False}
+    assert len(queries) == 2
@@ -0,0 +1,104 @@
+from omop_graph.graph.edges import PredicateKind
+from omop_graph.graph.kg import KnowledgeGraph
+from omop_graph.graph.paths import find_shortest_paths
+from omop_graph.graph.traverse import traverse
+
+
+def _edge_queries(statements: list[str]) -> int:
+    return sum("concept_relationship" in q for q in statements)
+
+
+def test_edges_many_fills_node_cache(vocab_session, queries):
+    kg = KnowledgeGraph(vocab_session)
+    kg.batch_size = 2
+
+    out = kg.outgoing_edges_many([202, 203, 204, 202])
+    assert sorted(out) == [202, 203, 204]
+    assert _edge_queries(queries) == 2
+
+    assert kg.outgoing_edges(203) == out[203]
+    assert kg.incoming_edges_many([200])[200] == kg.incoming_edges(200)
+    assert _edge_queries(queries) == 3
+
+
+def test_traversal_issues_one_edge_query_per_level(vocab_session, queries):
+    kg = KnowledgeGraph(vocab_session)
+
+    sg, _ = traverse(
+        kg, [200],
+        predicate_kinds={PredicateKind.ONTOLOGICAL},
+        max_depth=3, on=None, max_nodes=None, trace=False,
+    )
+    assert {202, 205} <= sg.nodes
+    assert _edge_queries(queries) == 3
+
+    queries.clear()
+    kg.clear_caches()
+    paths, _ = find_shortest_paths(kg, 203, 200, predicate_kinds={PredicateKind.ONTOLOGICAL})
+    assert [p.nodes() for p in paths] == [(203, 202, 201, 200)]
+    assert _edge_queries(queries) <= 3
+
+
+def test_within_domain_filter_needs_no_concept_lookups(vocab_session, queries):
+    kg = KnowledgeGraph(vocab_session)
+    queries.clear()
+
+    edges = list(kg.iter_edges(102, direction="out"))
+    assert 204 not in {e.object_id for e in edges}  # "May treat" crosses domains
+    assert {101, 103, 104} <= {e.object_id for e in edges}
+    assert len(queries) == 1
+
+
+def test_kind_and_validity_filters_run_in_sql(vocab_session, queries):
+    kg = KnowledgeGraph(vocab_session)
+    queries.clear()
+
+    onto = kg.outgoing_edges(102, predicate_kinds={PredicateKind.ONTOLOGICAL}, active_only=True)
+    assert {e.predicate_id for e in onto} == {"Is a"}
+    assert "relationship_id IN (" in queries[-1]
+    assert "invalid_reason IS NULL" in queries[-1]
+
+    # a cached unfiltered list answers later filtered requests without SQL
+    assert 206 in {e.object_id for e in kg.outgoing_edges(204)}
+    n = len(queries)
+    assert 206 not in {e.object_id for e in kg.outgoing_edges(204, active_only=True)}
+    assert len(queries) == n
+
+
+def _concept_queries(statements: list[str]) -> int:
+    return sum("FROM vocab.concept" in q and "concept_relationship" not in q for q in statements)
+
+
+def test_concept_views_batch_and_renderers_prefetch(vocab_session, queries):
+    from omop_graph.graph.scoring import rank_paths
+    from omop_graph.render.text import subgraph_text
+
+    kg = KnowledgeGraph(vocab_session)
+    kg.batch_size = 4
+    queries.clear()
+
+    views = kg.concept_views([200, 201, 202, 203, 204, 999])
+    assert sorted(views) == [200, 201, 202, 203, 204]
+    assert _concept_queries(queries) == 2
+    assert kg.concept_view(203) is views[203]
+    assert _concept_queries(queries) == 2
+
+    kg.batch_size = 1_000
+    sg, _ = traverse(kg, [102], predicate_kinds=None, max_depth=1, on=None, max_nodes=None, trace=False)
+    paths, _ = find_shortest_paths(kg, 205, 200, predicate_kinds={PredicateKind.ONTOLOGICAL})
+    queries.clear()
+    subgraph_text(kg, sg)
+    rank_paths(kg, paths)
+    assert _concept_queries(queries) == 2
+
+
+def test_path_profile_raises_like_concept_view_for_missing_concepts(vocab_session):
+    import pytest
+    from sqlalchemy.exc import NoResultFound
+    from omop_graph.graph.paths import GraphPath, PathStep
+    from omop_graph.graph.scoring import path_profile
+
+    kg = KnowledgeGraph(vocab_session)
+    path = GraphPath((PathStep(205, "Is a", 204), PathStep(204, "Is a", 999)))
+    with pytest.raises(NoResultFound):
+        path_profile(kg, path)
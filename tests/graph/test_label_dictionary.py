@@ -0,0 +1,34 @@
+from omop_graph.graph.kg import KnowledgeGraph
+from omop_graph.graph.label_dictionary import LabelDictionary
+from omop_graph.graph.nodes import LabelMatchKind
+
+
+def _key(m):
+    return (m.concept_id, m.matched_label, m.match_kind, m.is_standard, m.is_active)
+
+
+def test_dictionary_matches_database_lookups(vocab_session):
+    kg = KnowledgeGraph(vocab_session)
+    index = LabelDictionary.from_session(vocab_session)
+
+    for label in index.table.iter_labels():
+        for kind, lookup in ((LabelMatchKind.DIRECT, kg.label_lookup), (LabelMatchKind.SYNONYM, kg.synonym_lookup)):
+            expected = sorted(map(_key, lookup(label.upper())))
+            assert sorted(map(_key, index.lookup(label.upper(), kind=kind))) == expected
+
+    assert index.lookup("no such concept") == ()
+    assert index.lookup("   ") == ()
+
+
+def test_saved_dictionary_serves_exact_lookups(vocab_session, queries, tmp_path):
+    LabelDictionary.from_session(vocab_session).save(tmp_path / "labels")
+    kg = KnowledgeGraph(vocab_session, label_dictionary=tmp_path / "labels")
+    queries.clear()
+
+    [match] = kg.label_lookup("  ASPIRIN ")
+    assert match.concept_id == 102 and match.input_label == "aspirin"
+    assert {m.concept_id for m in kg.synonym_lookup("asa")} == {102}
+    many = kg.label_lookup_many(["Aspirin", "unknown", ""])
+    assert [m.concept_id for m in many["Aspirin"]] == [102]
+    assert many["unknown"] == () and many[""] == ()
+    assert queries == []
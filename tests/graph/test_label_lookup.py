@@ -0,0 +1,49 @@
+from omop_graph.graph.kg import KnowledgeGraph
+from omop_graph.graph.label_dictionary import LabelDictionary
+from omop_graph.graph.nodes import LabelMatchKind, label_match_rank
+from omop_graph.reasoning.resolvers import ExactLabelSynonymResolver
+
+
+def _ranked(matches):
+    return sorted(matches, key=lambda m: (label_match_rank(m), m.concept_id))
+
+
+def test_combined_lookup_is_one_ranked_query(vocab_session, queries):
+    kg = KnowledgeGraph(vocab_session)
+    expected = {
+        (label, fuzzy): _ranked(kg.label_lookup(label, fuzzy) + kg.synonym_lookup(label, fuzzy))
+        for label in ("Acetylsalicylic acid", "hypertension", "breast")
+        for fuzzy in (False, True)
+    }
+    queries.clear()
+
+    for (label, fuzzy), matches in expected.items():
+        assert list(kg.label_and_synonym_lookup(label, fuzzy)) == matches
+    assert len(queries) == len(expected)
+
+    both = kg.label_and_synonym_lookup("acetylsalicylic acid")
+    assert [(m.concept_id, m.match_kind) for m in both] == [(102, LabelMatchKind.SYNONYM), (104, LabelMatchKind.DIRECT)]
+    assert kg.label_and_synonym_lookup("  ") == ()
+
+
+def test_combined_resolver(vocab_session, queries):
+    kg = KnowledgeGraph(vocab_session)
+    resolver = ExactLabelSynonymResolver()
+    queries.clear()
+
+    assert [h.concept_id for h in resolver.resolve(kg, "Acetylsalicylic acid")] == [102, 104]
+    assert len(queries) == 1
+
+    resolver.prefetch(kg, ["aspirin", "ASA", "high blood pressure"])
+    queries.clear()
+    assert [h.concept_id for h in resolver.resolve(kg, "ASA")] == [102]
+    assert [h.resolver for h in resolver.resolve(kg, "high blood pressure")] == ["exact_label_synonym"]
+    assert queries == []
+
+
+def test_combined_lookup_from_label_dictionary(vocab_session, queries):
+    expected = KnowledgeGraph(vocab_session).label_and_synonym_lookup("acetylsalicylic acid")
+    kg = KnowledgeGraph(vocab_session, label_dictionary=LabelDictionary.from_session(vocab_session))
+    queries.clear()
+    assert kg.label_and_synonym_lookup("acetylsalicylic acid") == expected
+    assert queries == []
@@ -0,0 +1,97 @@
+from concurrent.futures import ThreadPoolExecutor
+import sqlite3
+
+import pytest
+
+from sqlalchemy import update
+from sqlalchemy.orm import sessionmaker
+
+from omop_alchemy.cdm.model.vocabulary import Vocabulary
+
+from omop_graph.graph.edges import PredicateKind
+from omop_graph.graph.kg import KnowledgeGraph
+from omop_graph.graph.persistent import PersistentCache, vocabulary_release
+
+
+def _edge_queries(statements: list[str]) -> int:
+    return sum("concept_relationship" in q for q in statements)
+
+
+def test_release_prefers_none_vocabulary_row():
+    assert vocabulary_release([("SNOMED", "2024"), ("None", "v5.0 01-MAR-24")]) == "v5.0 01-MAR-24"
+    digest = vocabulary_release([("SNOMED", "2024"), ("RxNorm", "2023")])
+    assert digest.startswith("sha1:")
+    assert digest == vocabulary_release([("RxNorm", "2023"), ("SNOMED", "2024")])
+
+
+def test_second_graph_starts_warm(vocab_engine, queries, tmp_path):
+    path = tmp_path / "warm.sqlite"
+    kinds = {PredicateKind.ONTOLOGICAL}
+
+    with sessionmaker(bind=vocab_engine)() as session, KnowledgeGraph(session, persistent_cache=path) as cold:
+        assert cold.persistent.release == "v5.0 TEST-RELEASE"
+        view = cold.concept_view(205)
+        edges = cold.outgoing_edges(205, predicate_kinds=kinds, active_only=True)
+        many = cold.incoming_edges_many([200, 204])
+
+    with sessionmaker(bind=vocab_engine)() as session, KnowledgeGraph(session, persistent_cache=path) as warm:
+        queries.clear()
+        assert warm.concept_view(205) == view
+        assert warm.outgoing_edges(205, predicate_kinds=kinds, active_only=True) == edges
+        assert warm.incoming_edges_many([200, 204]) == many
+        # endpoint domains travel with the stored rows
+        assert list(warm.iter_edges(204, direction="in", active_only=False))
+        assert queries == []
+
+        # a different filter signature is not served from the stored rows
+        warm.outgoing_edges(205)
+        assert _edge_queries(queries) == 1
+
+
+def test_new_release_invalidates(vocab_engine, vocab_session, tmp_path):
+    path = tmp_path / "warm.sqlite"
+    with KnowledgeGraph(vocab_session, persistent_cache=path) as kg:
+        kg.concept_view(102)
+        kg.outgoing_edges(102)
+        assert len(kg.persistent) == 2
+
+    vocab_session.execute(
+        update(Vocabulary)
+        .where(Vocabulary.vocabulary_id == "None")
+        .values(vocabulary_version="v5.0 NEXT-RELEASE")
+    )
+    vocab_session.commit()
+
+    reopened = PersistentCache(path, release=KnowledgeGraph(vocab_session).vocabulary_release())
+    assert reopened.release == "v5.0 NEXT-RELEASE"
+    assert len(reopened) == 0
+    assert reopened.get_concept(102) is None
+
+
+def test_counts_survive_concurrent_lookups(vocab_session, tmp_path):
+    kg = KnowledgeGraph(vocab_session)
+    cache = PersistentCache(tmp_path / "warm.sqlite", release="test")
+    cache.put_concepts([kg.concept_view(cid) for cid in (102, 205)])
+    lookups = [102, 205, 999] * 200
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(cache.get_concept, lookups))
+        list(pool.map(cache.get_concepts, [lookups[i:i + 3] for i in range(0, len(lookups), 3)]))
+    assert (cache.hits, cache.misses) == (800, 400)
+
+    cache.clear()
+    assert (cache.hits, cache.misses) == (0, 0)
+    cache.close()
+
+
+def test_graph_closes_only_a_cache_it_opened(vocab_session, tmp_path):
+    with KnowledgeGraph(vocab_session, persistent_cache=tmp_path / "own.sqlite") as kg:
+        own = kg.persistent
+    with pytest.raises(sqlite3.ProgrammingError):
+        len(own)
+
+    shared = PersistentCache(tmp_path / "shared.sqlite", release="test")
+    with KnowledgeGraph(vocab_session, persistent_cache=shared) as kg:
+        kg.concept_view(102)
+    assert len(shared) == 1
+    shared.close()
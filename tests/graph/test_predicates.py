@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+from omop_graph.graph.edges import PredicateCatalog, PredicateKind, predicate_from_row
+from omop_graph.graph.kg import KnowledgeGraph
+
+
+def _row(rid, hierarchical="0", ancestry="0", reverse=None):
+    return SimpleNamespace(
+        relationship_id=rid,
+        relationship_name=rid,
+        reverse_relationship_id=reverse,
+        is_hierarchical=hierarchical,
+        defines_ancestry=ancestry,
+    )
+
+
+def test_catalog_classifies_once():
+    catalog = PredicateCatalog.from_rows([
+        _row("Is a", "1", "1", "Subsumes"),
+        _row("Subsumes", "1", "1", "Is a"),
+        _row("Maps to", reverse="Mapped from"),
+        _row("Has ingredient", reverse="Ingredient of"),
+        _row("Concept replaced by"),
+        _row("May treat", reverse="missing"),
+    ])
+
+    assert catalog.kind("Is a") is PredicateKind.ONTOLOGICAL
+    assert catalog.kind("Maps to") is PredicateKind.MAPPING
+    assert catalog.kind("Has ingredient") is PredicateKind.ATTRIBUTE
+    assert catalog.kind("Concept replaced by") is PredicateKind.VERSIONING
+    assert catalog.kind("May treat") is PredicateKind.METADATA
+    assert catalog.ids_for_kinds({PredicateKind.ONTOLOGICAL, PredicateKind.MAPPING}) == {
+        "Is a", "Subsumes", "Maps to",
+    }
+    assert len(catalog) == 6 and "Mapped from" not in catalog
+
+
+def test_string_flags_are_parsed():
+    assert not predicate_from_row(_row("Maps to")).is_hierarchical
+    assert predicate_from_row(_row("Is a", 1, "1")).defines_ancestry
+
+
+def test_kg_loads_catalog_at_construction(vocab_session):
+    kg = KnowledgeGraph(vocab_session)
+
+    assert kg.predicate_kind("Has ingredient") is PredicateKind.ATTRIBUTE
+    assert kg.predicate_name("Subsumes") == "Subsumes"
+    assert kg.reverse_predicate_id("Maps to") == "Mapped from"
+    assert {e.object_id for e in kg.iter_edges(103, predicate_kinds={PredicateKind.ATTRIBUTE})} == {102}
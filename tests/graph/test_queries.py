@@ -0,0 +1,44 @@
+from datetime import date
+
+from omop_graph.graph.queries import (
+    bound_edges,
+    label_params,
+    q_concept_name_ilike,
+    q_concept_view,
+    q_outgoing_edges,
+    q_incoming_edges_batch,
+    s_concept_name_ilike,
+    s_concept_view,
+    with_endpoint_domains,
+)
+
+
+def test_prebuilt_statements_are_shared():
+    assert s_concept_view() is s_concept_view()
+
+    stmt, params = bound_edges("out", 102, "Is a")
+    again, other = bound_edges("out", 205, "Is a")
+    assert stmt is again
+    assert params == {"concept_id": 102, "relationship_id": "Is a"}
+    assert other["concept_id"] == 205
+
+
+def test_prebuilt_statements_match_builders(vocab_session):
+    run = vocab_session.execute
+
+    assert run(s_concept_view(), {"concept_id": 203}).all() == run(q_concept_view(203)).all()
+    assert (
+        run(s_concept_name_ilike(), label_params("breast", fuzzy=True)).all()
+        == run(q_concept_name_ilike("breast")).all()
+    )
+
+    on = date(2020, 1, 1)
+    filters = dict(relationship_ids={"Is a", "Maps to"}, active_only=True, on=on)
+    assert (
+        sorted(run(*bound_edges("out", 102, **filters)).all())
+        == sorted(run(with_endpoint_domains(q_outgoing_edges(102, **filters))).all())
+    )
+    assert (
+        sorted(run(*bound_edges("in", [200, 204], "Is a")).all())
+        == sorted(run(with_endpoint_domains(q_incoming_edges_batch([200, 204], "Is a"))).all())
+    )
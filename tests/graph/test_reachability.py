@@ -0,0 +1,45 @@
+import random
+from itertools import product
+
+from omop_graph.graph.csr import CSRGraph
+from omop_graph.graph.kg import KnowledgeGraph
+from omop_graph.graph.reachability import ReachabilityIndex
+
+
+def _closure(edges):
+    parents = {}
+    for child, parent in edges:
+        parents.setdefault(child, set()).add(parent)
+    result = {}
+    for node in {n for e in edges for n in e}:
+        seen, stack = set(), [node]
+        while stack:
+            for p in parents.get(stack.pop(), ()):
+                if p not in seen:
+                    seen.add(p)
+                    stack.append(p)
+        result[node] = seen
+    return result
+
+
+def test_index_matches_closure_with_multiple_inheritance_and_cycles():
+    rng = random.Random(0)
+    edges = [(rng.randrange(60), rng.randrange(60)) for _ in range(120)]
+    edges += [(100, 101), (101, 102), (102, 100), (103, 100)]  # a cycle
+    index = ReachabilityIndex.from_edges(edges)
+    closure = _closure(edges)
+
+    for d, a in product(closure, repeat=2):
+        expected = a in closure[d] and d != a
+        assert index.is_descendant(d, a) is expected, (d, a)
+    assert not index.is_descendant(999, 0)
+
+
+def test_csr_is_descendant_matches_concept_ancestor(vocab_session):
+    kg = KnowledgeGraph(vocab_session)
+    csr = CSRGraph.from_session(vocab_session)
+
+    ids = [100, 101, 102, 200, 201, 202, 203, 204, 205, 206]
+    pairs = list(product(ids, repeat=2))
+    assert csr.is_descendant(pairs) == kg.is_descendant(pairs)
+    assert csr.reachability.is_ancestor(200, 203)
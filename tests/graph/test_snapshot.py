@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from omop_graph.graph.csr import CSRGraph
+from omop_graph.graph.edges import PredicateKind
+from omop_graph.graph.kg import KnowledgeGraph
+from omop_graph.graph.paths import find_shortest_paths
+from omop_graph.graph.snapshot import MANIFEST, SnapshotGraph, export_snapshot
+
+CONCEPT_IDS = [100, 101, 102, 103, 104, 200, 201, 202, 203, 204, 205, 206]
+
+
+@pytest.fixture
+def snapshot(vocab_session, tmp_path):
+    export_snapshot(vocab_session, tmp_path / "snap", batch_size=3)
+    return SnapshotGraph.open(tmp_path / "snap")
+
+
+def test_snapshot_matches_live_graph(vocab_session, snapshot):
+    kg = KnowledgeGraph(vocab_session)
+    csr = CSRGraph.from_session(vocab_session)
+
+    assert isinstance(snapshot.node_ids, memoryview)
+    assert snapshot.release == "v5.0 TEST-RELEASE"
+    for cid in CONCEPT_IDS:
+        assert snapshot.concept_view(cid) == kg.concept_view(cid)
+        for direction in ("out", "in"):
+            assert list(snapshot.iter_edges(cid, direction=direction, active_only=False)) == list(
+                csr.iter_edges(cid, direction=direction, active_only=False)
+            )
+
+    with pytest.raises(KeyError):
+        snapshot.concept_view(999)
+
+
+def test_algorithms_run_on_snapshot(snapshot):
+    paths, _ = find_shortest_paths(snapshot, 203, 200, predicate_kinds={PredicateKind.ONTOLOGICAL})
+    assert [p.nodes() for p in paths] == [(203, 202, 201, 200)]
+
+
+def test_manifest_written_last(vocab_session, tmp_path):
+    out = export_snapshot(vocab_session, tmp_path / "snap")
+    manifest = json.loads((out / MANIFEST).read_text())
+    assert manifest["num_nodes"] == len(CONCEPT_IDS)
+    assert not (out / f"{MANIFEST}.tmp").exists()
+
+
+def test_missing_strings_round_trip(vocab_session, tmp_path, monkeypatch):
+    from omop_graph.graph import snapshot as snapshot_module
+
+    stream = snapshot_module._stream
+
+    def concept_rows_with_gaps(session, stmt, batch_size):
+        for row in stream(session, stmt, batch_size):
+            # only q_concept_table rows carry ten columns
+            if len(row) == 10 and row[0] in (202, 205):
+                row = (row[0], None, "", *row[3:]) if row[0] == 202 else (row[0], "", None, *row[3:])
+            yield row
+
+    monkeypatch.setattr(snapshot_module, "_stream", concept_rows_with_gaps)
+    snapshot = SnapshotGraph.open(export_snapshot(vocab_session, tmp_path / "snap"))
+
+    assert (snapshot.concept_view(202).concept_name, snapshot.concept_view(202).concept_code) == (None, "")
+    assert (snapshot.concept_view(205).concept_name, snapshot.concept_view(205).concept_code) == ("", None)
+    # neighbours of a None keep their own strings
+    assert snapshot.concept_view(203).concept_name == "Ductal carcinoma of breast"
+    assert snapshot.concept_view(203).concept_code == "82711006"
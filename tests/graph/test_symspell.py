@@ -0,0 +1,43 @@
+import pytest
+
+from omop_graph.graph.kg import KnowledgeGraph
+from omop_graph.graph.nodes import LabelMatchKind
+from omop_graph.graph.symspell import SymSpellIndex, edit_distance
+from omop_graph.reasoning.resolvers import EditDistanceResolver, ResolverPipeline
+
+
+def test_edit_distance_is_bounded():
+    assert edit_distance("hypertenion", "hypertension", 2) == 1
+    assert edit_distance("asprin", "aspirin", 2) == 1
+    assert edit_distance("carcinoma of braest", "carcinoma of breast", 2) == 1  # transposition
+    assert edit_distance("kitten", "sitting", 2) == 3  # bound + 1
+
+
+def test_search_finds_misspelt_names_and_synonyms(vocab_session):
+    index = SymSpellIndex.from_session(vocab_session)
+
+    [(distance, match)] = index.search("Carcinoma of brest")
+    assert (distance, match.concept_id, match.matched_label) == (1, 202, "Carcinoma of breast")
+    assert match.input_label == "carcinoma of brest"
+
+    hits = index.search("acetylsalicylc acid")
+    assert {(m.concept_id, m.match_kind) for _, m in hits} == {
+        (104, LabelMatchKind.DIRECT), (102, LabelMatchKind.SYNONYM),
+    }
+    assert index.search("acetylsalicylc acid", kind=LabelMatchKind.SYNONYM)[0][1].concept_id == 102
+    assert index.search("asprin", max_distance=0) == []
+    assert index.search("zzzz") == []
+
+
+def test_saved_index_backs_resolver(vocab_session, queries, tmp_path):
+    SymSpellIndex.from_session(vocab_session).save(tmp_path / "symspell")
+    kg = KnowledgeGraph(vocab_session, symspell_index=tmp_path / "symspell")
+    queries.clear()
+
+    pipeline = ResolverPipeline((EditDistanceResolver(),))
+    assert [h.concept_id for h in pipeline.resolve(kg, "esential hypertenson")] == [205]
+    assert [h.resolver for h in pipeline.resolve(kg, "asprin")] == ["edit_distance"]
+    assert queries == []
+
+    with pytest.raises(ValueError, match="symspell_index"):
+        EditDistanceResolver().resolve(KnowledgeGraph(vocab_session), "asprin")
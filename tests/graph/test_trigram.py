@@ -0,0 +1,31 @@
+from omop_graph.graph.kg import KnowledgeGraph
+from omop_graph.graph.nodes import LabelMatchKind
+from omop_graph.graph.trigram import TrigramIndex
+from omop_graph.reasoning.resolvers import PartialLabelResolver
+
+
+def test_trigram_search_ranks_by_overlap(vocab_session):
+    index = TrigramIndex.from_session(vocab_session)
+
+    hits = index.search("carcinoma of breast", kind=LabelMatchKind.DIRECT)
+    assert [m.concept_id for _, m in hits][:2] == [202, 203]
+    assert hits[0][0] == 1.0 and hits[0][1].input_label == "carcinoma of breast"
+
+    # misspelt, and matched through a synonym
+    typo = index.search("hypertenson", min_similarity=0.6)
+    assert {m.concept_id for _, m in typo} >= {204, 205, 206}
+    assert {m.concept_id for _, m in index.search("ASA", kind=LabelMatchKind.SYNONYM)} == {102}
+    assert index.search("zzzz") == []
+
+
+def test_saved_index_serves_fuzzy_lookups(vocab_session, queries, tmp_path):
+    TrigramIndex.from_session(vocab_session).save(tmp_path / "trigrams")
+    kg = KnowledgeGraph(vocab_session, trigram_index=tmp_path / "trigrams")
+    queries.clear()
+
+    matches = kg.label_lookup("breast", fuzzy=True)
+    assert {m.concept_id for m in matches} == {201, 202, 203}
+    assert {m.concept_id for m in kg.synonym_lookup("blood pressure", fuzzy=True)} == {204}
+    hits = PartialLabelResolver().resolve(kg, "breast", limit=2)
+    assert [h.concept_id for h in hits] == [201, 202]  # shortest labels among full overlaps
+    assert queries == []
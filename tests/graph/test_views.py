@@ -0,0 +1,14 @@
+from omop_graph.graph.kg import KnowledgeGraph
+
+
+def test_views_are_slotted_and_share_strings(vocab_session):
+    kg = KnowledgeGraph(vocab_session)
+    a, b = kg.concept_view(202), kg.concept_view(205)
+    assert not hasattr(a, "__dict__")
+    assert a.vocabulary_id is b.vocabulary_id
+    assert a.domain_id is b.domain_id
+
+    (e1,) = kg.outgoing_edges(202, "Is a")
+    (e2,) = kg.outgoing_edges(205, "Is a")
+    assert not hasattr(e1, "__dict__")
+    assert e1.predicate_id is e2.predicate_id
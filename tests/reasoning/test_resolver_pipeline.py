@@ -0,0 +1,110 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import pickle
+import threading
+import time
+
+from omop_graph.reasoning.resolvers import ResolverConfidence, ResolverPipeline, resolver_pipeline
+from omop_graph.reasoning.resolvers.base import CandidateHit, CandidateResolver
+
+
+class Delayed(CandidateResolver):
+    def __init__(self, name, confidence, ids, delay):
+        self.name, self.confidence, self.ids, self.delay = name, confidence, ids, delay
+        self.finished = False
+
+    def resolve(self, kg, text, *, limit=None):
+        time.sleep(self.delay)
+        self.finished = True
+        return [CandidateHit(cid, self.name) for cid in self.ids][:limit]
+
+    async def resolve_async(self, kg, text, *, limit=None):
+        await asyncio.sleep(self.delay)
+        self.finished = True
+        return [CandidateHit(cid, self.name) for cid in self.ids][:limit]
+
+
+def _resolvers(exact_ids=()):
+    return (
+        Delayed("exact", ResolverConfidence.EXACT, exact_ids, 0.1),
+        Delayed("synonym", ResolverConfidence.EXACT, [2, 3], 0.2),
+        Delayed("partial", ResolverConfidence.PARTIAL, [3, 4], 0.2),
+    )
+
+
+def test_concurrent_resolve_merges_in_declared_order():
+    sequential = ResolverPipeline(_resolvers([1, 2])).resolve(None, "x")
+    pipeline = ResolverPipeline(_resolvers([1, 2]), concurrent=True)
+
+    start = time.perf_counter()
+    hits = pipeline.resolve(None, "x")
+    assert time.perf_counter() - start < 0.4  # the slowest resolver, not the sum
+    assert hits == sequential
+    assert [(h.concept_id, h.resolver) for h in hits] == [(1, "exact"), (2, "exact"), (3, "synonym"), (4, "partial")]
+    assert pickle.loads(pickle.dumps(pipeline)).concurrent
+
+
+def test_concurrent_resolve_cancels_outranked_tiers():
+    resolvers = _resolvers([1])
+    resolvers[2].delay = 2.0
+    pipeline = ResolverPipeline(resolvers, stop_after_confidence=ResolverConfidence.EXACT, concurrent=True)
+
+    start = time.perf_counter()
+    hits = pipeline.resolve(None, "x")
+    assert time.perf_counter() - start < 1.0
+    assert [h.concept_id for h in hits] == [1, 2, 3]
+
+    # the discarded partial resolver was already running: close() waits for it
+    assert not resolvers[2].finished
+    pipeline.close()
+    assert resolvers[2].finished and pipeline._pool is None
+
+    # no exact hits: the partial tier still counts
+    resolvers = _resolvers()
+    resolvers[1].ids = []
+    pipeline = ResolverPipeline(resolvers, stop_after_confidence=ResolverConfidence.EXACT, concurrent=True)
+    assert [h.resolver for h in pipeline.resolve(None, "x")] == ["partial", "partial"]
+
+
+def test_concurrent_resolve_async():
+    resolvers = _resolvers([1])
+    resolvers[2].delay = 2.0
+    pipeline = ResolverPipeline(resolvers, stop_after_confidence=ResolverConfidence.EXACT, concurrent=True)
+
+    start = time.perf_counter()
+    hits = asyncio.run(pipeline.resolve_async(None, "x"))
+    assert time.perf_counter() - start < 1.0
+    assert [h.concept_id for h in hits] == [1, 2, 3]
+    assert not resolvers[2].finished  # cancelled, not left running
+
+
+def test_concurrent_pipeline_threads(monkeypatch):
+    started = []
+
+    class Counted(ThreadPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            started.append(self)
+            time.sleep(0.05)  # widen the window for a racing caller
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(resolver_pipeline, "ThreadPoolExecutor", Counted)
+
+    # racing first calls start one pool, and leaving the block shuts it down
+    with ResolverPipeline(_resolvers([1]), concurrent=True) as pipeline:
+        callers = [threading.Thread(target=pipeline.resolve, args=(None, "x")) for _ in range(8)]
+        for t in callers:
+            t.start()
+        for t in callers:
+            t.join()
+        assert started == [pipeline._pool]
+    assert pipeline._pool is None and started[0]._shutdown
+
+    # a caller's executor is used as is and left open
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        with ResolverPipeline(_resolvers([1]), concurrent=True, executor=executor) as pipeline:
+            assert [h.concept_id for h in pipeline.resolve(None, "x")] == [1, 2, 3, 4]
+        assert pipeline._pool is None
+        assert executor.submit(lambda: 1).result() == 1
+        copy = pickle.loads(pickle.dumps(pipeline))
+        assert copy.executor is None and copy.resolve(None, "x") == pipeline.resolve(None, "x")
+        copy.close()
@@ -0,0 +1,101 @@
+from dataclasses import replace
+from datetime import date
+
+from sqlalchemy import insert
+
+from omop_alchemy.cdm.model.vocabulary import Concept, Concept_Relationship
+
+from omop_graph.graph.kg import KnowledgeGraph
+from omop_graph.reasoning.resolvers import (
+    ExactLabelResolver,
+    ExactSynonymResolver,
+    PartialLabelResolver,
+    ResolverPipeline,
+)
+from omop_graph.reasoning.term_grounding import GroundingConstraints, ground_term, ground_terms
+
+
+def _edge_queries(statements: list[str]) -> int:
+    return sum("concept_relationship" in q for q in statements)
+
+
+def test_closure_mode_walks_each_level_once(vocab_session, queries):
+    kg = KnowledgeGraph(vocab_session)
+    pipeline = ResolverPipeline((PartialLabelResolver(),))
+    constraints = GroundingConstraints(
+        parent_ids=(200, 201, 204), allowed_domains=("Condition",), hierarchy="closure",
+    )
+    queries.clear()
+
+    found = ground_term(kg, "breast", constraints=constraints, resolver_pipeline=pipeline)
+    assert {c.concept_id for c in found} == {201, 202, 203}
+    by_id = {c.concept_id: c for c in found}
+    assert [p.nodes() for p in by_id[203].paths] == [(203, 202, 201, 200), (203, 202, 201)]
+    assert [p.nodes() for p in by_id[201].paths] == [(201, 200), ()]
+    # the three candidates share their ancestors' edge queries, one per level
+    assert _edge_queries(queries) == 2
+
+
+def _add_multi_parent_child(session) -> None:
+    """Hypertensive breast disorder (207), filed under both 201 and 204."""
+    start, end = date(1970, 1, 1), date(2099, 12, 31)
+    session.execute(insert(Concept), [dict(
+        concept_id=207, concept_name="Hypertensive breast disorder", domain_id="Condition",
+        vocabulary_id="SNOMED", concept_class_id="Disorder", standard_concept="S",
+        concept_code="0000002", valid_start_date=start, valid_end_date=end,
+    )])
+    session.execute(insert(Concept_Relationship), [
+        dict(concept_id_1=s, relationship_id=rel, concept_id_2=o, valid_start_date=start, valid_end_date=end)
+        for parent in (201, 204)
+        for s, rel, o in ((207, "Is a", parent), (parent, "Subsumes", 207))
+    ])
+    session.commit()
+
+
+def test_closure_mode_follows_only_upward_edges(vocab_session):
+    _add_multi_parent_child(vocab_session)
+    kg = KnowledgeGraph(vocab_session)
+    pipeline = ResolverPipeline((PartialLabelResolver(),))
+    search = GroundingConstraints(parent_ids=(201,), allowed_domains=("Condition",))
+    closure = replace(search, hierarchy="closure")
+
+    def grounded(text, constraints):
+        found = ground_term(kg, text, constraints=constraints, resolver_pipeline=pipeline)
+        return {c.concept_id: [p.nodes() for p in c.paths] for c in found}
+
+    # search also steps down 'Subsumes': 204 reaches 201 through its child
+    # 207 (down, then up) or through 200 (up, then down); neither is a
+    # descendant of 201, so closure mode rejects both
+    searched = grounded("hypertensive", search)
+    assert set(searched) == {204, 207}
+    assert (204, 207, 201) in searched[204] and (204, 200, 201) in searched[204]
+    assert grounded("hypertensive", closure) == {207: [(207, 201)]}
+    assert set(grounded("hypertension", search)) == {205}
+    assert grounded("hypertension", closure) == {}
+
+    # on true descendants the two modes agree
+    assert grounded("breast", closure).keys() == grounded("breast", search).keys() == {201, 202, 203, 207}
+
+
+def test_ground_terms_matches_ground_term_with_shared_lookups(vocab_session, queries):
+    kg = KnowledgeGraph(vocab_session)
+    pipeline = ResolverPipeline((ExactLabelResolver(), ExactSynonymResolver()))
+    texts = [
+        "High blood pressure", "high  blood pressure", "Ductal carcinoma of breast",
+        "Aspirin", "", "Primary hypertension", "High blood pressure",
+    ]
+    for hierarchy in ("search", "closure"):
+        constraints = GroundingConstraints(
+            parent_ids=(200,), allowed_domains=("Condition",), hierarchy=hierarchy,
+        )
+        kg.clear_caches()
+        queries.clear()
+        batched = ground_terms(kg, texts, constraints=constraints, resolver_pipeline=pipeline)
+        label_queries = sum("lower(" in q for q in queries)
+
+        assert label_queries == 2  # one for labels, one for synonyms
+        assert batched == [
+            ground_term(kg, t, constraints=constraints, resolver_pipeline=pipeline) if t.strip() else []
+            for t in texts
+        ]
+        assert [[c.concept_id for c in r] for r in batched][:3] == [[204], [204], [203]]
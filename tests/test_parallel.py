@@ -0,0 +1,104 @@
+import multiprocessing
+from functools import partial
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from omop_graph.graph.edges import PredicateKind
+from omop_graph.graph.kg import KnowledgeGraph
+from omop_graph.graph.paths import find_shortest_paths
+from omop_graph.parallel import find_shortest_paths_parallel, ground_term_parallel, run_parallel
+from omop_graph.reasoning.resolvers import ExactLabelResolver, ExactSynonymResolver, ResolverPipeline
+from omop_graph.reasoning.term_grounding import GroundingConstraints, ground_term
+
+# workers start from a fresh interpreter, not a fork of the threaded test run
+SPAWN = multiprocessing.get_context("spawn")
+
+# cdm databases whose connections in this process get the sibling vocab.db
+_SPLIT_DATABASES: set[str] = set()
+
+
+class _SplitURL(str):
+    """
+    URL of a cdm database with its vocab schema in a sibling vocab.db.
+    Unpickling it in a worker imports this module, so the listener below is
+    in place before the worker opens the URL.
+    """
+
+    def __reduce__(self):
+        return _split_url, (str(self),)
+
+
+def _split_url(url: str) -> _SplitURL:
+    _SPLIT_DATABASES.add(url.removeprefix("sqlite:///"))
+    return _SplitURL(url)
+
+
+@event.listens_for(Engine, "connect")
+def _attach_sibling_vocab(dbapi_conn, _):
+    if not _SPLIT_DATABASES:
+        return
+    databases = {name: file for _, name, file in dbapi_conn.execute("PRAGMA database_list")}
+    if databases.get("main") in _SPLIT_DATABASES and "vocab" not in databases:
+        dbapi_conn.execute(f"ATTACH DATABASE '{Path(databases['main']).with_name('vocab.db')}' AS vocab")
+
+
+def _graph(url: str, vocab_file: str) -> KnowledgeGraph:
+    engine = create_engine(url)
+
+    @event.listens_for(engine, "connect")
+    def _attach_vocab_schema(dbapi_conn, _):
+        dbapi_conn.execute(f"ATTACH DATABASE '{vocab_file}' AS vocab")
+
+    return KnowledgeGraph(Session(engine))
+
+
+def _name(kg, concept_id: int) -> str:
+    return kg.concept_view(concept_id).concept_name
+
+
+@pytest.fixture
+def graph_factory(vocab_engine, vocab_url, tmp_path):
+    return partial(_graph, vocab_url, str(tmp_path / "vocab.db"))
+
+
+def test_results_are_ordered_with_errors_captured(graph_factory):
+    ids = [205, 999, 100, 203, 102]
+    results = run_parallel(_name, ids, graph=graph_factory, workers=2, chunk_size=2, mp_context=SPAWN)
+
+    assert [r.index for r in results] == list(range(len(ids)))
+    assert [r.value for r in results if r.ok] == [
+        "Essential hypertension", "Drug", "Ductal carcinoma of breast", "Aspirin",
+    ]
+    assert not results[1].ok and "NoResultFound" in results[1].error
+
+
+def test_parallel_grounding_and_paths_match_serial(graph_factory, vocab_session):
+    kg = KnowledgeGraph(vocab_session)
+    constraints = GroundingConstraints(parent_ids=(200,), allowed_domains=("Condition",))
+    pipeline = ResolverPipeline((ExactLabelResolver(), ExactSynonymResolver()))
+    texts = ["High blood pressure", "Ductal carcinoma of breast", "Aspirin"]
+    options = dict(workers=2, chunk_size=1, mp_context=SPAWN)
+
+    grounded = ground_term_parallel(
+        graph_factory, texts, constraints=constraints, resolver_pipeline=pipeline, **options,
+    )
+    assert [r.value for r in grounded] == [
+        ground_term(kg, t, constraints=constraints, resolver_pipeline=pipeline) for t in texts
+    ]
+
+    kinds = {PredicateKind.ONTOLOGICAL}
+    pairs = [(203, 200), (205, 200)]
+    paths = find_shortest_paths_parallel(graph_factory, pairs, search={"predicate_kinds": kinds}, **options)
+    assert [r.value for r in paths] == [find_shortest_paths(kg, s, t, predicate_kinds=kinds)[0] for s, t in pairs]
+
+
+def test_workers_open_graphs_from_a_url(vocab_engine, vocab_url):
+    ids = [205, 999, 102]
+    results = run_parallel(_name, ids, graph=_SplitURL(vocab_url), workers=1, chunk_size=1, mp_context=SPAWN)
+
+    assert [r.value for r in results] == ["Essential hypertension", None, "Aspirin"]
+    assert "NoResultFound" in results[1].error